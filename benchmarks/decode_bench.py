@@ -0,0 +1,123 @@
+"""Decoding speed and allocations for large kino.pub responses.
+
+Compares the stdlib and msgspec decoders on a synthetic category page and
+a long series' episode tree, both padded with fields the client ignores.
+
+    python benchmarks/decode_bench.py --items 2000 --episodes 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+# Config reads kino.pub credentials at import; none are needed offline
+os.environ.setdefault("KINOPUB_CLIENT_ID", "bench")
+os.environ.setdefault("KINOPUB_CLIENT_SECRET", "bench")
+
+from movie_buddy.decoding import MsgspecDecoder, StdlibDecoder, msgspec
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from movie_buddy.decoding import Decoder
+
+_UNUSED = {
+    "posters": {"small": "https://cdn.example/s.jpg", "big": "https://cdn.example/b"},
+    "trailer": {"id": 1, "url": "https://cdn.example/t.mp4"},
+    "rating": 12,
+    "views": 3456,
+    "voice": "Dub, Multi",
+    "cast": "Someone, Someone Else, A Third Person",
+}
+
+
+def _category_page(n: int) -> bytes:
+    items = [
+        {
+            "id": i,
+            "title": f"Title {i}",
+            "type": "movie",
+            "year": 1990 + i % 30,
+            "genres": [{"id": 1, "title": "Drama"}, {"id": 2, "title": "Crime"}],
+            "countries": [{"id": 3, "title": "USA"}],
+            "imdb_rating": 7.1,
+            "kinopoisk_rating": 6.9,
+            "plot": "A long plot " * 20,
+            **_UNUSED,
+        }
+        for i in range(n)
+    ]
+    return json.dumps({"items": items, "pagination": {"total": n}}).encode()
+
+
+def _episode_tree(n: int, per_season: int = 25) -> bytes:
+    seasons = [
+        {
+            "number": s + 1,
+            "episodes": [
+                {
+                    "id": s * per_season + e,
+                    "number": e + 1,
+                    "title": f"Episode {e + 1}",
+                    "files": [{"quality": "1080p", "url": {"hls": "https://x/y"}}],
+                    "duration": 2700,
+                }
+                for e in range(per_season)
+            ],
+        }
+        for s in range(max(n // per_season, 1))
+    ]
+    item = {"id": 1, "title": "Show", "type": "serial", "seasons": seasons, **_UNUSED}
+    return json.dumps({"item": item}).encode()
+
+
+def _measure(fn: Callable[[], object], repeats: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeats
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--episodes", type=int, default=3000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    page = _category_page(args.items)
+    tree = _episode_tree(args.episodes)
+    decoders: list[Decoder] = [StdlibDecoder()]
+    if msgspec is not None:
+        decoders.append(MsgspecDecoder())
+    else:
+        print("msgspec not installed; pip install 'movie-buddy[fast]' to compare")
+
+    print(
+        f"category page: {args.items} items, {len(page) >> 10} KiB; "
+        f"episode tree: {args.episodes} episodes, {len(tree) >> 10} KiB"
+    )
+    for decoder in decoders:
+        cat_time, cat_peak = _measure(
+            lambda d=decoder: d.catalog_items(page, "now"), args.repeats
+        )
+        ep_time, ep_peak = _measure(lambda d=decoder: d.item(tree), args.repeats)
+        print(
+            f"{type(decoder).__name__:<15} "
+            f"category {cat_time * 1000:7.2f}ms peak {cat_peak >> 10:6}KiB  |  "
+            f"episodes {ep_time * 1000:7.2f}ms peak {ep_peak >> 10:6}KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Memory per catalog entry and episode flattening cost of the hot models.
+
+Compares the slotted, frozen models against plain dataclasses with the
+same fields, which is what they were before.
+
+    python benchmarks/models_memory.py --entries 100000 --episodes 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import os
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+# Config reads kino.pub credentials at import; none are needed offline
+os.environ.setdefault("KINOPUB_CLIENT_ID", "bench")
+os.environ.setdefault("KINOPUB_CLIENT_SECRET", "bench")
+
+from movie_buddy.models import CatalogEntry, Content, Episode, Season
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclasses.dataclass
+class _DictCatalogEntry:
+    id: int
+    title: str
+    year: int
+    content_type: str
+    genres: list[str]
+    countries: list[str]
+    imdb_rating: float | None
+    kinopoisk_rating: float | None
+    plot: str
+    created_at: str
+
+
+@dataclasses.dataclass
+class _DictContent:
+    seasons: list[Season]
+
+    @property
+    def all_episodes(self) -> list[Episode]:
+        return [ep for season in self.seasons for ep in season.episodes]
+
+
+GENRES = ["Drama", "Comedy"]
+COUNTRIES = ["USA"]
+
+
+def _bytes_per_entry(cls: Callable[..., object], n: int) -> float:
+    # Field values are shared so only the instances themselves are measured
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries = [
+        cls(i, "Title", 2000, "movie", GENRES, COUNTRIES, 7.0, None, "", "2026")
+        for i in range(n)
+    ]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del entries
+    return used / n
+
+
+def _flatten_time(content: object, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        content.all_episodes  # type: ignore[attr-defined]  # noqa: B018
+    return (time.perf_counter() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--episodes", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=1000)
+    args = parser.parse_args()
+
+    before = _bytes_per_entry(_DictCatalogEntry, args.entries)
+    after = _bytes_per_entry(CatalogEntry, args.entries)
+    print(
+        f"CatalogEntry: {before:6.1f} -> {after:6.1f} bytes/entry "
+        f"({1 - after / before:.0%} less, {args.entries} entries)"
+    )
+
+    per_season = 20
+    seasons = [
+        Season(
+            number=s,
+            episodes=[
+                Episode(id=s * per_season + e, number=e, title="", season_number=s)
+                for e in range(per_season)
+            ],
+        )
+        for s in range(max(args.episodes // per_season, 1))
+    ]
+    plain = _flatten_time(_DictContent(seasons), args.repeats)
+    cached = _flatten_time(Content(1, "Show", "serial", 2000, seasons), args.repeats)
+    print(
+        f"all_episodes: {plain * 1e6:8.2f} -> {cached * 1e6:8.2f} us/access "
+        f"({len(seasons) * per_season} episodes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
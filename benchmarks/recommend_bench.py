@@ -0,0 +1,210 @@
+"""End-to-end recommend benchmark against the local fake OpenAI server.
+
+Measures candidate generation plus the streamed LLM call for cold queries
+run one at a time, the same queries run concurrently, and a warm pass that
+should be served from the recommendation cache.
+
+    python benchmarks/recommend_bench.py --catalog 20000 --latency 0.8 --tps 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Config reads kino.pub credentials at import; none are needed offline
+os.environ.setdefault("KINOPUB_CLIENT_ID", "bench")
+os.environ.setdefault("KINOPUB_CLIENT_SECRET", "bench")
+
+from movie_buddy.candidates import CandidateGenerator
+from movie_buddy.config import Config, config
+from movie_buddy.embeddings import (
+    EmbeddingCache,
+    OpenAIEmbedder,
+    embed_cached,
+    embedding_text,
+    sync_embeddings,
+)
+from movie_buddy.fake_openai import FakeOpenAIServer
+from movie_buddy.models import CatalogEntry, Rating
+from movie_buddy.recommender import (
+    MovieRecommender,
+    RecommendationCache,
+)
+from movie_buddy.taste import TasteProfile
+
+GENRES = ["Drama", "Comedy", "Thriller", "Sci-Fi", "Horror", "Romance", "Crime"]
+WORDS = [
+    "detective",
+    "heist",
+    "space",
+    "family",
+    "war",
+    "love",
+    "ghost",
+    "robot",
+    "island",
+    "city",
+    "road",
+    "prison",
+    "school",
+    "chef",
+    "music",
+    "revenge",
+    "secret",
+    "storm",
+    "ocean",
+    "desert",
+    "winter",
+]
+
+
+def _catalog(n: int, rng: random.Random) -> list[CatalogEntry]:
+    return [
+        CatalogEntry(
+            id=i,
+            title=f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}",
+            year=rng.randint(1960, 2025),
+            content_type=rng.choice(["movie", "serial"]),
+            genres=rng.sample(GENRES, 2),
+            countries=["USA"],
+            imdb_rating=round(rng.uniform(4, 9), 1),
+            kinopoisk_rating=None,
+            plot=" ".join(rng.choices(WORDS, k=60)),
+            created_at="2026-01-01",
+        )
+        for i in range(n)
+    ]
+
+
+def _ratings(entries: list[CatalogEntry], n: int, rng: random.Random) -> list[Rating]:
+    return [
+        Rating(
+            content_id=e.id,
+            title=e.title,
+            content_type=e.content_type,
+            score=rng.randint(1, 10),
+            rated_at=f"2026-01-{rng.randint(1, 28):02d}",
+        )
+        for e in rng.sample(entries, n)
+    ]
+
+
+@dataclasses.dataclass
+class _Timing:
+    first: float
+    total: float
+
+
+def _run_query(
+    cfg: Config,
+    generator: CandidateGenerator,
+    ratings: list[Rating],
+    rated: dict[int, CatalogEntry],
+    query: str,
+) -> _Timing:
+    start = time.perf_counter()
+    embed_cache = EmbeddingCache(cfg.embedding_cache_file)
+    result_cache = RecommendationCache(cfg.recommendation_cache_file)
+    try:
+        vectors, _ = embed_cached([query], OpenAIEmbedder(cfg), embed_cache)
+        candidates = generator.generate(query, vectors[0])
+        first = 0.0
+        stream = MovieRecommender(cfg, cache=result_cache).stream_recommendations(
+            ratings, candidates, query, rated
+        )
+        for _ in stream:
+            first = first or time.perf_counter() - start
+    finally:
+        embed_cache.close()
+        result_cache.close()
+    return _Timing(first, time.perf_counter() - start)
+
+
+def _report(label: str, timings: list[_Timing], wall: float) -> None:
+    firsts = sorted(t.first for t in timings)
+    totals = sorted(t.total for t in timings)
+    p95 = totals[max(int(len(totals) * 0.95) - 1, 0)]
+    print(
+        f"{label:<12} n={len(timings):<4} "
+        f"first p50={statistics.median(firsts) * 1000:7.1f}ms  "
+        f"total p50={statistics.median(totals) * 1000:7.1f}ms "
+        f"p95={p95 * 1000:7.1f}ms  "
+        f"throughput={len(timings) / wall:6.2f} q/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog", type=int, default=5000)
+    parser.add_argument("--ratings", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--tps", type=float, default=80.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries = _catalog(args.catalog, rng)
+    ratings = _ratings(entries, args.ratings, rng)
+    by_id = {e.id: e for e in entries}
+    rated = {r.content_id: by_id[r.content_id] for r in ratings}
+    queries = [" ".join(rng.sample(WORDS, 3)) for _ in range(args.queries)]
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        FakeOpenAIServer(latency=args.latency, tokens_per_second=args.tps) as server,
+    ):
+        cfg = dataclasses.replace(
+            config,
+            config_dir=Path(tmp),
+            openai_api_key="fake-key",
+            openai_base_url=server.url,
+        )
+        start = time.perf_counter()
+        embed_cache = EmbeddingCache(cfg.embedding_cache_file)
+        matrix, _ = sync_embeddings(entries, OpenAIEmbedder(cfg), embed_cache)
+        embed_cache.close()
+        profile = TasteProfile.from_ratings(ratings, by_id, matrix)
+        generator = CandidateGenerator(entries, matrix, profile)
+        print(
+            f"setup: embedded {len(entries)} plots "
+            f"({len({embedding_text(e) for e in entries})} unique) "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+        def run(query: str) -> _Timing:
+            return _run_query(cfg, generator, ratings, rated, query)
+
+        half = len(queries) // 2
+        start = time.perf_counter()
+        cold = [run(q) for q in queries[:half]]
+        _report("sequential", cold, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            concurrent = list(pool.map(run, queries[half:]))
+        _report("concurrent", concurrent, time.perf_counter() - start)
+
+        chat_calls = server.stats["chat"]
+        start = time.perf_counter()
+        warm = [run(q) for q in queries]
+        _report("warm", warm, time.perf_counter() - start)
+        hits = len(queries) - (server.stats["chat"] - chat_calls)
+        print(f"cache hit rate: {hits / len(queries):.0%}")
+        print(
+            f"server: {server.stats['chat']} chat calls, "
+            f"{server.stats['prompt_tokens']} prompt tokens"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""CLI startup cost: ``import movie_buddy.cli`` and ``movie-buddy --help``.
+
+Each run is a fresh interpreter under ``python -X importtime``; the report
+shows the median cumulative import time of the CLI module, the slowest
+modules it pulls in, and the wall time of ``--help``.
+
+    python benchmarks/startup_bench.py --runs 10
+    python benchmarks/startup_bench.py --budget-ms 300
+
+With ``--budget-ms`` it exits non-zero when the median import is slower.
+Before heavy imports were deferred it was ~900 ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Config reads kino.pub credentials at import; none are needed offline
+_ENV = {
+    "KINOPUB_CLIENT_ID": "bench",
+    "KINOPUB_CLIENT_SECRET": "bench",
+    **os.environ,
+}
+_HELP = "from movie_buddy.cli import app; app(['--help'], standalone_mode=False)"
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of each module ``code`` loads."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=_ENV,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [import_times("import movie_buddy.cli") for _ in range(args.runs)]
+    cli_us = statistics.median(r["movie_buddy.cli"] for r in runs)
+    print(f"import movie_buddy.cli: {cli_us / 1000:.1f} ms (median of {args.runs})")
+
+    last = runs[-1]
+    print(f"slowest of {len(last)} modules:")
+    for name, us in sorted(last.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    walls = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", _HELP],
+            capture_output=True,
+            env=_ENV,
+            check=True,
+        )
+        walls.append(time.perf_counter() - start)
+    print(f"movie-buddy --help: {statistics.median(walls) * 1000:.1f} ms wall")
+
+    if args.budget_ms is not None and cli_us / 1000 > args.budget_ms:
+        sys.exit(f"import movie_buddy.cli is over the {args.budget_ms:g} ms budget")
+
+
+if __name__ == "__main__":
+    main()
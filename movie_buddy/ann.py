@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from movie_buddy.embeddings import normalize_rows, save_npy
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from movie_buddy.embeddings import EmbeddingMatrix
+
+# Below this size a brute-force EmbeddingMatrix scan is already fast enough
+ANN_MIN_ROWS = 50_000
+
+_DEFAULT_NPROBE = 8
+_KMEANS_ITERATIONS = 15
+_TRAIN_POINTS_PER_LIST = 256
+
+
+def _spherical_kmeans(
+    vectors: NDArray[np.float32], nlist: int, rng: np.random.Generator
+) -> NDArray[np.float32]:
+    if len(vectors) > nlist * _TRAIN_POINTS_PER_LIST:
+        sample = rng.choice(len(vectors), nlist * _TRAIN_POINTS_PER_LIST, replace=False)
+        vectors = vectors[sample]
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        counts = np.bincount(assign, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file (IVF-flat) index over unit vectors.
+
+    Rows are stored grouped by their nearest centroid so that each inverted
+    list is a contiguous slice of ``vectors``; a query scans only the
+    ``nprobe`` lists whose centroids are closest to it.
+    """
+
+    def __init__(
+        self,
+        centroids: NDArray[np.float32],
+        ids: NDArray[np.int64],
+        vectors: NDArray[np.float32],
+        lists: NDArray[np.int32],
+    ) -> None:
+        self.centroids = centroids
+        self.ids = ids
+        self.vectors = vectors
+        self.lists = lists
+        self.offsets = np.searchsorted(lists, np.arange(len(centroids) + 1))
+
+    @classmethod
+    def build(
+        cls, matrix: EmbeddingMatrix, nlist: int | None = None, seed: int = 0
+    ) -> IVFIndex:
+        vectors = np.asarray(matrix.vectors, dtype=np.float32)
+        nlist = nlist or max(1, round(math.sqrt(len(vectors))))
+        nlist = min(nlist, len(vectors))
+        centroids = _spherical_kmeans(vectors, nlist, np.random.default_rng(seed))
+        empty = cls(
+            centroids,
+            np.empty(0, dtype=np.int64),
+            np.empty((0, vectors.shape[1]), dtype=np.float32),
+            np.empty(0, dtype=np.int32),
+        )
+        return empty.add(matrix.ids, vectors)
+
+    @classmethod
+    def load(cls, directory: Path) -> IVFIndex | None:
+        files = [
+            directory / f"{n}.npy" for n in ("centroids", "ids", "vectors", "lists")
+        ]
+        if not all(f.exists() for f in files):
+            return None
+        centroids, ids, vectors, lists = (np.load(f, mmap_mode="r") for f in files)
+        return cls(centroids, ids, vectors, lists)
+
+    def save(self, directory: Path) -> None:
+        save_npy(directory / "centroids.npy", np.asarray(self.centroids))
+        save_npy(directory / "ids.npy", np.asarray(self.ids))
+        save_npy(directory / "vectors.npy", np.asarray(self.vectors))
+        save_npy(directory / "lists.npy", np.asarray(self.lists))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def add(
+        self, ids: Sequence[int] | NDArray[np.int64], vectors: ArrayLike
+    ) -> IVFIndex:
+        """Insert rows without retraining; existing IDs are replaced."""
+        new_ids = np.asarray(ids, dtype=np.int64)
+        new_vectors = normalize_rows(vectors)
+        new_lists = np.argmax(new_vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+        keep = ~np.isin(self.ids, new_ids)
+        all_lists = np.concatenate([self.lists[keep], new_lists])
+        order = np.argsort(all_lists, kind="stable")
+        return IVFIndex(
+            self.centroids,
+            np.concatenate([self.ids[keep], new_ids])[order],
+            np.concatenate([self.vectors[keep], new_vectors])[order],
+            all_lists[order],
+        )
+
+    def search(
+        self, query: ArrayLike, k: int = 10, nprobe: int = _DEFAULT_NPROBE
+    ) -> list[tuple[int, float]]:
+        q = normalize_rows(query)
+        nprobe = min(nprobe, self.nlist)
+        probe = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+        rows = np.concatenate(
+            [np.arange(self.offsets[p], self.offsets[p + 1]) for p in probe]
+        )
+        if len(rows) == 0:
+            return []
+        scores = self.vectors[rows] @ q
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return list(
+            zip(self.ids[rows[top]].tolist(), scores[top].tolist(), strict=True)
+        )
+
+    def search_batch(
+        self, queries: ArrayLike, k: int = 10, nprobe: int = _DEFAULT_NPROBE
+    ) -> list[list[tuple[int, float]]]:
+        return [self.search(q, k=k, nprobe=nprobe) for q in normalize_rows(queries)]
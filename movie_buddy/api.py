@@ -7,45 +7,86 @@ from typing import TYPE_CHECKING, Any
 import httpx
 
 from movie_buddy.config import config as default_config
+from movie_buddy.decoding import default_decoder
 from movie_buddy.models import (
     AuthError,
-    BookmarkFolder,
-    CatalogEntry,
-    Content,
-    Episode,
     NetworkError,
     RateLimitError,
-    Season,
-    WatchingItem,
 )
+from movie_buddy.transport import http_client, timeout
 
 if TYPE_CHECKING:
+    from movie_buddy.auth import KinoPubAuth
     from movie_buddy.config import Config
-    from movie_buddy.models import Token
+    from movie_buddy.models import (
+        BookmarkFolder,
+        CatalogEntry,
+        Content,
+        Token,
+        WatchingItem,
+    )
 
 _MAX_RETRIES = 2
 _RETRY_DELAY = 5
 
 
 class KinoPubClient:
-    def __init__(self, token: Token, cfg: Config | None = None) -> None:
+    def __init__(
+        self,
+        token: Token,
+        cfg: Config | None = None,
+        *,
+        auth: KinoPubAuth | None = None,
+    ) -> None:
         self._config = cfg or default_config
-        self._client = httpx.Client(
+        self._decoder = default_decoder()
+        self._auth = auth
+        self._token = token
+        self._client = http_client(
+            "api",
+            self._config,
             base_url=self._config.api_base_url,
             headers={"Authorization": f"Bearer {token.access_token}"},
         )
 
+    def _use_token(self, token: Token) -> None:
+        self._token = token
+        self._client.headers["Authorization"] = f"Bearer {token.access_token}"
+
+    def _reauthenticate(self) -> bool:
+        """Switch to a newer saved token, or refresh ours; False if we can't."""
+        if self._auth is None:
+            return False
+        try:
+            token = self._auth.renew(self._token)
+        except (AuthError, httpx.HTTPError):
+            return False
+        self._use_token(token)
+        return True
+
+    def refresh_if_due(self) -> None:
+        """Renew the token ahead of expiry; for long-lived clients."""
+        if self._token.expires_within(self._config.token_refresh_window):
+            self._reauthenticate()
+
     def _request(
         self,
         method: str,
         url: str,
         *,
         params: dict[str, Any] | None = None,
+        endpoint: str = "api",
     ) -> httpx.Response:
         retries = 0
+        reauthenticated = False
         while True:
             try:
-                response = self._client.request(method, url, params=params)
+                response = self._client.request(
+                    method,
+                    url,
+                    params=params,
+                    timeout=timeout(endpoint, self._config),
+                )
             except httpx.ConnectError as e:
                 msg = "Unable to reach kino.pub. Check your internet connection."
                 raise NetworkError(msg) from e
@@ -62,6 +103,9 @@ class KinoPubClient:
                 continue
 
             if response.status_code == 401:
+                if not reauthenticated and self._reauthenticate():
+                    reauthenticated = True
+                    continue
                 msg = "Token expired or invalid. Please run `movie-buddy auth`."
                 raise AuthError(msg)
 
@@ -75,17 +119,7 @@ class KinoPubClient:
             "/items/search",
             params={"q": query, "type": types},
         )
-        items = response.json().get("items", [])
-        return [
-            Content(
-                id=item["id"],
-                title=item["title"],
-                content_type=item["type"],
-                year=item.get("year", 0),
-                seasons=[],
-            )
-            for item in items
-        ]
+        return self._decoder.search(response.content)
 
     def get_item(self, item_id: int) -> Content:
         response = self._request(
@@ -93,39 +127,11 @@ class KinoPubClient:
             f"/items/{item_id}",
             params={"nolinks": "1"},
         )
-        item = response.json()["item"]
-        seasons = []
-        for s in item.get("seasons", []):
-            episodes = [
-                Episode(
-                    id=ep["id"],
-                    number=ep["number"],
-                    title=ep.get("title", ""),
-                    season_number=s["number"],
-                )
-                for ep in s.get("episodes", [])
-            ]
-            seasons.append(Season(number=s["number"], episodes=episodes))
-        return Content(
-            id=item["id"],
-            title=item["title"],
-            content_type=item["type"],
-            year=item.get("year", 0),
-            seasons=seasons,
-        )
+        return self._decoder.item(response.content)
 
     def _parse_watching(self, endpoint: str) -> list[WatchingItem]:
         response = self._request("GET", endpoint)
-        return [
-            WatchingItem(
-                id=item["id"],
-                title=item["title"],
-                content_type=item["type"],
-                total=item.get("total", 0),
-                watched=item.get("watched", 0),
-            )
-            for item in response.json().get("items", [])
-        ]
+        return self._decoder.watching(response.content)
 
     def get_watching_serials(self) -> list[WatchingItem]:
         return self._parse_watching("/watching/serials")
@@ -135,14 +141,11 @@ class KinoPubClient:
 
     def get_bookmark_folders(self) -> list[BookmarkFolder]:
         response = self._request("GET", "/bookmarks")
-        return [
-            BookmarkFolder(id=item["id"], title=item["title"])
-            for item in response.json().get("items", [])
-        ]
+        return self._decoder.bookmark_folders(response.content)
 
     def get_bookmark_items(self, folder_id: int) -> list[int]:
         response = self._request("GET", f"/bookmarks/{folder_id}")
-        return [item["id"] for item in response.json().get("items", [])]
+        return self._decoder.bookmark_ids(response.content)
 
     def get_category_items(
         self,
@@ -154,20 +157,7 @@ class KinoPubClient:
             "GET",
             f"/items/{category}",
             params={"type": content_type, "perpage": str(per_page)},
+            endpoint="catalog",
         )
         now = datetime.datetime.now(tz=datetime.UTC).isoformat()
-        return [
-            CatalogEntry(
-                id=item["id"],
-                title=item["title"],
-                year=item.get("year", 0),
-                content_type=item["type"],
-                genres=[g["title"] for g in item.get("genres", [])],
-                countries=[c["title"] for c in item.get("countries", [])],
-                imdb_rating=item.get("imdb_rating"),
-                kinopoisk_rating=item.get("kinopoisk_rating"),
-                plot=item.get("plot", ""),
-                created_at=now,
-            )
-            for item in response.json().get("items", [])
-        ]
+        return self._decoder.catalog_items(response.content, now)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextlib
+import fcntl
+import functools
 import getpass
 import hashlib
 import json
 import platform
+import threading
 import time
 from typing import TYPE_CHECKING
 
@@ -13,13 +18,82 @@ from cryptography.fernet import Fernet, InvalidToken
 
 from movie_buddy.config import config as default_config
 from movie_buddy.models import AuthError, AuthTimeoutError, DeviceCode, Token
+from movie_buddy.transport import http_client
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
     from movie_buddy.config import Config
 
 
+def _derive_key() -> bytes:
+    raw = f"{platform.node()}:{getpass.getuser()}:movie_buddy_salt"
+    digest = hashlib.sha256(raw.encode()).digest()
+    return base64.urlsafe_b64encode(digest)
+
+
+@functools.cache
+def _shared_fernet() -> Fernet:
+    # The key depends only on host and user, so derive it once per process
+    return Fernet(_derive_key())
+
+
+class TokenProvider:
+    """Decrypted token of one token file, re-read only when the file changes.
+
+    The file is identified by inode, mtime and size, so the atomic rename in
+    ``KinoPubAuth.save_token`` is always noticed; otherwise a read costs one
+    ``stat`` instead of a read and a decrypt.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._stamp: tuple[int, int, int] | None = None
+        self._token: Token | None = None
+
+    def get(self) -> Token | None:
+        try:
+            st = self._path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if stamp != self._stamp:
+                self._token = self._read()
+                self._stamp = stamp
+            return self._token
+
+    def cached(self) -> Token | None:
+        """The last token read, without checking the file."""
+        return self._token
+
+    async def aget(self) -> Token | None:
+        """``get`` for event loops: any file I/O runs in a worker thread."""
+        return await asyncio.to_thread(self.get)
+
+    def _read(self) -> Token | None:
+        try:
+            data = _shared_fernet().decrypt(self._path.read_bytes())
+            return Token.from_dict(json.loads(data))
+        except (FileNotFoundError, InvalidToken, json.JSONDecodeError, KeyError):
+            return None
+
+
+_providers: dict[Path, TokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def token_provider(path: Path) -> TokenProvider:
+    """The process-wide provider for ``path``."""
+    key = path.absolute()
+    with _providers_lock:
+        if key not in _providers:
+            _providers[key] = TokenProvider(key)
+        return _providers[key]
+
+
 class KinoPubAuth:
     def __init__(
         self,
@@ -28,32 +102,43 @@ class KinoPubAuth:
     ) -> None:
         self._config = cfg or default_config
         self._token_path = token_path or self._config.token_file
-        self._fernet = Fernet(self._derive_key())
+        self._lock_path = self._token_path.with_name(self._token_path.name + ".lock")
+        self._fernet = _shared_fernet()
+        self._tokens = token_provider(self._token_path)
+        self._renew_lock = threading.Lock()
+        self._renewing: threading.Thread | None = None
 
-    @staticmethod
-    def _derive_key() -> bytes:
-        raw = f"{platform.node()}:{getpass.getuser()}:movie_buddy_salt"
-        digest = hashlib.sha256(raw.encode()).digest()
-        return base64.urlsafe_b64encode(digest)
+    @functools.cached_property
+    def _http(self) -> httpx.Client:
+        return http_client("auth", self._config)
 
-    def save_token(self, token: Token) -> None:
+    @contextlib.contextmanager
+    def _token_lock(self) -> Iterator[None]:
+        """Exclusive across processes (and threads) sharing the token file."""
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock_path.open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_token(self, token: Token) -> None:
         self._token_path.parent.mkdir(parents=True, exist_ok=True)
         data = json.dumps(token.to_dict()).encode()
-        encrypted = self._fernet.encrypt(data)
-        self._token_path.write_bytes(encrypted)
+        tmp = self._token_path.with_name(self._token_path.name + ".tmp")
+        tmp.write_bytes(self._fernet.encrypt(data))
+        tmp.replace(self._token_path)
+
+    def save_token(self, token: Token) -> None:
+        with self._token_lock():
+            self._write_token(token)
 
     def load_token(self) -> Token | None:
-        if not self._token_path.exists():
-            return None
-        try:
-            encrypted = self._token_path.read_bytes()
-            data = self._fernet.decrypt(encrypted)
-            return Token.from_dict(json.loads(data))
-        except (InvalidToken, json.JSONDecodeError, KeyError):
-            return None
+        return self._tokens.get()
 
     def start_device_flow(self) -> DeviceCode:
-        response = httpx.post(
+        response = self._http.post(
             self._config.oauth_url,
             data={
                 "grant_type": "device_code",
@@ -74,7 +159,7 @@ class KinoPubAuth:
     def poll_for_token(self, device_code: DeviceCode) -> Token:
         deadline = time.time() + device_code.expires_in
         while time.time() < deadline:
-            response = httpx.post(
+            response = self._http.post(
                 self._config.oauth_url,
                 data={
                     "grant_type": "device_token",
@@ -97,7 +182,7 @@ class KinoPubAuth:
         raise AuthTimeoutError("Device authorization timed out")
 
     def refresh_token(self, token: Token) -> Token:
-        response = httpx.post(
+        response = self._http.post(
             self._config.token_refresh_url,
             data={
                 "grant_type": "refresh_token",
@@ -115,11 +200,64 @@ class KinoPubAuth:
             expires_at=time.time() + body["expires_in"],
         )
 
-    def ensure_valid_token(self) -> Token:
+    def renew(self, token: Token) -> Token:
+        """Replace ``token`` with a refreshed one, refreshing at most once.
+
+        Concurrent callers, in this or other processes, queue on the token
+        lock; whoever gets it first refreshes and the rest re-read its result
+        instead of spending the refresh token again.
+        """
+        with self._token_lock():
+            saved = self.load_token()
+            if (
+                saved is not None
+                and saved.access_token != token.access_token
+                and not saved.is_expired
+            ):
+                return saved
+            token = self.refresh_token(saved or token)
+            self._write_token(token)
+            return token
+
+    def ensure_valid_token(self, *, background: bool = True) -> Token:
+        """The saved token, refreshed first only if it has already expired.
+
+        A token inside ``token_refresh_window`` of expiring is returned as is
+        while a background thread renews it for the next command.
+        """
         token = self.load_token()
         if token is None:
             raise AuthError("Not authenticated. Run 'movie-buddy auth' first.")
         if token.is_expired:
-            token = self.refresh_token(token)
-            self.save_token(token)
+            return self.renew(token)
+        if background and token.expires_within(self._config.token_refresh_window):
+            self.renew_in_background(token)
         return token
+
+    async def aensure_valid_token(self) -> Token:
+        """``ensure_valid_token`` for event loops.
+
+        A memoized token outside the refresh window is returned without
+        touching the disk; anything else runs in a worker thread.
+        """
+        token = self._tokens.cached()
+        window = self._config.token_refresh_window
+        if token is not None and not token.expires_within(window):
+            return token
+        return await asyncio.to_thread(self.ensure_valid_token)
+
+    def renew_in_background(self, token: Token) -> threading.Thread:
+        # Not a daemon thread: exiting waits for the save instead of
+        # cutting it short
+        with self._renew_lock:
+            if self._renewing is None or not self._renewing.is_alive():
+                self._renewing = threading.Thread(
+                    target=self._renew_quietly, args=(token,), name="token-renew"
+                )
+                self._renewing.start()
+            return self._renewing
+
+    def _renew_quietly(self, token: Token) -> None:
+        # The token is still valid; a failed early refresh is retried later
+        with contextlib.suppress(AuthError, httpx.HTTPError):
+            self.renew(token)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from movie_buddy.taste import facet_values
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from movie_buddy.ann import IVFIndex
+    from movie_buddy.embeddings import EmbeddingMatrix
+    from movie_buddy.models import CatalogEntry
+    from movie_buddy.taste import FacetAffinity, TasteProfile
+
+SHORTLIST_SIZE = 30
+
+# With an ANN index only this many nearest rows get a semantic score
+_ANN_CANDIDATES = 10 * SHORTLIST_SIZE
+
+_TOKEN_RE = re.compile(r"\w+")
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+# Relative weight of each signal in the merged candidate score
+_TEXT_WEIGHT = 0.35
+_SEMANTIC_WEIGHT = 0.35
+_TASTE_WEIGHT = 0.3
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def document_text(entry: CatalogEntry) -> str:
+    return " ".join([entry.title, *entry.genres, entry.plot])
+
+
+def _minmax(scores: NDArray[np.float64]) -> NDArray[np.float64]:
+    if len(scores) == 0:
+        return scores
+    low, high = scores.min(), scores.max()
+    if high <= low:
+        return np.zeros_like(scores)
+    return (scores - low) / (high - low)
+
+
+class BM25Index:
+    """Okapi BM25 over tokenized documents, stored as term-sorted postings."""
+
+    def __init__(self, documents: Sequence[str]) -> None:
+        self._vocab: dict[str, int] = {}
+        term_ids: list[int] = []
+        doc_ids: list[int] = []
+        lengths = np.zeros(len(documents))
+        for d, text in enumerate(documents):
+            tokens = tokenize(text)
+            lengths[d] = len(tokens)
+            term_ids.extend(self._vocab.setdefault(t, len(self._vocab)) for t in tokens)
+            doc_ids.extend([d] * len(tokens))
+
+        n_docs = max(len(documents), 1)
+        pairs = np.asarray(term_ids, dtype=np.int64) * n_docs + np.asarray(
+            doc_ids, dtype=np.int64
+        )
+        postings, tf = np.unique(pairs, return_counts=True)
+        self._docs = postings % n_docs
+        self._tf = tf.astype(np.float64)
+        self._offsets = np.searchsorted(
+            postings // n_docs, np.arange(len(self._vocab) + 1)
+        )
+        df = np.diff(self._offsets)
+        self._idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+        avg_length = lengths.mean() if len(documents) else 0.0
+        self._norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * lengths / max(avg_length, 1.0))
+
+    def scores(self, query: str) -> NDArray[np.float64]:
+        out = np.zeros(len(self._norm))
+        for token in set(tokenize(query)):
+            term = self._vocab.get(token)
+            if term is None:
+                continue
+            span = slice(self._offsets[term], self._offsets[term + 1])
+            docs, tf = self._docs[span], self._tf[span]
+            out[docs] += self._idf[term] * tf * (_BM25_K1 + 1) / (tf + self._norm[docs])
+        return out
+
+
+class CandidateGenerator:
+    """Shortlist catalog entries locally before anything is sent to the LLM.
+
+    Merges BM25 relevance to the description, embedding similarity to the
+    description and taste-profile affinity into one score per entry. With an
+    ``ann`` index, embedding similarity comes from its nearest rows instead
+    of a scan of the whole matrix; the rest score zero.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[CatalogEntry],
+        matrix: EmbeddingMatrix | None = None,
+        profile: TasteProfile | None = None,
+        ann: IVFIndex | None = None,
+    ) -> None:
+        self.entries = list(entries)
+        self.ids = np.fromiter((e.id for e in self.entries), dtype=np.int64)
+        self._matrix = matrix
+        self._ann = ann
+        self._row_of = (
+            {item_id: i for i, item_id in enumerate(self.ids.tolist())}
+            if ann is not None
+            else {}
+        )
+        self._bm25 = BM25Index([document_text(e) for e in self.entries])
+        self._rows: NDArray[np.intp] | None = None
+        self._found: NDArray[np.bool_] | None = None
+        if matrix is not None and len(matrix):
+            self._rows, self._found = matrix.rows_for(self.ids)
+        self._taste = self._taste_scores(profile)
+
+    def _similarity(self, vector: ArrayLike) -> NDArray[np.float64]:
+        out = np.zeros(len(self.entries))
+        if self._ann is not None:
+            for item_id, score in self._ann.search(vector, k=_ANN_CANDIDATES):
+                row = self._row_of.get(item_id)
+                if row is not None:
+                    out[row] = score
+            return out
+        if self._matrix is None or self._rows is None or self._found is None:
+            return out
+        out[self._found] = self._matrix.scores(vector)[self._rows]
+        return out
+
+    def _facet_scores(self, facet: FacetAffinity, name: str) -> NDArray[np.float64]:
+        values = [facet_values(e, name) for e in self.entries]
+        lengths = np.fromiter((len(v) for v in values), dtype=np.intp)
+        positions = np.fromiter(
+            (facet.index.get(v, -1) for vs in values for v in vs), dtype=np.intp
+        )
+        affinity = np.append(facet.scores(), 0.0)
+        sums = np.bincount(
+            np.repeat(np.arange(len(self.entries)), lengths),
+            weights=affinity[positions],
+            minlength=len(self.entries),
+        )
+        return sums / np.maximum(lengths, 1)
+
+    def _taste_scores(self, profile: TasteProfile | None) -> NDArray[np.float64]:
+        if profile is None:
+            return np.zeros(len(self.entries))
+        taste = sum(
+            (self._facet_scores(f, name) for name, f in profile.facets.items()),
+            start=np.zeros(len(self.entries)),
+        )
+        centroid = profile.centroid
+        if (
+            centroid is not None
+            and self._matrix is not None
+            and len(centroid) == self._matrix.dim
+        ):
+            taste = taste + self._similarity(centroid)
+        return _minmax(taste)
+
+    def generate(
+        self,
+        description: str,
+        query_vector: ArrayLike | None = None,
+        *,
+        allowed_ids: Collection[int] | None = None,
+        limit: int = SHORTLIST_SIZE,
+    ) -> list[CatalogEntry]:
+        score = _TEXT_WEIGHT * _minmax(self._bm25.scores(description))
+        if query_vector is not None:
+            score += _SEMANTIC_WEIGHT * _minmax(self._similarity(query_vector))
+        score += _TASTE_WEIGHT * self._taste
+        if allowed_ids is not None:
+            allowed = np.isin(self.ids, np.fromiter(allowed_ids, dtype=np.int64))
+            score[~allowed] = -np.inf
+
+        eligible = int(np.isfinite(score).sum())
+        k = min(limit, eligible)
+        if k <= 0:
+            return []
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind="stable")]
+        return [self.entries[i] for i in top.tolist()]
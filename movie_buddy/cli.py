@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import datetime
+import json
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from movie_buddy.api import KinoPubClient
-from movie_buddy.auth import KinoPubAuth
 from movie_buddy.browser import open_in_chrome
+from movie_buddy.config import config
+from movie_buddy.daemon import RemoteTarget, find_daemon
+from movie_buddy.daemon import serve as serve_daemon
+from movie_buddy.lazy import LazyImport
 from movie_buddy.matcher import rank_results
 from movie_buddy.models import (
     AuthError,
@@ -18,11 +25,70 @@ from movie_buddy.models import (
     CatalogEntry,
     Content,
     KinoPubError,
+    LLMError,
     NetworkError,
     Rating,
+    Recommendation,
     WatchingItem,
 )
-from movie_buddy.storage import TursoStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from movie_buddy import ann
+    from movie_buddy.api import KinoPubClient
+    from movie_buddy.auth import KinoPubAuth
+    from movie_buddy.candidates import CandidateGenerator
+    from movie_buddy.dedup import MinHashIndex, cluster_duplicates
+    from movie_buddy.embeddings import (
+        EmbeddingCache,
+        EmbeddingMatrix,
+        OpenAIEmbedder,
+        embed_cached,
+        sync_embeddings,
+    )
+    from movie_buddy.episodes import EpisodeCache, EpisodeStore, WatchHistory
+    from movie_buddy.facets import FacetIndex
+    from movie_buddy.recommender import (
+        MovieRecommender,
+        RecommendationCache,
+        normalize_query,
+    )
+    from movie_buddy.similarity import ItemSimilarity, update_neighbors
+    from movie_buddy.snapshot import export_snapshot, load_snapshot
+    from movie_buddy.storage import TursoStorage
+    from movie_buddy.taste import load_taste_profile
+else:
+    # numpy, httpx, cryptography, libsql, openai and pyarrow together cost
+    # most of a second to import; commands pull in only what they touch.
+    np = LazyImport("numpy")
+    ann = LazyImport("movie_buddy.ann")
+    KinoPubClient = LazyImport("movie_buddy.api", "KinoPubClient")
+    KinoPubAuth = LazyImport("movie_buddy.auth", "KinoPubAuth")
+    CandidateGenerator = LazyImport("movie_buddy.candidates", "CandidateGenerator")
+    MinHashIndex = LazyImport("movie_buddy.dedup", "MinHashIndex")
+    cluster_duplicates = LazyImport("movie_buddy.dedup", "cluster_duplicates")
+    EmbeddingCache = LazyImport("movie_buddy.embeddings", "EmbeddingCache")
+    EmbeddingMatrix = LazyImport("movie_buddy.embeddings", "EmbeddingMatrix")
+    OpenAIEmbedder = LazyImport("movie_buddy.embeddings", "OpenAIEmbedder")
+    embed_cached = LazyImport("movie_buddy.embeddings", "embed_cached")
+    sync_embeddings = LazyImport("movie_buddy.embeddings", "sync_embeddings")
+    EpisodeCache = LazyImport("movie_buddy.episodes", "EpisodeCache")
+    EpisodeStore = LazyImport("movie_buddy.episodes", "EpisodeStore")
+    WatchHistory = LazyImport("movie_buddy.episodes", "WatchHistory")
+    FacetIndex = LazyImport("movie_buddy.facets", "FacetIndex")
+    MovieRecommender = LazyImport("movie_buddy.recommender", "MovieRecommender")
+    RecommendationCache = LazyImport("movie_buddy.recommender", "RecommendationCache")
+    normalize_query = LazyImport("movie_buddy.recommender", "normalize_query")
+    ItemSimilarity = LazyImport("movie_buddy.similarity", "ItemSimilarity")
+    update_neighbors = LazyImport("movie_buddy.similarity", "update_neighbors")
+    export_snapshot = LazyImport("movie_buddy.snapshot", "export_snapshot")
+    load_snapshot = LazyImport("movie_buddy.snapshot", "load_snapshot")
+    TursoStorage = LazyImport("movie_buddy.storage", "TursoStorage")
+    load_taste_profile = LazyImport("movie_buddy.taste", "load_taste_profile")
 
 app = typer.Typer(name="movie-buddy", help="Open random episodes on kino.pub")
 console = Console()
@@ -34,6 +100,24 @@ TYPE_LABELS: dict[str, str] = {
 }
 
 
+def _kinopub_client() -> KinoPubClient:
+    """The daemon's warm client when one is running, else a fresh one."""
+    socket_path = find_daemon(config)
+    if socket_path is not None:
+        return cast("KinoPubClient", RemoteTarget(socket_path, "kinopub"))
+    kinopub_auth = KinoPubAuth()
+    return KinoPubClient(kinopub_auth.ensure_valid_token(), auth=kinopub_auth)
+
+
+def _storage() -> TursoStorage:
+    socket_path = find_daemon(config)
+    if socket_path is not None:
+        return cast("TursoStorage", RemoteTarget(socket_path, "storage"))
+    storage = TursoStorage()
+    storage.init_schema()
+    return storage
+
+
 @app.command()
 def auth(
     force: bool = typer.Option(False, help="Re-authenticate even if token exists"),
@@ -81,6 +165,23 @@ def auth(
     console.print("[green]Authenticated successfully![/green]")
 
 
+@app.command()
+def daemon() -> None:
+    """Keep kino.pub and Turso connections warm for other commands.
+
+    Runs in the foreground and serves commands over a Unix socket in the
+    config directory until interrupted.
+
+    Example: movie-buddy daemon
+    Example: nohup movie-buddy daemon >/dev/null 2>&1 &
+    """
+    if find_daemon(config) is not None:
+        console.print("[yellow]A movie-buddy daemon is already running.[/yellow]")
+        raise typer.Exit(code=1)
+    console.print(f"Serving on {config.daemon_socket}. Press Ctrl-C to stop.")
+    serve_daemon(config)
+
+
 def _fetch_activity_ids(client: KinoPubClient) -> tuple[set[int], set[int]]:
     watching_ids: set[int] = set()
     bookmark_ids: set[int] = set()
@@ -122,15 +223,50 @@ def _prompt_picker(results: list[Content]) -> Content:
 
 @app.command()
 def watch(
-    name: str = typer.Argument(help="Movie or series name to search for"),
+    name: str | None = typer.Argument(None, help="Movie or series name to search for"),
+    pick_random: bool = typer.Option(
+        False, "--random", help="Pick an unrated catalog title instead"
+    ),
+    genre: list[str] | None = typer.Option(
+        None, help="With --random: only these genres"
+    ),
+    country: list[str] | None = typer.Option(
+        None, help="With --random: only these countries"
+    ),
+    decade: list[str] | None = typer.Option(
+        None, help="With --random: only these decades, e.g. 1990s"
+    ),
+    content_type: list[str] | None = typer.Option(
+        None, "--type", help="With --random: movie, serial or tvshow"
+    ),
+    min_imdb: float | None = typer.Option(
+        None, help="With --random: minimum IMDb rating"
+    ),
+    favor_season: list[int] | None = typer.Option(
+        None, help="Make episodes of this season likelier (repeatable)"
+    ),
 ) -> None:
     """Open a random episode of a series (or movie page) in Chrome.
 
     Example: movie-buddy watch "Friends"
     Example: movie-buddy watch "The Matrix"
+    Example: movie-buddy watch "Friends" --favor-season 5 --favor-season 6
+    Example: movie-buddy watch --random --genre Comedy --decade 1990s --min-imdb 7
     """
+    if (name is None and not pick_random) or (name is not None and pick_random):
+        console.print("[red]Pass either a title to search for or --random.[/red]")
+        raise typer.Exit(code=1)
     try:
-        _watch_impl(name)
+        if name is not None:
+            _watch_impl(name, favor_season or [])
+        else:
+            facets = _facet_filters(
+                content_type=content_type,
+                genre=genre,
+                country=country,
+                decade=decade,
+            )
+            _watch_random_impl(facets, min_imdb)
     except AuthError as e:
         console.print(
             Panel(
@@ -161,10 +297,8 @@ def watch(
         raise typer.Exit(code=1) from None
 
 
-def _watch_impl(name: str) -> None:
-    kinopub_auth = KinoPubAuth()
-    token = kinopub_auth.ensure_valid_token()
-    client = KinoPubClient(token)
+def _watch_impl(name: str, favor_seasons: Collection[int] = ()) -> None:
+    client = _kinopub_client()
 
     with console.status("Searching kino.pub..."):
         results = client.search(name)
@@ -191,10 +325,64 @@ def _watch_impl(name: str) -> None:
         else:
             selected = _prompt_picker(results)
 
-    _open_content(client, selected)
+    _open_content(client, selected, favor_seasons)
+
+
+def _watch_random_impl(facets: dict[str, list[str]], min_imdb: float | None) -> None:
+    storage = _storage()
+    index = _load_facet_index(storage)
+    bitmap = index.select(facets)
+    if min_imdb is not None:
+        bitmap &= index.imdb_at_least(min_imdb)
+    hidden = storage.get_rated_content_ids() | storage.get_duplicate_ids()
+    bitmap &= ~index.of_ids(hidden)
+    matched = index.count(bitmap)
+    if not matched:
+        console.print("[red]No unrated catalog titles match these filters.[/red]")
+        raise typer.Exit(code=1)
+
+    item_id = index.nth(bitmap, random.randrange(matched))  # noqa: S311
+    entry = storage.get_catalog_entries_by_ids([item_id])[0]
+    console.print(f"[cyan]Picked 1 of {matched} matching titles.[/cyan]")
+
+    client = _kinopub_client()
+    _open_content(
+        client,
+        Content(
+            id=entry.id,
+            title=entry.title,
+            content_type=entry.content_type,
+            year=entry.year,
+            seasons=[],
+        ),
+    )
 
 
-def _open_content(client: KinoPubClient, selected: Content) -> None:
+# Favoured seasons are this many times likelier than the rest
+_FAVORED_SEASON_WEIGHT = 3.0
+
+
+def _load_episodes(client: KinoPubClient, item_id: int) -> tuple[str, EpisodeStore]:
+    cache = EpisodeCache(config.episode_cache_file)
+    try:
+        cached = cache.get(item_id)
+        if cached is not None:
+            return cached
+        with console.status("Fetching episode list..."):
+            detailed = client.get_item(item_id)
+        store = EpisodeStore.from_content(detailed)
+        if len(store):
+            cache.put(item_id, detailed.title, store)
+        return detailed.title, store
+    finally:
+        cache.close()
+
+
+def _open_content(
+    client: KinoPubClient,
+    selected: Content,
+    favor_seasons: Collection[int] = (),
+) -> None:
     if selected.content_type == "movie":
         url = selected.build_watch_url()
         console.print(
@@ -204,20 +392,29 @@ def _open_content(client: KinoPubClient, selected: Content) -> None:
             )
         )
     else:
-        with console.status("Fetching episode list..."):
-            detailed = client.get_item(selected.id)
-
-        all_episodes = detailed.all_episodes
-        if not all_episodes:
+        title, store = _load_episodes(client, selected.id)
+        if not len(store):
             console.print("[red]No episodes found for this series.[/red]")
             raise typer.Exit(code=1)
 
-        episode = random.choice(all_episodes)  # noqa: S311
-        url = detailed.build_watch_url(episode)
+        weights = None
+        if favor_seasons and any(s in favor_seasons for s in store.seasons):
+            weights = store.weights(
+                season_weights=dict.fromkeys(favor_seasons, _FAVORED_SEASON_WEIGHT)
+            )
+        history = WatchHistory(config.watch_history_file)
+        opened = history.opened(selected.id)
+        if opened.issuperset(store.ids):
+            history.new_round(selected.id)
+            opened = set()
+        episode = store.episode(store.sample(weights, skip=opened))
+        history.record(selected.id, episode)
+        url = selected.build_watch_url(episode)
+        label = f"S{episode.season_number:02d}E{episode.number:02d}"
         console.print(
             Panel(
-                f"[bold]{detailed.title}[/bold]\n"
-                f"S{episode.season_number:02d}E{episode.number:02d}: {episode.title}",
+                f"[bold]{title}[/bold]\n"
+                + (f"{label}: {episode.title}" if episode.title else label),
                 title="Random Episode",
             )
         )
@@ -259,11 +456,8 @@ def rate() -> None:
 
 
 def _rate_impl() -> None:
-    kinopub_auth = KinoPubAuth()
-    token = kinopub_auth.ensure_valid_token()
-    client = KinoPubClient(token)
-    storage = TursoStorage()
-    storage.init_schema()
+    client = _kinopub_client()
+    storage = _storage()
 
     with console.status("Fetching watching history..."):
         watching: list[WatchingItem] = []
@@ -279,6 +473,13 @@ def _rate_impl() -> None:
 
     candidates = unrated[:10]
     rated_count = 0
+    matrix = EmbeddingMatrix.load(config)
+    profile = load_taste_profile(
+        storage, config.taste_profile_file, matrix, rated_ids=rated_ids
+    )
+    entries = {
+        e.id: e for e in storage.get_catalog_entries_by_ids([c.id for c in candidates])
+    }
 
     for item in candidates:
         label = TYPE_LABELS.get(item.content_type, item.content_type)
@@ -306,6 +507,8 @@ def _rate_impl() -> None:
                     rated_at=now,
                 )
                 storage.insert_ratings([rating])
+                profile.add(rating, entries.get(item.id), _vector_for(matrix, item.id))
+                profile.save(config.taste_profile_file)
                 rated_count += 1
                 break
             console.print(
@@ -315,21 +518,347 @@ def _rate_impl() -> None:
     _print_rate_summary(rated_count, storage)
 
 
+def _vector_for(
+    matrix: EmbeddingMatrix | None, content_id: int
+) -> NDArray[np.float32] | None:
+    if matrix is None:
+        return None
+    rows, _ = matrix.rows_for([content_id])
+    # Copy out of the read-only memory map
+    return np.array(matrix.vectors[rows[0]]) if len(rows) else None
+
+
 def _print_rate_summary(rated_count: int, storage: TursoStorage) -> None:
     total = len(storage.get_all_ratings())
     console.print(f"Rated {rated_count} movies. Total ratings: {total}.")
 
 
+_MIN_RATINGS = 5
+_BATCH_CONCURRENCY = 4
+
+
+@app.command()
+def recommend(
+    description: str | None = typer.Argument(
+        None, help="Natural language description of what you want to watch"
+    ),
+    content_type: str | None = typer.Option(
+        None, "--type", help="Only recommend this type (movie, serial, tvshow)"
+    ),
+    min_imdb: float | None = typer.Option(None, help="Minimum IMDb rating"),
+    genre: list[str] | None = typer.Option(
+        None, help="Only these genres (repeat to allow several)"
+    ),
+    country: list[str] | None = typer.Option(
+        None, help="Only these countries (repeat to allow several)"
+    ),
+    decade: list[str] | None = typer.Option(
+        None, help="Only these decades, e.g. 1990s (repeat to allow several)"
+    ),
+    batch: Path | None = typer.Option(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="File with one description per line; runs them all",
+    ),
+    out: Path | None = typer.Option(
+        None, dir_okay=False, help="JSONL file to write --batch results to"
+    ),
+    concurrency: int = typer.Option(
+        _BATCH_CONCURRENCY, min=1, help="Parallel LLM calls in --batch mode"
+    ),
+) -> None:
+    """Get 3 personalized recommendations from your catalog.
+
+    Example: movie-buddy recommend "something funny for a rainy evening"
+    Example: movie-buddy recommend "a tense thriller" --type movie --min-imdb 7
+    Example: movie-buddy recommend "cosy" --genre Comedy --decade 1990s
+    Example: movie-buddy recommend --batch queries.txt --out results.jsonl
+    """
+    if batch is None and description is None:
+        console.print("[red]Describe what you want to watch, or pass --batch.[/red]")
+        raise typer.Exit(code=1)
+    if batch is not None and out is None:
+        console.print("[red]--batch requires --out for the JSONL results.[/red]")
+        raise typer.Exit(code=1)
+
+    facets = _facet_filters(genre=genre, country=country, decade=decade)
+    try:
+        if batch is not None and out is not None:
+            _recommend_batch_impl(
+                batch, out, content_type, min_imdb, concurrency, facets
+            )
+        elif description is not None:
+            _recommend_impl(description, content_type, min_imdb, facets)
+    except AuthError as e:
+        console.print(
+            Panel(
+                "[red]Authentication required.[/red]\n"
+                "Please run [bold]movie-buddy auth[/bold] to authenticate.\n"
+                f"Details: {e}",
+                title="Auth Error",
+            )
+        )
+        raise typer.Exit(code=1) from None
+    except NetworkError as e:
+        console.print(
+            Panel(
+                "[red]Unable to reach kino.pub.[/red]\n"
+                "Check your internet connection and try again.\n"
+                f"Details: {e}",
+                title="Network Error",
+            )
+        )
+        raise typer.Exit(code=1) from None
+    except KinoPubError as e:
+        console.print(Panel(f"[red]An error occurred:[/red] {e}", title="Error"))
+        raise typer.Exit(code=1) from None
+
+
+@dataclass
+class _RecommendInputs:
+    ratings: list[Rating]
+    rated_entries: dict[int, CatalogEntry]
+    matrix: EmbeddingMatrix | None
+    generator: CandidateGenerator
+    allowed_ids: list[int]
+
+
+def _load_recommend_inputs(
+    storage: TursoStorage,
+    content_type: str | None,
+    min_imdb: float | None,
+    facets: dict[str, list[str]] | None = None,
+) -> _RecommendInputs:
+    ratings = storage.get_all_ratings()
+    if len(ratings) < _MIN_RATINGS:
+        console.print(
+            f"[red]You need at least {_MIN_RATINGS} ratings. "
+            "Run `movie-buddy rate` first.[/red]"
+        )
+        raise typer.Exit(code=1)
+
+    rated_ids = {r.content_id for r in ratings}
+    allowed_ids = storage.get_candidate_ids(
+        content_type=content_type, min_imdb=min_imdb
+    )
+    if facets:
+        # Only the matching titles (and the rated ones) are read back
+        index = _load_facet_index(storage)
+        bitmap = index.select(facets) & index.of_ids(allowed_ids)
+        allowed_ids = index.to_ids(bitmap).tolist()
+        catalog_size = len(index)
+        entries = storage.get_catalog_entries_by_ids(sorted({*allowed_ids, *rated_ids}))
+    else:
+        entries = storage.get_catalog_entries()
+        catalog_size = len(entries)
+    if not catalog_size:
+        console.print("[red]Catalog is empty. Run `movie-buddy catalog` first.[/red]")
+        raise typer.Exit(code=1)
+
+    matrix = EmbeddingMatrix.load(config)
+    profile = load_taste_profile(
+        storage, config.taste_profile_file, matrix, rated_ids=rated_ids
+    )
+    # A facet subset is small enough to scan exactly
+    ann_index = None if facets else _load_ann_index(matrix)
+    by_id = {e.id: e for e in entries}
+    return _RecommendInputs(
+        ratings=ratings,
+        rated_entries={
+            r.content_id: by_id[r.content_id] for r in ratings if r.content_id in by_id
+        },
+        matrix=matrix,
+        generator=CandidateGenerator(entries, matrix, profile, ann_index),
+        allowed_ids=allowed_ids,
+    )
+
+
+def _recommend_impl(
+    description: str,
+    content_type: str | None,
+    min_imdb: float | None,
+    facets: dict[str, list[str]] | None = None,
+) -> None:
+    client = _kinopub_client()
+    storage = _storage()
+    inputs = _load_recommend_inputs(storage, content_type, min_imdb, facets)
+
+    with console.status("Generating recommendations..."):
+        query_vectors = _embed_queries([description], inputs.matrix)
+        candidates = inputs.generator.generate(
+            description,
+            None if query_vectors is None else query_vectors[0],
+            allowed_ids=inputs.allowed_ids,
+        )
+        if not candidates:
+            console.print("[red]No unrated catalog titles match these filters.[/red]")
+            raise typer.Exit(code=1)
+        recommendations: list[Recommendation] = []
+        cache = RecommendationCache(config.recommendation_cache_file)
+        try:
+            recommender = MovieRecommender(config, cache=cache)
+            for rec in recommender.stream_recommendations(
+                inputs.ratings, candidates, description, inputs.rated_entries
+            ):
+                recommendations.append(rec)
+                _show_recommendation(len(recommendations), rec)
+        finally:
+            cache.close()
+
+    if not recommendations:
+        console.print("[red]No recommendations returned. Try rephrasing.[/red]")
+        raise typer.Exit(code=1)
+
+    _prompt_open_recommendation(client, recommendations)
+
+
+def _read_batch_queries(path: Path) -> list[str]:
+    lines = (line.strip() for line in path.read_text(encoding="utf-8").splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _recommend_batch_impl(
+    batch: Path,
+    out: Path,
+    content_type: str | None,
+    min_imdb: float | None,
+    concurrency: int,
+    facets: dict[str, list[str]] | None = None,
+) -> None:
+    queries = _read_batch_queries(batch)
+    if not queries:
+        console.print(f"[red]No queries found in {batch}.[/red]")
+        raise typer.Exit(code=1)
+
+    storage = _storage()
+    inputs = _load_recommend_inputs(storage, content_type, min_imdb, facets)
+
+    # Identical queries (after normalization) share one LLM call
+    groups: dict[str, list[str]] = {}
+    for query in queries:
+        groups.setdefault(normalize_query(query), []).append(query)
+    unique = [group[0] for group in groups.values()]
+
+    cache = RecommendationCache(config.recommendation_cache_file)
+    failed = 0
+    try:
+        recommender = MovieRecommender(config, cache=cache)
+        with console.status("Embedding queries..."):
+            query_vectors = _embed_queries(unique, inputs.matrix)
+
+        def run(index: int) -> list[Recommendation]:
+            candidates = inputs.generator.generate(
+                unique[index],
+                None if query_vectors is None else query_vectors[index],
+                allowed_ids=inputs.allowed_ids,
+            )
+            if not candidates:
+                return []
+            return recommender.get_recommendations(
+                inputs.ratings, candidates, unique[index], inputs.rated_entries
+            )
+
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with (
+            out.open("w", encoding="utf-8") as f,
+            ThreadPoolExecutor(max_workers=concurrency) as pool,
+            console.status(f"Generating recommendations... 0/{len(unique)}") as status,
+        ):
+            futures = {pool.submit(run, i): i for i in range(len(unique))}
+            for done, future in enumerate(as_completed(futures), 1):
+                query = unique[futures[future]]
+                result: dict[str, object]
+                try:
+                    recs = future.result()
+                    result = {"recommendations": [asdict(r) for r in recs]}
+                except LLMError as e:
+                    failed += 1
+                    result = {"error": str(e)}
+                for original in groups[normalize_query(query)]:
+                    record = {"query": original, **result}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                status.update(f"Generating recommendations... {done}/{len(unique)}")
+    finally:
+        cache.close()
+
+    console.print(
+        f"[green]Wrote {len(queries)} results ({len(unique)} unique queries) "
+        f"to {out}.[/green]"
+    )
+    if failed:
+        console.print(f"[yellow]{failed} queries failed; see the error field.[/yellow]")
+
+
+def _embed_queries(
+    descriptions: list[str], matrix: EmbeddingMatrix | None
+) -> NDArray[np.float32] | None:
+    if matrix is None or not config.openai_api_key:
+        return None
+    cache = EmbeddingCache(config.embedding_cache_file)
+    try:
+        vectors, _ = embed_cached(descriptions, OpenAIEmbedder(config), cache)
+    finally:
+        cache.close()
+    return vectors
+
+
+def _show_recommendation(number: int, rec: Recommendation) -> None:
+    console.print(
+        Panel(
+            rec.explanation,
+            title=f"[bold]{number}. {rec.title}[/bold] ({rec.year})",
+            subtitle=TYPE_LABELS.get(rec.content_type, rec.content_type),
+            title_align="left",
+        )
+    )
+
+
+def _prompt_open_recommendation(
+    client: KinoPubClient, recommendations: list[Recommendation]
+) -> None:
+    count = len(recommendations)
+    while True:
+        choice = console.input(
+            "Pick a number to open in Chrome (or Enter to skip): "
+        ).strip()
+        if not choice:
+            return
+        if choice.isdigit() and 1 <= int(choice) <= count:
+            break
+        console.print(f"[red]Enter a number between 1 and {count}.[/red]")
+
+    rec = recommendations[int(choice) - 1]
+    _open_content(
+        client,
+        Content(
+            id=rec.content_id,
+            title=rec.title,
+            content_type=rec.content_type,
+            year=rec.year,
+            seasons=[],
+        ),
+    )
+
+
 _CATALOG_CATEGORIES = ("fresh", "hot", "popular")
 _CATALOG_TYPES = ("movie", "serial", "tvshow")
 
 
-@app.command()
-def catalog() -> None:
+catalog_app = typer.Typer(help="Grow the recommendation catalog and export it")
+app.add_typer(catalog_app, name="catalog")
+
+
+@catalog_app.callback(invoke_without_command=True)
+def catalog(ctx: typer.Context) -> None:
     """Fetch content from kino.pub and grow the recommendation catalog.
 
     Example: movie-buddy catalog
+    Example: movie-buddy catalog export --format parquet
     """
+    if ctx.invoked_subcommand is not None:
+        return
     try:
         _catalog_impl()
     except AuthError as e:
@@ -358,11 +887,8 @@ def catalog() -> None:
 
 
 def _catalog_impl() -> None:
-    kinopub_auth = KinoPubAuth()
-    token = kinopub_auth.ensure_valid_token()
-    client = KinoPubClient(token)
-    storage = TursoStorage()
-    storage.init_schema()
+    client = _kinopub_client()
+    storage = _storage()
 
     existing_ids = storage.get_existing_catalog_ids()
     all_fetched: list[CatalogEntry] = []
@@ -390,3 +916,362 @@ def _catalog_impl() -> None:
         f"Catalog updated: {len(unique_new)} new entries added.\n"
         f"Total catalog size: {total} items."
     )
+
+    _update_facet_index(storage, unique_new, total)
+    _update_duplicates(storage, unique_new, total)
+
+    changed_ids = {e.id for e in unique_new}
+    if config.openai_api_key:
+        changed_ids.update(_sync_catalog_embeddings(storage, existing_ids, unique_new))
+    _update_similar_titles(storage, changed_ids)
+
+
+@catalog_app.command("export")
+def catalog_export(
+    fmt: str = typer.Option(
+        "parquet", "--format", help="Snapshot format: parquet or arrow"
+    ),
+    out: Path = typer.Option(
+        Path("catalog-snapshot"), help="Directory for catalog and ratings files"
+    ),
+) -> None:
+    """Export the catalog and ratings tables as columnar files.
+
+    Example: movie-buddy catalog export
+    Example: movie-buddy catalog export --format arrow --out ~/snapshots/today
+    """
+    try:
+        storage = TursoStorage()
+        storage.init_schema()
+        with console.status("Writing snapshot..."):
+            written = export_snapshot(storage, out.expanduser(), fmt)
+    except KinoPubError as e:
+        console.print(Panel(f"[red]An error occurred:[/red] {e}", title="Error"))
+        raise typer.Exit(code=1) from None
+    for name, (path, rows) in written.items():
+        console.print(f"Wrote {rows} {name} rows to {path}")
+
+
+@catalog_app.command("stats")
+def catalog_stats(
+    snapshot: Path | None = typer.Option(
+        None, help="Read an exported snapshot directory instead of the database"
+    ),
+) -> None:
+    """Summarise the catalog by type, genre, country and decade.
+
+    Example: movie-buddy catalog stats
+    Example: movie-buddy catalog stats --snapshot ~/snapshots/today
+    """
+    try:
+        if snapshot is not None:
+            tables = load_snapshot(snapshot.expanduser())
+            index, rated = tables.facet_index(), tables.ratings.num_rows
+        else:
+            storage = _storage()
+            index = _load_facet_index(storage)
+            rated = len(storage.get_rated_content_ids())
+    except KinoPubError as e:
+        console.print(Panel(f"[red]An error occurred:[/red] {e}", title="Error"))
+        raise typer.Exit(code=1) from None
+    console.print(f"[bold]{len(index)}[/bold] catalog titles, {rated} rated.")
+    _print_facet_counts(index, index.all())
+
+
+def _sync_catalog_embeddings(
+    storage: TursoStorage,
+    existing_ids: set[int],
+    new_entries: list[CatalogEntry],
+) -> list[int]:
+    matrix = EmbeddingMatrix.load(config)
+    embedded_ids = set() if matrix is None else set(matrix.ids.tolist())
+    if existing_ids <= embedded_ids:
+        pending = new_entries
+    else:
+        # Backfill rows left unembedded by an earlier run
+        pending = [e for e in storage.get_catalog_entries() if e.id not in embedded_ids]
+    if not pending:
+        return []
+
+    cache = EmbeddingCache(config.embedding_cache_file)
+    try:
+        with console.status("Embedding plots..."):
+            matrix, embedded = sync_embeddings(
+                pending, OpenAIEmbedder(config), cache, matrix
+            )
+    finally:
+        cache.close()
+    matrix.save(config)
+    console.print(f"Embedded {embedded} new plots.")
+    pending_ids = [e.id for e in pending]
+    _update_ann_index(matrix, pending_ids)
+    return pending_ids
+
+
+def _update_ann_index(matrix: EmbeddingMatrix, changed_ids: list[int]) -> None:
+    index = ann.IVFIndex.load(config.ann_index_dir)
+    if index is not None:
+        rows = np.isin(matrix.ids, changed_ids)
+        index = index.add(matrix.ids[rows], matrix.vectors[rows])
+    elif len(matrix) >= ann.ANN_MIN_ROWS:
+        with console.status("Building similarity index..."):
+            index = ann.IVFIndex.build(matrix)
+    else:
+        return
+    index.save(config.ann_index_dir)
+
+
+def _load_ann_index(matrix: EmbeddingMatrix | None) -> ann.IVFIndex | None:
+    """The saved IVF index, once the matrix is big enough to need one."""
+    if matrix is None or len(matrix) < ann.ANN_MIN_ROWS:
+        return None
+    return ann.IVFIndex.load(config.ann_index_dir)
+
+
+def _update_similar_titles(storage: TursoStorage, changed_ids: set[int]) -> None:
+    floors = storage.get_neighbor_floors()
+    if floors and not changed_ids:
+        return
+    entries = storage.get_catalog_entries()
+    if not entries:
+        return
+
+    with console.status("Updating similar titles..."):
+        matrix = EmbeddingMatrix.load(config)
+        similarity = ItemSimilarity(entries, matrix, _load_ann_index(matrix))
+        if floors:
+            neighbors = update_neighbors(
+                similarity,
+                changed_ids,
+                floors=floors,
+                stale_ids=storage.get_neighbor_sources(changed_ids),
+                load_stored=storage.get_neighbor_lists,
+            )
+        else:
+            neighbors = similarity.neighbors([e.id for e in entries])
+        storage.replace_neighbors(neighbors)
+    console.print(f"Similar titles updated for {len(neighbors)} items.")
+
+
+@app.command()
+def similar(
+    title: str = typer.Argument(help="Catalog title to find similar content for"),
+    limit: int = typer.Option(10, min=1, help="How many similar titles to show"),
+) -> None:
+    """Show catalog titles similar to one you name, without calling the LLM.
+
+    Example: movie-buddy similar "Interstellar"
+    Example: movie-buddy similar "Friends" --limit 5
+    """
+    try:
+        _similar_impl(title, limit)
+    except KinoPubError as e:
+        console.print(Panel(f"[red]An error occurred:[/red] {e}", title="Error"))
+        raise typer.Exit(code=1) from None
+
+
+def _similar_impl(title: str, limit: int) -> None:
+    storage = _storage()
+
+    matches = storage.find_catalog_entries(title)
+    if not matches:
+        console.print(
+            f"[red]No catalog titles match '{title}'. "
+            "Run `movie-buddy catalog` to grow the catalog.[/red]"
+        )
+        raise typer.Exit(code=1)
+
+    exact = [m for m in matches if m.title.casefold() == title.casefold()]
+    if len(matches) == 1 or len(exact) == 1:
+        selected = exact[0] if exact else matches[0]
+    else:
+        picked = _prompt_picker(
+            [
+                Content(
+                    id=m.id,
+                    title=m.title,
+                    content_type=m.content_type,
+                    year=m.year,
+                    seasons=[],
+                )
+                for m in matches
+            ]
+        )
+        selected = next(m for m in matches if m.id == picked.id)
+
+    neighbors = storage.get_similar_entries(selected.id, limit)
+    if not neighbors:
+        console.print(
+            f"[red]No similar titles computed for '{selected.title}' yet. "
+            "Run `movie-buddy catalog` to build them.[/red]"
+        )
+        raise typer.Exit(code=1)
+
+    table = Table(title=f"More like {selected.title} ({selected.year})")
+    table.add_column("#", style="bold")
+    table.add_column("Title")
+    table.add_column("Year")
+    table.add_column("Type")
+    table.add_column("IMDb")
+    table.add_column("Match")
+    for i, (entry, score) in enumerate(neighbors, 1):
+        table.add_row(
+            str(i),
+            entry.title,
+            str(entry.year),
+            TYPE_LABELS.get(entry.content_type, entry.content_type),
+            "" if entry.imdb_rating is None else f"{entry.imdb_rating:.1f}",
+            f"{score:.0%}",
+        )
+    console.print(table)
+
+
+def _facet_filters(
+    *,
+    content_type: list[str] | None = None,
+    genre: list[str] | None = None,
+    country: list[str] | None = None,
+    decade: list[str] | None = None,
+) -> dict[str, list[str]]:
+    filters = {
+        "types": content_type or [],
+        "genres": genre or [],
+        "countries": country or [],
+        "decades": [d.strip().removesuffix("s") for d in decade or []],
+    }
+    return {facet: values for facet, values in filters.items() if values}
+
+
+def _update_facet_index(
+    storage: TursoStorage, new_entries: list[CatalogEntry], total: int
+) -> None:
+    index = FacetIndex.load(config.facet_index_file)
+    if index is not None:
+        index = index.add(new_entries)
+    if index is None or len(index) != total:
+        index = FacetIndex.build(storage.get_catalog_entries())
+    index.save(config.facet_index_file)
+
+
+def _update_duplicates(
+    storage: TursoStorage, new_entries: list[CatalogEntry], total: int
+) -> None:
+    index = MinHashIndex.load(config.minhash_file)
+    query: list[int] | None = [e.id for e in new_entries]
+    if index is not None:
+        index = index.add(new_entries)
+    if index is None or len(index) != total:
+        index = MinHashIndex.build(storage.get_catalog_entries())
+        query = None
+    pairs = index.duplicate_pairs(query) if query != [] else []
+    index.save(config.minhash_file)
+    if not pairs:
+        return
+
+    existing = storage.get_duplicate_clusters({i for pair in pairs for i in pair})
+    canonical = cluster_duplicates(pairs, existing)
+    storage.set_canonical_ids(canonical)
+    hidden = sum(1 for item, root in canonical.items() if item != root)
+    console.print(f"Near-duplicates: {hidden} titles folded into another upload.")
+
+
+def _load_facet_index(storage: TursoStorage) -> FacetIndex:
+    index = FacetIndex.load(config.facet_index_file)
+    if index is None or len(index) != storage.get_catalog_count():
+        index = FacetIndex.build(storage.get_catalog_entries())
+        index.save(config.facet_index_file)
+    return index
+
+
+@app.command()
+def browse(
+    genre: list[str] | None = typer.Option(
+        None, help="Genre to include (repeat to allow several)"
+    ),
+    country: list[str] | None = typer.Option(
+        None, help="Country to include (repeat to allow several)"
+    ),
+    decade: list[str] | None = typer.Option(
+        None, help="Decade to include, e.g. 1990s (repeat to allow several)"
+    ),
+    content_type: list[str] | None = typer.Option(
+        None, "--type", help="Type to include: movie, serial, tvshow"
+    ),
+    min_imdb: float | None = typer.Option(None, help="Minimum IMDb rating"),
+    limit: int = typer.Option(20, min=1, help="How many titles to list"),
+) -> None:
+    """Browse the catalog by genre, country, decade and type.
+
+    Example: movie-buddy browse --genre Comedy --genre Drama --decade 1990s
+    Example: movie-buddy browse --country France --type movie --min-imdb 7
+    """
+    facets = _facet_filters(
+        content_type=content_type, genre=genre, country=country, decade=decade
+    )
+    try:
+        _browse_impl(facets, min_imdb, limit)
+    except KinoPubError as e:
+        console.print(Panel(f"[red]An error occurred:[/red] {e}", title="Error"))
+        raise typer.Exit(code=1) from None
+
+
+_FACET_LABELS = {
+    "types": "Type",
+    "genres": "Genres",
+    "countries": "Countries",
+    "decades": "Decades",
+}
+_FACET_TOP_VALUES = 8
+
+
+def _print_facet_counts(index: FacetIndex, bitmap: NDArray[np.uint8]) -> None:
+    for facet, label in _FACET_LABELS.items():
+        counts = index.facet_counts(facet, bitmap)
+        top = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        shown = ", ".join(
+            f"{TYPE_LABELS.get(v, v) if facet == 'types' else v} ({n})"
+            for v, n in top[:_FACET_TOP_VALUES]
+        )
+        console.print(f"  {label}: {shown}")
+
+
+def _browse_impl(
+    facets: dict[str, list[str]], min_imdb: float | None, limit: int
+) -> None:
+    storage = _storage()
+    index = _load_facet_index(storage)
+    if not len(index):
+        console.print("[red]Catalog is empty. Run `movie-buddy catalog` first.[/red]")
+        raise typer.Exit(code=1)
+
+    bitmap = index.select(facets)
+    if min_imdb is not None:
+        bitmap &= index.imdb_at_least(min_imdb)
+    matched = index.count(bitmap)
+    if not matched:
+        console.print("[yellow]No catalog titles match these filters.[/yellow]")
+        return
+
+    console.print(f"[bold]{matched}[/bold] of {len(index)} catalog titles match.")
+    _print_facet_counts(index, bitmap)
+
+    top_ids = index.top_by_imdb(bitmap, limit)
+    by_id = {e.id: e for e in storage.get_catalog_entries_by_ids(top_ids)}
+    table = Table(title="Top rated matches")
+    table.add_column("Title")
+    table.add_column("Year")
+    table.add_column("Type")
+    table.add_column("Genres")
+    table.add_column("IMDb")
+    for item_id in top_ids:
+        entry = by_id.get(item_id)
+        if entry is None:
+            continue
+        table.add_row(
+            entry.title,
+            str(entry.year),
+            TYPE_LABELS.get(entry.content_type, entry.content_type),
+            ", ".join(entry.genres),
+            "" if entry.imdb_rating is None else f"{entry.imdb_rating:.1f}",
+        )
+    console.print(table)
@@ -39,6 +39,41 @@ class Config:
         default_factory=lambda: Path.home() / ".config" / "movie_buddy"
     )
     supported_types: tuple[str, ...] = ("movie", "serial", "tvshow")
+    http2: bool = field(
+        default_factory=lambda: (
+            os.environ.get("KINOPUB_HTTP2", "").lower() in {"1", "true", "yes"}
+        ),
+    )
+    http_max_connections: int = field(
+        default_factory=lambda: int(
+            os.environ.get("KINOPUB_HTTP_MAX_CONNECTIONS", "20")
+        ),
+    )
+    http_max_keepalive: int = field(
+        default_factory=lambda: int(os.environ.get("KINOPUB_HTTP_MAX_KEEPALIVE", "10")),
+    )
+    http_keepalive_expiry: float = field(
+        default_factory=lambda: float(
+            os.environ.get("KINOPUB_HTTP_KEEPALIVE_EXPIRY", "60")
+        ),
+    )
+    connect_timeout: float = field(
+        default_factory=lambda: float(os.environ.get("KINOPUB_CONNECT_TIMEOUT", "5")),
+    )
+    auth_timeout: float = field(
+        default_factory=lambda: float(os.environ.get("KINOPUB_AUTH_TIMEOUT", "15")),
+    )
+    api_timeout: float = field(
+        default_factory=lambda: float(os.environ.get("KINOPUB_API_TIMEOUT", "10")),
+    )
+    catalog_timeout: float = field(
+        default_factory=lambda: float(os.environ.get("KINOPUB_CATALOG_TIMEOUT", "30")),
+    )
+    token_refresh_window: float = field(
+        default_factory=lambda: float(
+            os.environ.get("KINOPUB_TOKEN_REFRESH_WINDOW", "600")
+        ),
+    )
     turso_database_url: str | None = field(
         default_factory=lambda: os.environ.get("TURSO_DATABASE_URL"),
     )
@@ -48,10 +83,68 @@ class Config:
     openai_api_key: str | None = field(
         default_factory=lambda: os.environ.get("OPENAI_API_KEY"),
     )
+    openai_base_url: str | None = field(
+        default_factory=lambda: os.environ.get("OPENAI_BASE_URL") or None,
+    )
+    openai_model: str = field(
+        default_factory=lambda: os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
+    )
+    prompt_token_budget: int = field(
+        default_factory=lambda: int(os.environ.get("PROMPT_TOKEN_BUDGET", "3000")),
+    )
+    embedding_model: str = field(
+        default_factory=lambda: os.environ.get(
+            "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
+        ),
+    )
 
     @property
     def token_file(self) -> Path:
         return self.config_dir / "token.bin"
 
+    @property
+    def embeddings_file(self) -> Path:
+        return self.config_dir / "embeddings.npy"
+
+    @property
+    def embedding_ids_file(self) -> Path:
+        return self.config_dir / "embedding_ids.npy"
+
+    @property
+    def embedding_cache_file(self) -> Path:
+        return self.config_dir / "embedding_cache.db"
+
+    @property
+    def ann_index_dir(self) -> Path:
+        return self.config_dir / "ann_index"
+
+    @property
+    def taste_profile_file(self) -> Path:
+        return self.config_dir / "taste_profile.npz"
+
+    @property
+    def facet_index_file(self) -> Path:
+        return self.config_dir / "facet_index.npz"
+
+    @property
+    def minhash_file(self) -> Path:
+        return self.config_dir / "catalog_minhash.npz"
+
+    @property
+    def episode_cache_file(self) -> Path:
+        return self.config_dir / "episode_cache.db"
+
+    @property
+    def watch_history_file(self) -> Path:
+        return self.config_dir / "watch_history.log"
+
+    @property
+    def recommendation_cache_file(self) -> Path:
+        return self.config_dir / "recommendation_cache.db"
+
+    @property
+    def daemon_socket(self) -> Path:
+        return self.config_dir / "daemon.sock"
+
 
 config = Config()
@@ -0,0 +1,265 @@
+"""Optional resident process that keeps clients warm for the CLI.
+
+``movie-buddy daemon`` holds one authenticated ``KinoPubClient`` (with its
+open HTTPS connection) and one ``TursoStorage`` connection, and answers
+method calls on them over a Unix socket in the config directory. kino.pub
+reads are cached for a few minutes, so a repeat ``watch`` makes at most the
+calls the first one did not. Commands fall back to in-process clients when
+no daemon answers.
+
+Calls and results are pickled; the socket is created mode 0600 in the
+user's config directory, so only that user can connect.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from movie_buddy.config import config as default_config
+from movie_buddy.lazy import LazyImport
+from movie_buddy.models import AuthError, KinoPubError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from movie_buddy.api import KinoPubClient
+    from movie_buddy.auth import KinoPubAuth
+    from movie_buddy.config import Config
+    from movie_buddy.storage import TursoStorage
+else:
+    # The CLI imports this module to look for a daemon; keep that cheap
+    KinoPubClient = LazyImport("movie_buddy.api", "KinoPubClient")
+    KinoPubAuth = LazyImport("movie_buddy.auth", "KinoPubAuth")
+    TursoStorage = LazyImport("movie_buddy.storage", "TursoStorage")
+
+_CACHE_TTL_SECONDS = 300
+_CACHE_MAX_ENTRIES = 256
+_CONNECT_TIMEOUT_SECONDS = 0.5
+_HOUSEKEEPING_SECONDS = 60
+
+# (target, method, args, kwargs) in; ("ok", value) or ("error", exc) out
+Call = tuple[str, str, tuple[Any, ...], dict[str, Any]]
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves one call per connection, each on its own thread, on warm targets.
+
+    Targets are built on first use, so the daemon starts without being
+    authenticated and a later ``movie-buddy auth`` is picked up. Results of
+    ``cached`` targets are kept for ``ttl`` seconds per distinct call, up to
+    ``max_entries`` calls with the least recently used dropped first. Idle
+    time is used to renew the kino.pub token before it expires.
+
+    Calls into one target are serialised by that target's lock, since the
+    clients are not thread-safe; cache hits and calls into other targets
+    are not held up by a slow call.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        factories: dict[str, Callable[[], Any]],
+        *,
+        cached: frozenset[str] = frozenset(),
+        ttl: float = _CACHE_TTL_SECONDS,
+        max_entries: int = _CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._factories = factories
+        self._targets: dict[str, Any] = {}
+        self._target_locks = {name: threading.RLock() for name in factories}
+        self._lock = threading.Lock()
+        self._cached = cached
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._results: OrderedDict[tuple[Any, ...], tuple[float, Any]] = OrderedDict()
+        self._next_housekeeping = 0.0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _CallHandler)
+        finally:
+            os.umask(old_umask)
+        self.path = path
+
+    def target(self, name: str) -> Any:
+        with self._target_locks[name]:
+            if name not in self._targets:
+                self._targets[name] = self._factories[name]()
+            return self._targets[name]
+
+    def _invoke(self, name: str, method: str, args: Any, kwargs: Any) -> Any:
+        with self._target_locks[name]:
+            try:
+                return getattr(self.target(name), method)(*args, **kwargs)
+            except AuthError:
+                # The warm client's token may have expired; rebuild it once
+                self._targets.pop(name, None)
+                return getattr(self.target(name), method)(*args, **kwargs)
+
+    def dispatch(self, call: Call) -> Any:
+        name, method, args, kwargs = call
+        if name == "daemon" and method == "ping":
+            return True
+        if method.startswith("_"):
+            msg = f"Daemon does not serve private method {method!r}."
+            raise KinoPubError(msg)
+        if name not in self._cached:
+            return self._invoke(name, method, args, kwargs)
+        key = (name, method, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            now = self._clock()
+            hit = self._results.get(key)
+            if hit is not None and hit[0] > now:
+                self._results.move_to_end(key)
+                return hit[1]
+        result = self._invoke(name, method, args, kwargs)
+        with self._lock:
+            self._evict_expired(now)
+            self._results[key] = (now + self._ttl, result)
+            while len(self._results) > self._max_entries:
+                self._results.popitem(last=False)
+        return result
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [k for k, (expires, _) in self._results.items() if expires <= now]
+        for key in expired:
+            del self._results[key]
+
+    def service_actions(self) -> None:
+        """Between calls, let warm targets renew credentials before expiry."""
+        now = self._clock()
+        if now < self._next_housekeeping:
+            return
+        self._next_housekeeping = now + _HOUSEKEEPING_SECONDS
+        with self._lock:
+            self._evict_expired(now)
+        for name, target in list(self._targets.items()):
+            refresh = getattr(target, "refresh_if_due", None)
+            lock = self._target_locks[name]
+            # A busy target is renewed on the next round instead of
+            # stalling the accept loop behind its call
+            if refresh is None or not lock.acquire(blocking=False):
+                continue
+            try:
+                refresh()
+            finally:
+                lock.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+        for target in self._targets.values():
+            close = getattr(target, "close", None)
+            if close is not None:
+                close()
+
+
+class _CallHandler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        try:
+            call: Call = pickle.load(self.rfile)  # noqa: S301
+        except (EOFError, pickle.UnpicklingError):
+            return
+        try:
+            reply: tuple[str, Any] = ("ok", self.server.dispatch(call))
+        except KinoPubError as e:
+            reply = ("error", e)
+        except Exception as e:
+            # Library errors may hold unpicklable state; send their message
+            reply = ("error", KinoPubError(f"{type(e).__name__}: {e}"))
+        try:
+            payload = pickle.dumps(reply, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            payload = pickle.dumps(("error", KinoPubError(f"Unsendable result: {e}")))
+        self.wfile.write(payload)
+
+
+def _call(path: Path, call: Call, timeout: float | None = None) -> Any:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(pickle.dumps(call, protocol=pickle.HIGHEST_PROTOCOL))
+        with sock.makefile("rb") as reader:
+            status, value = pickle.load(reader)  # noqa: S301
+    if status == "error":
+        raise value
+    return value
+
+
+class RemoteTarget:
+    """Forwards method calls to one of the daemon's warm targets."""
+
+    def __init__(self, path: Path, name: str) -> None:
+        self._path = path
+        self._name = name
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def remote(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return _call(self._path, (self._name, method, args, kwargs))
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                msg = f"Lost connection to movie-buddy daemon: {e}"
+                raise KinoPubError(msg) from e
+
+        return remote
+
+
+def find_daemon(cfg: Config | None = None) -> Path | None:
+    """The daemon's socket path if a daemon answers on it, else None."""
+    path = (cfg or default_config).daemon_socket
+    if not path.exists():
+        return None
+    try:
+        _call(path, ("daemon", "ping", (), {}), timeout=_CONNECT_TIMEOUT_SECONDS)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    return path
+
+
+def _kinopub_client(cfg: Config) -> KinoPubClient:
+    auth = KinoPubAuth(cfg=cfg)
+    return KinoPubClient(auth.ensure_valid_token(background=False), cfg, auth=auth)
+
+
+def _storage(cfg: Config) -> TursoStorage:
+    storage = TursoStorage(cfg)
+    storage.init_schema()
+    return storage
+
+
+def build_server(cfg: Config | None = None) -> DaemonServer:
+    c = cfg or default_config
+    return DaemonServer(
+        c.daemon_socket,
+        {"kinopub": lambda: _kinopub_client(c), "storage": lambda: _storage(c)},
+        cached=frozenset({"kinopub"}),
+    )
+
+
+def serve(cfg: Config | None = None) -> None:
+    """Run the daemon in the foreground until interrupted."""
+    server = build_server(cfg)
+    try:
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    finally:
+        server.server_close()
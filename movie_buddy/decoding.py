@@ -0,0 +1,317 @@
+"""Decode kino.pub response bodies straight into models.
+
+With the optional ``fast`` extra the bytes go through msgspec structs that
+only declare the fields we read, so everything else is skipped without
+being materialised. Otherwise the stdlib ``json`` module is used.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Protocol
+
+from movie_buddy.models import (
+    BookmarkFolder,
+    CatalogEntry,
+    Content,
+    Episode,
+    KinoPubError,
+    Season,
+    WatchingItem,
+)
+
+try:
+    import msgspec
+except ImportError:  # optional extra: pip install 'movie-buddy[fast]'
+    msgspec = None  # type: ignore[assignment]
+
+
+def _unexpected(error: Exception) -> KinoPubError:
+    return KinoPubError(f"Unexpected response from kino.pub: {error}")
+
+
+class Decoder(Protocol):
+    def search(self, data: bytes) -> list[Content]: ...
+
+    def item(self, data: bytes) -> Content: ...
+
+    def watching(self, data: bytes) -> list[WatchingItem]: ...
+
+    def bookmark_folders(self, data: bytes) -> list[BookmarkFolder]: ...
+
+    def bookmark_ids(self, data: bytes) -> list[int]: ...
+
+    def catalog_items(self, data: bytes, created_at: str) -> list[CatalogEntry]: ...
+
+
+class StdlibDecoder:
+    """``json.loads`` into dicts, then into models."""
+
+    def _items(self, data: bytes) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = json.loads(data).get("items") or []
+        return items
+
+    def search(self, data: bytes) -> list[Content]:
+        try:
+            return [
+                Content(
+                    id=item["id"],
+                    title=item["title"],
+                    content_type=item["type"],
+                    year=item.get("year") or 0,
+                    seasons=[],
+                )
+                for item in self._items(data)
+            ]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise _unexpected(e) from e
+
+    def item(self, data: bytes) -> Content:
+        try:
+            item = json.loads(data)["item"]
+            seasons = [
+                Season(
+                    number=s["number"],
+                    episodes=[
+                        Episode(
+                            id=ep["id"],
+                            number=ep["number"],
+                            title=ep.get("title") or "",
+                            season_number=s["number"],
+                        )
+                        for ep in s.get("episodes") or []
+                    ],
+                )
+                for s in item.get("seasons") or []
+            ]
+            return Content(
+                id=item["id"],
+                title=item["title"],
+                content_type=item["type"],
+                year=item.get("year") or 0,
+                seasons=seasons,
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise _unexpected(e) from e
+
+    def watching(self, data: bytes) -> list[WatchingItem]:
+        try:
+            return [
+                WatchingItem(
+                    id=item["id"],
+                    title=item["title"],
+                    content_type=item["type"],
+                    total=item.get("total") or 0,
+                    watched=item.get("watched") or 0,
+                )
+                for item in self._items(data)
+            ]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise _unexpected(e) from e
+
+    def bookmark_folders(self, data: bytes) -> list[BookmarkFolder]:
+        try:
+            return [
+                BookmarkFolder(id=item["id"], title=item["title"])
+                for item in self._items(data)
+            ]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise _unexpected(e) from e
+
+    def bookmark_ids(self, data: bytes) -> list[int]:
+        try:
+            return [item["id"] for item in self._items(data)]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise _unexpected(e) from e
+
+    def catalog_items(self, data: bytes, created_at: str) -> list[CatalogEntry]:
+        try:
+            return [
+                CatalogEntry(
+                    id=item["id"],
+                    title=item["title"],
+                    year=item.get("year") or 0,
+                    content_type=item["type"],
+                    genres=[g["title"] for g in item.get("genres") or []],
+                    countries=[c["title"] for c in item.get("countries") or []],
+                    imdb_rating=item.get("imdb_rating"),
+                    kinopoisk_rating=item.get("kinopoisk_rating"),
+                    plot=item.get("plot") or "",
+                    created_at=created_at,
+                )
+                for item in self._items(data)
+            ]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise _unexpected(e) from e
+
+
+if msgspec is not None:
+    # gc=False: these never form cycles, so the collector can ignore them
+
+    class _Named(msgspec.Struct, gc=False):
+        title: str
+
+    class _Id(msgspec.Struct, gc=False):
+        id: int
+
+    class _Listed(msgspec.Struct, gc=False, rename={"content_type": "type"}):
+        id: int
+        title: str
+        content_type: str
+        year: int | None = None
+
+    class _Watching(_Listed, gc=False):
+        total: int | None = None
+        watched: int | None = None
+
+    class _Catalog(_Listed, gc=False):
+        genres: list[_Named] | None = None
+        countries: list[_Named] | None = None
+        imdb_rating: float | None = None
+        kinopoisk_rating: float | None = None
+        plot: str | None = None
+
+    class _Episode(msgspec.Struct, gc=False):
+        id: int
+        number: int
+        title: str | None = None
+
+    class _Season(msgspec.Struct, gc=False):
+        number: int
+        episodes: list[_Episode] | None = None
+
+    class _Item(_Listed, gc=False):
+        seasons: list[_Season] | None = None
+
+    class _ItemResponse(msgspec.Struct, gc=False):
+        item: _Item
+
+    class _ListedPage(msgspec.Struct, gc=False):
+        items: list[_Listed] | None = None
+
+    class _WatchingPage(msgspec.Struct, gc=False):
+        items: list[_Watching] | None = None
+
+    class _Folder(msgspec.Struct, gc=False):
+        id: int
+        title: str
+
+    class _IdPage(msgspec.Struct, gc=False):
+        items: list[_Id] | None = None
+
+    class _FolderPage(msgspec.Struct, gc=False):
+        items: list[_Folder] | None = None
+
+    class _CatalogPage(msgspec.Struct, gc=False):
+        items: list[_Catalog] | None = None
+
+
+class MsgspecDecoder:
+    """Typed msgspec decoding; unknown fields are skipped while parsing."""
+
+    def __init__(self) -> None:
+        self._listed = msgspec.json.Decoder(_ListedPage)
+        self._item = msgspec.json.Decoder(_ItemResponse)
+        self._watching = msgspec.json.Decoder(_WatchingPage)
+        self._folders = msgspec.json.Decoder(_FolderPage)
+        self._ids = msgspec.json.Decoder(_IdPage)
+        self._catalog = msgspec.json.Decoder(_CatalogPage)
+
+    def search(self, data: bytes) -> list[Content]:
+        try:
+            page = self._listed.decode(data)
+        except msgspec.DecodeError as e:
+            raise _unexpected(e) from e
+        return [
+            Content(
+                id=item.id,
+                title=item.title,
+                content_type=item.content_type,
+                year=item.year or 0,
+                seasons=[],
+            )
+            for item in page.items or []
+        ]
+
+    def item(self, data: bytes) -> Content:
+        try:
+            item = self._item.decode(data).item
+        except msgspec.DecodeError as e:
+            raise _unexpected(e) from e
+        seasons = [
+            Season(
+                number=s.number,
+                episodes=[
+                    Episode(
+                        id=ep.id,
+                        number=ep.number,
+                        title=ep.title or "",
+                        season_number=s.number,
+                    )
+                    for ep in s.episodes or []
+                ],
+            )
+            for s in item.seasons or []
+        ]
+        return Content(
+            id=item.id,
+            title=item.title,
+            content_type=item.content_type,
+            year=item.year or 0,
+            seasons=seasons,
+        )
+
+    def watching(self, data: bytes) -> list[WatchingItem]:
+        try:
+            page = self._watching.decode(data)
+        except msgspec.DecodeError as e:
+            raise _unexpected(e) from e
+        return [
+            WatchingItem(
+                id=item.id,
+                title=item.title,
+                content_type=item.content_type,
+                total=item.total or 0,
+                watched=item.watched or 0,
+            )
+            for item in page.items or []
+        ]
+
+    def bookmark_folders(self, data: bytes) -> list[BookmarkFolder]:
+        try:
+            page = self._folders.decode(data)
+        except msgspec.DecodeError as e:
+            raise _unexpected(e) from e
+        return [BookmarkFolder(id=f.id, title=f.title) for f in page.items or []]
+
+    def bookmark_ids(self, data: bytes) -> list[int]:
+        try:
+            page = self._ids.decode(data)
+        except msgspec.DecodeError as e:
+            raise _unexpected(e) from e
+        return [item.id for item in page.items or []]
+
+    def catalog_items(self, data: bytes, created_at: str) -> list[CatalogEntry]:
+        try:
+            page = self._catalog.decode(data)
+        except msgspec.DecodeError as e:
+            raise _unexpected(e) from e
+        return [
+            CatalogEntry(
+                id=item.id,
+                title=item.title,
+                year=item.year or 0,
+                content_type=item.content_type,
+                genres=[g.title for g in item.genres or []],
+                countries=[c.title for c in item.countries or []],
+                imdb_rating=item.imdb_rating,
+                kinopoisk_rating=item.kinopoisk_rating,
+                plot=item.plot or "",
+                created_at=created_at,
+            )
+            for item in page.items or []
+        ]
+
+
+def default_decoder() -> Decoder:
+    return MsgspecDecoder() if msgspec is not None else StdlibDecoder()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import re
+import zlib
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Sequence
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from movie_buddy.models import CatalogEntry
+
+SIGNATURE_SIZE = 128
+SIMILARITY_THRESHOLD = 0.7
+
+# 16 bands of 8 rows put the LSH S-curve midpoint near (1/16)^(1/8) ≈ 0.71
+_BANDS = 16
+_ROWS_PER_BAND = SIGNATURE_SIZE // _BANDS
+_PLOT_SHINGLE_WORDS = 3
+_SEED = 20240601
+
+# Release tags that mark another upload of the same work, not a different one
+_RELEASE_TAG_RE = re.compile(
+    r"\b(?:4k|uhd|hdr10?|\d{3,4}p|remaster(?:ed)?|extended|director'?s cut"
+    r"|(?:season|сезон)\s*\d+|\d+\s*(?:season|сезон))\b"
+)
+_BRACKETS_RE = re.compile(r"[(\[{].*?[)\]}]")
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_title(title: str) -> str:
+    title = _BRACKETS_RE.sub(" ", title.casefold())
+    title = _RELEASE_TAG_RE.sub(" ", title)
+    return " ".join(_WORD_RE.findall(title))
+
+
+def shingles(entry: CatalogEntry) -> set[str]:
+    """Title words, year and plot word 3-grams, prefixed so sources never mix."""
+    tokens = {f"t:{word}" for word in normalize_title(entry.title).split()}
+    if entry.year:
+        tokens.add(f"y:{entry.year}")
+    words = _WORD_RE.findall(entry.plot.casefold())
+    tokens.update(
+        "p:" + " ".join(words[i : i + _PLOT_SHINGLE_WORDS])
+        for i in range(len(words) - _PLOT_SHINGLE_WORDS + 1)
+    )
+    return tokens
+
+
+def _hash_params() -> tuple[NDArray[np.uint64], NDArray[np.uint64]]:
+    rng = np.random.default_rng(_SEED)
+    high = np.iinfo(np.uint64).max
+    a: NDArray[np.uint64] = rng.integers(
+        1, high, SIGNATURE_SIZE, dtype=np.uint64, endpoint=True
+    ) | np.uint64(1)
+    b: NDArray[np.uint64] = rng.integers(
+        0, high, SIGNATURE_SIZE, dtype=np.uint64, endpoint=True
+    )
+    return a, b
+
+
+_A, _B = _hash_params()
+_BAND_WEIGHTS = np.random.default_rng(_SEED + 1).integers(
+    1, np.iinfo(np.uint64).max, _ROWS_PER_BAND, dtype=np.uint64
+)
+
+
+def signature(tokens: Iterable[str]) -> NDArray[np.uint32]:
+    """MinHash over 32-bit token hashes using multiply-shift permutations."""
+    hashed = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64)
+    if not len(hashed):
+        return np.full(SIGNATURE_SIZE, np.iinfo(np.uint32).max, dtype=np.uint32)
+    with np.errstate(over="ignore"):
+        permuted = (_A[:, None] * hashed[None, :] + _B[:, None]) >> np.uint64(32)
+    sig: NDArray[np.uint32] = permuted.min(axis=1).astype(np.uint32)
+    return sig
+
+
+class MinHashIndex:
+    """MinHash signatures of catalog rows, banded for LSH candidate lookup."""
+
+    def __init__(self, ids: NDArray[np.int64], signatures: NDArray[np.uint32]) -> None:
+        self.ids = ids
+        self.signatures = signatures
+        self._row = {item_id: i for i, item_id in enumerate(ids.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, entries: Sequence[CatalogEntry]) -> MinHashIndex:
+        ids = np.fromiter((e.id for e in entries), dtype=np.int64, count=len(entries))
+        signatures = np.zeros((len(entries), SIGNATURE_SIZE), dtype=np.uint32)
+        for row, entry in enumerate(entries):
+            signatures[row] = signature(shingles(entry))
+        return cls(ids, signatures)
+
+    def add(self, entries: Sequence[CatalogEntry]) -> MinHashIndex:
+        """Return an index that also covers ``entries``; existing IDs are kept."""
+        fresh = [e for e in entries if e.id not in self._row]
+        if not fresh:
+            return self
+        extra = MinHashIndex.build(fresh)
+        return MinHashIndex(
+            np.concatenate([self.ids, extra.ids]),
+            np.concatenate([self.signatures, extra.signatures]),
+        )
+
+    def similarity(self, a: int, b: int) -> float:
+        """Estimated Jaccard similarity of two rows' shingle sets."""
+        sa, sb = self.signatures[self._row[a]], self.signatures[self._row[b]]
+        return float(np.mean(sa == sb))
+
+    def candidate_pairs(
+        self, query_ids: Collection[int] | None = None
+    ) -> set[tuple[int, int]]:
+        """ID pairs sharing at least one band; with ``query_ids`` only pairs
+        that involve one of them. Each band is a sort, so this is O(n log n).
+        """
+        query = np.ones(len(self), dtype=bool)
+        if query_ids is not None:
+            query[:] = False
+            query[[self._row[i] for i in query_ids if i in self._row]] = True
+        pairs: set[tuple[int, int]] = set()
+        for band in range(_BANDS):
+            first = band * _ROWS_PER_BAND
+            rows = self.signatures[:, first : first + _ROWS_PER_BAND]
+            with np.errstate(over="ignore"):
+                keys = (rows.astype(np.uint64) * _BAND_WEIGHTS).sum(axis=1)
+            order = np.argsort(keys, kind="stable")
+            bounds = np.flatnonzero(np.diff(keys[order])) + 1
+            starts = np.concatenate([[0], bounds])
+            ends = np.concatenate([bounds, [len(order)]])
+            for start, end in zip(starts.tolist(), ends.tolist(), strict=True):
+                if end - start < 2:
+                    continue
+                bucket = order[start:end]
+                if not query[bucket].any():
+                    continue
+                ids = self.ids[bucket].tolist()
+                asked = query[bucket].tolist()
+                for i, a in enumerate(ids):
+                    for j in range(i + 1, len(ids)):
+                        if asked[i] or asked[j]:
+                            b = ids[j]
+                            pairs.add((a, b) if a < b else (b, a))
+        return pairs
+
+    def duplicate_pairs(
+        self,
+        query_ids: Collection[int] | None = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> list[tuple[int, int]]:
+        return sorted(
+            pair
+            for pair in self.candidate_pairs(query_ids)
+            if self.similarity(*pair) >= threshold
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, ids=self.ids, signatures=self.signatures)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> MinHashIndex | None:
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            if data["signatures"].shape[1:] != (SIGNATURE_SIZE,):
+                return None
+            return cls(data["ids"], data["signatures"])
+
+
+def cluster_duplicates(
+    pairs: Iterable[tuple[int, int]], existing: dict[int, int] | None = None
+) -> dict[int, int]:
+    """Map every member of a duplicate cluster to its canonical (lowest) ID.
+
+    ``existing`` is the stored member → canonical mapping for clusters the
+    pairs touch, so new rows join and merge clusters instead of replacing them.
+    """
+    parent: dict[int, int] = {}
+
+    def find(item: int) -> int:
+        root = parent.setdefault(item, item)
+        while root != parent[root]:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    for member, canonical in (existing or {}).items():
+        union(member, canonical)
+    for a, b in pairs:
+        union(a, b)
+    return {item: find(item) for item in parent}
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+import openai
+
+from movie_buddy.config import config as default_config
+from movie_buddy.models import LLMError
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from movie_buddy.config import Config
+    from movie_buddy.models import CatalogEntry
+
+_EMBED_BATCH_SIZE = 128
+_EMBED_CONCURRENCY = 4
+_SQLITE_CHUNK = 500
+
+_SCHEMA_EMBEDDING_CACHE = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, text_hash)
+)
+"""
+
+
+def normalize_rows(vectors: ArrayLike) -> NDArray[np.float32]:
+    """Unit-length copy of ``vectors``; all-zero rows stay zero."""
+    arr = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    out = np.zeros(arr.shape, dtype=np.float32)
+    np.divide(arr, norms, out=out, where=norms > 0)
+    return out
+
+
+def save_npy(path: Path, array: NDArray[np.generic]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        np.save(f, array)
+    tmp.replace(path)
+
+
+class EmbeddingMatrix:
+    """Unit-length float32 plot embeddings, one row per catalog ID."""
+
+    def __init__(self, ids: NDArray[np.int64], vectors: NDArray[np.float32]) -> None:
+        if vectors.ndim != 2 or len(ids) != vectors.shape[0]:
+            msg = f"ids ({len(ids)}) do not match vectors {vectors.shape}"
+            raise ValueError(msg)
+        self.ids = ids
+        self.vectors = vectors
+
+    @classmethod
+    def from_vectors(cls, ids: Sequence[int], vectors: ArrayLike) -> EmbeddingMatrix:
+        return cls(np.asarray(ids, dtype=np.int64), normalize_rows(vectors))
+
+    @classmethod
+    def load(cls, cfg: Config | None = None) -> EmbeddingMatrix | None:
+        c = cfg or default_config
+        if not c.embeddings_file.exists() or not c.embedding_ids_file.exists():
+            return None
+        vectors = np.load(c.embeddings_file, mmap_mode="r")
+        ids = np.load(c.embedding_ids_file)
+        return cls(ids, vectors)
+
+    def save(self, cfg: Config | None = None) -> None:
+        c = cfg or default_config
+        save_npy(c.embeddings_file, np.ascontiguousarray(self.vectors))
+        save_npy(c.embedding_ids_file, self.ids)
+
+    def rows_for(self, ids: ArrayLike) -> tuple[NDArray[np.intp], NDArray[np.bool_]]:
+        """Map ``ids`` to row positions; the mask marks IDs present in the matrix."""
+        wanted = np.asarray(ids, dtype=np.int64)
+        if len(self.ids) == 0:
+            return np.empty(0, dtype=np.intp), np.zeros(len(wanted), dtype=bool)
+        sorter = np.argsort(self.ids, kind="stable")
+        pos = np.searchsorted(self.ids, wanted, sorter=sorter)
+        rows = sorter[pos.clip(max=len(self.ids) - 1)]
+        found = self.ids[rows] == wanted
+        return rows[found], found
+
+    def upsert(self, ids: Sequence[int], vectors: ArrayLike) -> EmbeddingMatrix:
+        new_ids = np.asarray(ids, dtype=np.int64)
+        keep = ~np.isin(self.ids, new_ids)
+        return EmbeddingMatrix(
+            np.concatenate([self.ids[keep], new_ids]),
+            np.concatenate([self.vectors[keep], normalize_rows(vectors)]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    def scores(self, query: ArrayLike) -> NDArray[np.float32]:
+        q = normalize_rows(query)
+        if q.shape[-1] != self.dim:
+            msg = f"query has dimension {q.shape[-1]}, expected {self.dim}"
+            raise ValueError(msg)
+        return self.vectors @ q
+
+    def top_k(self, query: ArrayLike, k: int = 10) -> list[tuple[int, float]]:
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        if k < len(scores):
+            idx = np.argpartition(-scores, k - 1)[:k]
+        else:
+            idx = np.arange(len(scores))
+        idx = idx[np.argsort(-scores[idx], kind="stable")]
+        return list(zip(self.ids[idx].tolist(), scores[idx].tolist(), strict=True))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def embedding_text(entry: CatalogEntry) -> str:
+    return entry.plot or entry.title
+
+
+class EmbeddingCache:
+    """Local store of embeddings keyed by (model, sha256 of the embedded text)."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or default_config.embedding_cache_file
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path)
+        self._conn.execute(_SCHEMA_EMBEDDING_CACHE)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_many(
+        self, model: str, hashes: Sequence[str]
+    ) -> dict[str, NDArray[np.float32]]:
+        found: dict[str, NDArray[np.float32]] = {}
+        for start in range(0, len(hashes), _SQLITE_CHUNK):
+            chunk = hashes[start : start + _SQLITE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                "SELECT text_hash, vector FROM embeddings "  # noqa: S608
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *chunk],
+            )
+            for digest, blob in rows:
+                found[digest] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: dict[str, NDArray[np.float32]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) "
+            "VALUES (?, ?, ?)",
+            [
+                (model, digest, np.asarray(vec, dtype=np.float32).tobytes())
+                for digest, vec in vectors.items()
+            ],
+        )
+        self._conn.commit()
+
+
+class OpenAIEmbedder:
+    def __init__(
+        self,
+        cfg: Config | None = None,
+        *,
+        client: openai.OpenAI | None = None,
+        batch_size: int = _EMBED_BATCH_SIZE,
+        max_concurrency: int = _EMBED_CONCURRENCY,
+    ) -> None:
+        c = cfg or default_config
+        if client is None:
+            if not c.openai_api_key:
+                msg = "OPENAI_API_KEY not set. See quickstart guide for setup."
+                raise LLMError(msg)
+            client = openai.OpenAI(api_key=c.openai_api_key, base_url=c.openai_base_url)
+        self._client = client
+        self.model = c.embedding_model
+        self._batch_size = batch_size
+        self._max_concurrency = max_concurrency
+
+    def embed(self, texts: Sequence[str]) -> NDArray[np.float32]:
+        batches = [
+            list(texts[i : i + self._batch_size])
+            for i in range(0, len(texts), self._batch_size)
+        ]
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        workers = min(self._max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._embed_batch, batches))
+        return np.concatenate(results)
+
+    def _embed_batch(self, batch: list[str]) -> NDArray[np.float32]:
+        try:
+            response = self._client.embeddings.create(model=self.model, input=batch)
+        except openai.OpenAIError as e:
+            msg = f"Embedding request failed: {e}"
+            raise LLMError(msg) from e
+        data = sorted(response.data, key=lambda d: d.index)
+        return np.asarray([d.embedding for d in data], dtype=np.float32)
+
+
+def embed_cached(
+    texts: Sequence[str], embedder: OpenAIEmbedder, cache: EmbeddingCache
+) -> tuple[NDArray[np.float32], int]:
+    """Embed ``texts``, calling the API only for texts missing from the cache.
+
+    Returns one vector per text and the number of texts sent to the embedder.
+    """
+    hashes = [text_hash(t) for t in texts]
+    unique = list(dict.fromkeys(hashes))
+    vectors = cache.get_many(embedder.model, unique)
+    missing = [h for h in unique if h not in vectors]
+    if missing:
+        by_hash = dict(zip(hashes, texts, strict=True))
+        fresh = embedder.embed([by_hash[h] for h in missing])
+        new_vectors = dict(zip(missing, fresh, strict=True))
+        cache.put_many(embedder.model, new_vectors)
+        vectors.update(new_vectors)
+    return np.stack([vectors[h] for h in hashes]), len(missing)
+
+
+def sync_embeddings(
+    entries: Sequence[CatalogEntry],
+    embedder: OpenAIEmbedder,
+    cache: EmbeddingCache,
+    matrix: EmbeddingMatrix | None = None,
+) -> tuple[EmbeddingMatrix, int]:
+    """Add ``entries`` to ``matrix``, embedding only plots missing from the cache.
+
+    Returns the updated matrix and the number of texts sent to the embedder.
+    """
+    if not entries:
+        msg = "No catalog entries to embed"
+        raise ValueError(msg)
+    vectors, embedded = embed_cached(
+        [embedding_text(e) for e in entries], embedder, cache
+    )
+    ids = [e.id for e in entries]
+    if matrix is None or len(matrix) == 0:
+        return EmbeddingMatrix.from_vectors(ids, vectors), embedded
+    return matrix.upsert(ids, vectors), embedded
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from typing import TYPE_CHECKING
+
+from movie_buddy.config import config as default_config
+from movie_buddy.models import Episode
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+    from pathlib import Path
+
+    from movie_buddy.models import Content
+
+_CACHE_TTL_SECONDS = 24 * 3600
+
+_SCHEMA_EPISODE_CACHE = """
+CREATE TABLE IF NOT EXISTS series (
+    item_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    episodes BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+# Blob layout: magic, episode count, then ids, seasons and numbers as
+# little-endian int32 arrays, then titles joined by the unit separator
+_MAGIC = b"EPS1"
+_HEADER = struct.Struct("<4sI")
+_TITLE_SEP = "\x1f"
+
+
+def _int_array(values: Sequence[int] | bytes = ()) -> array[int]:
+    if isinstance(values, bytes):
+        out = array("i")
+        out.frombytes(values)
+        if sys.byteorder == "big":
+            out.byteswap()
+        return out
+    return array("i", values)
+
+
+def _le_bytes(values: array[int]) -> bytes:
+    if sys.byteorder == "big":
+        values = array("i", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class AliasTable:
+    """Walker's alias method: O(n) to build, O(1) per weighted draw."""
+
+    __slots__ = ("_weights", "alias", "prob")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        n = len(weights)
+        total = sum(weights)
+        if not n or total <= 0:
+            msg = "Alias table needs at least one positive weight."
+            raise ValueError(msg)
+        self._weights = array("d", weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = array("d", [1.0] * n)
+        self.alias = array("i", range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def weight(self, index: int) -> float:
+        return self._weights[index]
+
+    def draw(self, rand: Callable[[], float] = random.random) -> int:
+        u = rand() * len(self.prob)
+        column = min(int(u), len(self.prob) - 1)
+        return column if u - column < self.prob[column] else self.alias[column]
+
+
+class EpisodeStore:
+    """Episodes of one series as parallel int32 arrays, in watch order.
+
+    Titles are kept as one joined string and only split when a title is
+    first read, so loading a cached series allocates no per-episode objects.
+    """
+
+    __slots__ = ("_titles", "_titles_blob", "ids", "numbers", "seasons")
+
+    def __init__(
+        self,
+        ids: array[int],
+        seasons: array[int],
+        numbers: array[int],
+        titles_blob: str = "",
+    ) -> None:
+        if not len(ids) == len(seasons) == len(numbers):
+            msg = "Episode arrays must have equal length."
+            raise ValueError(msg)
+        self.ids = ids
+        self.seasons = seasons
+        self.numbers = numbers
+        self._titles_blob = titles_blob
+        self._titles: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_content(cls, content: Content) -> EpisodeStore:
+        episodes = content.all_episodes
+        return cls(
+            _int_array([ep.id for ep in episodes]),
+            _int_array([ep.season_number for ep in episodes]),
+            _int_array([ep.number for ep in episodes]),
+            _TITLE_SEP.join(ep.title.replace(_TITLE_SEP, " ") for ep in episodes),
+        )
+
+    def title(self, index: int) -> str:
+        if self._titles is None:
+            self._titles = (
+                self._titles_blob.split(_TITLE_SEP) if self._titles_blob else []
+            )
+        return self._titles[index] if index < len(self._titles) else ""
+
+    def episode(self, index: int) -> Episode:
+        return Episode(
+            id=self.ids[index],
+            number=self.numbers[index],
+            title=self.title(index),
+            season_number=self.seasons[index],
+        )
+
+    def weights(
+        self,
+        *,
+        season_weights: Mapping[int, float] | None = None,
+        episode_weights: Mapping[int, float] | None = None,
+    ) -> AliasTable:
+        """Alias table over episodes, e.g. favouring seasons or unwatched IDs.
+
+        Weights multiply; anything not listed has weight 1.
+        """
+        by_season = season_weights or {}
+        by_episode = episode_weights or {}
+        return AliasTable(
+            [
+                by_season.get(season, 1.0) * by_episode.get(item_id, 1.0)
+                for item_id, season in zip(self.ids, self.seasons, strict=True)
+            ]
+        )
+
+    def sample(
+        self,
+        weights: AliasTable | None = None,
+        rand: Callable[[], float] = random.random,
+        *,
+        skip: Collection[int] = (),
+    ) -> int:
+        """Index of a uniformly (or ``weights``-) random episode.
+
+        O(1) per draw. Episode IDs in ``skip`` are left out while any other
+        episode can still be drawn, at the cost of one O(n) pass.
+        """
+        if not len(self):
+            msg = "Cannot sample from an empty episode store."
+            raise ValueError(msg)
+        if skip:
+            rest = [i for i, item_id in enumerate(self.ids) if item_id not in skip]
+            if weights is not None:
+                kept = [weights.weight(i) for i in rest]
+                if sum(kept) > 0:
+                    return rest[AliasTable(kept).draw(rand)]
+            elif rest:
+                return rest[min(int(rand() * len(rest)), len(rest) - 1)]
+        if weights is not None:
+            return weights.draw(rand)
+        return min(int(rand() * len(self)), len(self) - 1)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(
+            [
+                _HEADER.pack(_MAGIC, len(self)),
+                _le_bytes(self.ids),
+                _le_bytes(self.seasons),
+                _le_bytes(self.numbers),
+                self._titles_blob.encode(),
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> EpisodeStore | None:
+        """Inverse of ``to_bytes``; None if the blob is not a store."""
+        if len(data) < _HEADER.size:
+            return None
+        magic, count = _HEADER.unpack_from(data)
+        width = count * array("i").itemsize
+        end = _HEADER.size + 3 * width
+        if magic != _MAGIC or len(data) < end:
+            return None
+        view = memoryview(data)
+        ids, seasons, numbers = (
+            _int_array(bytes(view[start : start + width]))
+            for start in range(_HEADER.size, end, width)
+        )
+        return cls(ids, seasons, numbers, bytes(view[end:]).decode())
+
+
+class EpisodeCache:
+    """Series title and episode store per kino.pub item, for repeat watches."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        ttl: float = _CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path or default_config.episode_cache_file
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path)
+        self._conn.execute(_SCHEMA_EPISODE_CACHE)
+        self._ttl = ttl
+        self._clock = clock
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get(self, item_id: int) -> tuple[str, EpisodeStore] | None:
+        row = self._conn.execute(
+            "SELECT title, episodes FROM series WHERE item_id = ? AND fetched_at > ?",
+            (item_id, self._clock() - self._ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        store = EpisodeStore.from_bytes(row[1])
+        return None if store is None else (row[0], store)
+
+    def put(self, item_id: int, title: str, store: EpisodeStore) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO series (item_id, title, episodes, fetched_at) "
+            "VALUES (?, ?, ?, ?)",
+            (item_id, title, store.to_bytes(), self._clock()),
+        )
+        self._conn.commit()
+
+
+# One fixed-size record per opened episode: item ID, episode ID, season and
+# episode number. An episode ID of -1 starts a new round for the item.
+_HISTORY_RECORD = struct.Struct("<iiHH")
+_ROUND_MARKER = -1
+
+
+class WatchHistory:
+    """Append-only local log of the series episodes ``watch`` has opened."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or default_config.watch_history_file
+
+    def _records(self) -> Iterator[tuple[int, int, int, int]]:
+        try:
+            data = self._path.read_bytes()
+        except FileNotFoundError:
+            return iter(())
+        usable = len(data) - len(data) % _HISTORY_RECORD.size
+        return _HISTORY_RECORD.iter_unpack(data[:usable])
+
+    def opened(self, item_id: int) -> set[int]:
+        """Episode IDs opened for ``item_id`` since its last new round."""
+        opened: set[int] = set()
+        for item, episode_id, _, _ in self._records():
+            if item != item_id:
+                continue
+            if episode_id == _ROUND_MARKER:
+                opened.clear()
+            else:
+                opened.add(episode_id)
+        return opened
+
+    def record(self, item_id: int, episode: Episode) -> None:
+        self._append(item_id, episode.id, episode.season_number, episode.number)
+
+    def new_round(self, item_id: int) -> None:
+        self._append(item_id, _ROUND_MARKER, 0, 0)
+
+    def _append(self, item_id: int, episode_id: int, season: int, number: int) -> None:
+        row = _HISTORY_RECORD.pack(item_id, episode_id, season, number)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("ab") as f:
+            f.write(row)
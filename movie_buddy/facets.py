@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from movie_buddy.taste import facet_values
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from movie_buddy.models import CatalogEntry
+
+FACETS = ("types", "genres", "countries", "decades")
+
+
+def _entry_values(entry: CatalogEntry, facet: str) -> list[str]:
+    if facet == "types":
+        return [entry.content_type]
+    return facet_values(entry, facet)
+
+
+def _one_hot(rows: Sequence[Sequence[str]], vocab: list[str]) -> NDArray[np.bool_]:
+    index = {v: i for i, v in enumerate(vocab)}
+    for values in rows:
+        for v in values:
+            index.setdefault(v, len(index))
+    vocab[:] = list(index)
+    out = np.zeros((len(vocab), len(rows)), dtype=bool)
+    for col, values in enumerate(rows):
+        out[[index[v] for v in values], col] = True
+    return out
+
+
+class FacetIndex:
+    """Packed bitmaps per facet value over catalog rows, sorted by ID.
+
+    Values within one facet are OR-ed and facets are AND-ed, so filters and
+    per-value counts are a handful of bitwise ops over ``n / 8`` bytes.
+    """
+
+    def __init__(
+        self,
+        ids: NDArray[np.int64],
+        imdb: NDArray[np.float64],
+        vocab: dict[str, list[str]],
+        bits: dict[str, NDArray[np.uint8]],
+    ) -> None:
+        self.ids = ids
+        self.imdb = imdb
+        self.vocab = vocab
+        self.bits = bits
+        self._lookup = {
+            facet: {v.casefold(): i for i, v in enumerate(values)}
+            for facet, values in vocab.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, entries: Sequence[CatalogEntry]) -> FacetIndex:
+        ordered = sorted(entries, key=lambda e: e.id)
+        ids = np.fromiter((e.id for e in ordered), dtype=np.int64, count=len(ordered))
+        imdb = np.array(
+            [np.nan if e.imdb_rating is None else e.imdb_rating for e in ordered],
+            dtype=np.float64,
+        )
+        vocab: dict[str, list[str]] = {}
+        bits: dict[str, NDArray[np.uint8]] = {}
+        for facet in FACETS:
+            vocab[facet] = []
+            dense = _one_hot([_entry_values(e, facet) for e in ordered], vocab[facet])
+            bits[facet] = np.packbits(dense, axis=1)
+        return cls(ids, imdb, vocab, bits)
+
+    @classmethod
+    def from_codes(
+        cls,
+        ids: NDArray[np.int64],
+        imdb: NDArray[np.float64],
+        facets: Mapping[str, tuple[list[str], NDArray[np.intp], NDArray[np.intp]]],
+    ) -> FacetIndex:
+        """Build from per-facet (vocab, value codes, rows) triples.
+
+        Columnar sources such as Arrow list columns already come in this
+        shape, so no per-row entry objects are needed.
+        """
+        order = np.argsort(ids, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        vocab: dict[str, list[str]] = {}
+        bits: dict[str, NDArray[np.uint8]] = {}
+        for facet in FACETS:
+            values, codes, rows = facets[facet]
+            dense = np.zeros((len(values), len(ids)), dtype=bool)
+            dense[codes, rank[rows]] = True
+            vocab[facet] = list(values)
+            bits[facet] = np.packbits(dense, axis=1)
+        return cls(ids[order], imdb[order], vocab, bits)
+
+    def add(self, entries: Sequence[CatalogEntry]) -> FacetIndex:
+        """Return an index that also covers ``entries``; existing IDs are kept."""
+        known = set(self.ids.tolist())
+        fresh = sorted((e for e in entries if e.id not in known), key=lambda e: e.id)
+        if not fresh:
+            return self
+        ids = np.concatenate(
+            [self.ids, np.fromiter((e.id for e in fresh), dtype=np.int64)]
+        )
+        order = np.argsort(ids, kind="stable")
+        imdb = np.concatenate(
+            [
+                self.imdb,
+                [np.nan if e.imdb_rating is None else e.imdb_rating for e in fresh],
+            ]
+        )
+        vocab: dict[str, list[str]] = {}
+        bits: dict[str, NDArray[np.uint8]] = {}
+        for facet in FACETS:
+            vocab[facet] = list(self.vocab[facet])
+            old = np.unpackbits(self.bits[facet], axis=1, count=len(self)).astype(bool)
+            new = _one_hot([_entry_values(e, facet) for e in fresh], vocab[facet])
+            old = np.pad(old, ((0, len(vocab[facet]) - len(old)), (0, 0)))
+            dense = np.concatenate([old, new], axis=1)[:, order]
+            bits[facet] = np.packbits(dense, axis=1)
+        return FacetIndex(ids[order], imdb[order], vocab, bits)
+
+    def all(self) -> NDArray[np.uint8]:
+        return np.packbits(np.ones(len(self), dtype=bool))
+
+    def none(self) -> NDArray[np.uint8]:
+        return np.zeros((len(self) + 7) // 8, dtype=np.uint8)
+
+    def any_of(self, facet: str, values: Iterable[str]) -> NDArray[np.uint8]:
+        lookup = self._lookup[facet]
+        rows = [lookup[v.casefold()] for v in values if v.casefold() in lookup]
+        if not rows:
+            return self.none()
+        bitmap: NDArray[np.uint8] = np.bitwise_or.reduce(self.bits[facet][rows], axis=0)
+        return bitmap
+
+    def select(self, filters: Mapping[str, Sequence[str]]) -> NDArray[np.uint8]:
+        """AND across facets of the OR of each facet's values; empty means any."""
+        bitmap = self.all()
+        for facet, values in filters.items():
+            if values:
+                bitmap &= self.any_of(facet, values)
+        return bitmap
+
+    def of_ids(self, ids: Iterable[int]) -> NDArray[np.uint8]:
+        wanted = np.fromiter(ids, dtype=np.int64)
+        pos = np.searchsorted(self.ids, wanted)
+        inside = pos < len(self)
+        pos, wanted = pos[inside], wanted[inside]
+        dense = np.zeros(len(self), dtype=bool)
+        dense[pos[self.ids[pos] == wanted]] = True
+        return np.packbits(dense)
+
+    def imdb_at_least(self, threshold: float) -> NDArray[np.uint8]:
+        return np.packbits(self.imdb >= threshold)
+
+    def count(self, bitmap: NDArray[np.uint8]) -> int:
+        return int(np.bitwise_count(bitmap).sum())
+
+    def to_ids(self, bitmap: NDArray[np.uint8]) -> NDArray[np.int64]:
+        ids: NDArray[np.int64] = self.ids[
+            np.unpackbits(bitmap, count=len(self)).astype(bool)
+        ]
+        return ids
+
+    def nth(self, bitmap: NDArray[np.uint8], k: int) -> int:
+        """ID of the ``k``-th selected row; a uniform ``k`` gives a uniform pick."""
+        per_byte = np.cumsum(np.bitwise_count(bitmap))
+        byte = int(np.searchsorted(per_byte, k, side="right"))
+        before = int(per_byte[byte - 1]) if byte else 0
+        bits = np.flatnonzero(np.unpackbits(bitmap[byte : byte + 1]))
+        item_id: int = self.ids[byte * 8 + int(bits[k - before])].item()
+        return item_id
+
+    def facet_counts(self, facet: str, bitmap: NDArray[np.uint8]) -> dict[str, int]:
+        counts = np.bitwise_count(self.bits[facet] & bitmap).sum(axis=1)
+        return {
+            value: int(n)
+            for value, n in zip(self.vocab[facet], counts.tolist(), strict=True)
+            if n
+        }
+
+    def top_by_imdb(self, bitmap: NDArray[np.uint8], limit: int) -> list[int]:
+        rows = np.flatnonzero(np.unpackbits(bitmap, count=len(self)))
+        scores = np.nan_to_num(self.imdb[rows], nan=-1.0)
+        best = rows[np.argsort(-scores, kind="stable")[:limit]]
+        top: list[int] = self.ids[best].tolist()
+        return top
+
+    def save(self, path: Path) -> None:
+        arrays: dict[str, NDArray[np.generic]] = {"ids": self.ids, "imdb": self.imdb}
+        for facet in FACETS:
+            arrays[f"{facet}_vocab"] = np.asarray(self.vocab[facet], dtype=str)
+            arrays[f"{facet}_bits"] = self.bits[facet]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, allow_pickle=False, **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> FacetIndex | None:
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return cls(
+                data["ids"],
+                data["imdb"],
+                {f: data[f"{f}_vocab"].tolist() for f in FACETS},
+                {f: data[f"{f}_bits"] for f in FACETS},
+            )
@@ -0,0 +1,282 @@
+"""Local OpenAI-compatible stand-in for offline benchmarks and load tests.
+
+Serves ``/v1/chat/completions`` (plain and streamed) and ``/v1/embeddings``
+with deterministic output, a configurable time to first token and a
+configurable token throughput. Run ``python -m movie_buddy.fake_openai``
+and point ``OPENAI_BASE_URL`` at the printed URL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import contextlib
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+
+import numpy as np
+
+_DEFAULT_PORT = 8765
+_DEFAULT_EMBEDDING_DIM = 64
+_CHARS_PER_TOKEN = 4
+_PICKS = 3
+
+_CANDIDATE_ROW_RE = re.compile(r"^(\d+)\|", re.MULTILINE)
+_REQUEST_RE = re.compile(r"^User request: (.*)$", re.MULTILINE)
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode()).digest()
+
+
+def fake_embedding(text: str, dim: int = _DEFAULT_EMBEDDING_DIM) -> list[float]:
+    """Unit vector seeded by the text, so equal texts embed identically."""
+    rng = np.random.default_rng(int.from_bytes(_digest(text)[:8], "big"))
+    vector = rng.standard_normal(dim).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+    values: list[float] = vector.tolist()
+    return values
+
+
+def fake_recommendations(prompt: str) -> str:
+    """Pick catalog rows from the prompt deterministically per prompt."""
+    ids = [int(m) for m in _CANDIDATE_ROW_RE.findall(prompt)]
+    request = _REQUEST_RE.search(prompt)
+    topic = request.group(1) if request else "your request"
+    prompt_hash = _digest(prompt).hex()
+    picks = sorted(ids, key=lambda i: _digest(f"{prompt_hash}:{i}"))[:_PICKS]
+    return json.dumps(
+        {
+            "recommendations": [
+                {"content_id": i, "explanation": f"A good fit for {topic}."}
+                for i in picks
+            ]
+        }
+    )
+
+
+def _tokens(text: str) -> list[str]:
+    return [
+        text[i : i + _CHARS_PER_TOKEN] for i in range(0, len(text), _CHARS_PER_TOKEN)
+    ]
+
+
+class FakeOpenAIServer:
+    """Threaded HTTP server; use as a context manager or call start/stop."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_second: float | None = None,
+        embedding_dim: int = _DEFAULT_EMBEDDING_DIM,
+    ) -> None:
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.embedding_dim = embedding_dim
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def fake(self) -> FakeOpenAIServer:
+        server: FakeOpenAIServer = self.server.fake  # type: ignore[attr-defined]
+        return server
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/chat/completions"):
+            self._chat(body)
+        elif self.path.endswith("/embeddings"):
+            self._embeddings(body)
+        else:
+            self._send_json(
+                {
+                    "error": {
+                        "message": f"Unknown path {self.path}",
+                        "type": "not_found",
+                    }
+                },
+                HTTPStatus.NOT_FOUND,
+            )
+
+    def _send_json(
+        self, payload: dict[str, Any], status: HTTPStatus = HTTPStatus.OK
+    ) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chat(self, body: dict[str, Any]) -> None:
+        fake = self.fake
+        fake.count("chat")
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        content = fake_recommendations(prompt)
+        tokens = _tokens(content)
+        usage = {
+            "prompt_tokens": len(_tokens(prompt)),
+            "completion_tokens": len(tokens),
+            "total_tokens": len(_tokens(prompt)) + len(tokens),
+        }
+        fake.count("prompt_tokens", usage["prompt_tokens"])
+        fake.count("completion_tokens", usage["completion_tokens"])
+        time.sleep(fake.latency)
+        base = {
+            "id": f"chatcmpl-{_digest(prompt).hex()[:24]}",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+        }
+
+        if not body.get("stream"):
+            time.sleep(fake.token_delay() * len(tokens))
+            self._send_json(
+                {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                }
+            )
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        deltas: list[dict[str, Any]] = [
+            {"role": "assistant", "content": ""},
+            *({"content": t} for t in tokens),
+        ]
+        for i, delta in enumerate(deltas):
+            chunk = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": delta,
+                        "finish_reason": "stop" if i == len(deltas) - 1 else None,
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            if i:
+                time.sleep(fake.token_delay())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _embeddings(self, body: dict[str, Any]) -> None:
+        fake = self.fake
+        texts = body.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        fake.count("embeddings")
+        fake.count("embedded_texts", len(texts))
+        time.sleep(fake.latency)
+        data = []
+        for i, text in enumerate(texts):
+            vector = fake_embedding(str(text), fake.embedding_dim)
+            embedding: list[float] | str = vector
+            if body.get("encoding_format") == "base64":
+                raw = np.asarray(vector, dtype="<f4").tobytes()
+                embedding = base64.b64encode(raw).decode()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        tokens = sum(len(_tokens(str(t))) for t in texts)
+        self._send_json(
+            {
+                "object": "list",
+                "data": data,
+                "model": body.get("model", "fake"),
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            }
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=_DEFAULT_PORT)
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="seconds to first token"
+    )
+    parser.add_argument("--tps", type=float, default=50.0, help="tokens per second")
+    parser.add_argument("--dim", type=int, default=_DEFAULT_EMBEDDING_DIM)
+    args = parser.parse_args()
+    server = FakeOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.tps,
+        embedding_dim=args.dim,
+    )
+    print(f"Fake OpenAI API listening on {server.url}")
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
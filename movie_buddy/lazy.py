@@ -0,0 +1,35 @@
+"""Deferred imports, so the CLI only loads what a command actually uses."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+
+class LazyImport:
+    """Stand-in for a module, or a name in one, imported on first use.
+
+    Calling it or reading an attribute imports the target; after that it is
+    one ``sys.modules`` lookup per use. Because it is an ordinary module
+    global, ``unittest.mock.patch`` can still replace it.
+    """
+
+    __slots__ = ("_module", "_name")
+
+    def __init__(self, module: str, name: str | None = None) -> None:
+        self._module = module
+        self._name = name
+
+    def resolve(self) -> Any:
+        module = importlib.import_module(self._module)
+        return module if self._name is None else getattr(module, self._name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        target = self._module if self._name is None else f"{self._module}.{self._name}"
+        return f"<lazy {target}>"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -23,6 +23,9 @@ class NotFoundError(KinoPubError): ...
 class RateLimitError(KinoPubError): ...
 
 
+class LLMError(KinoPubError): ...
+
+
 @dataclass
 class Token:
     access_token: str
@@ -33,6 +36,9 @@ class Token:
     def is_expired(self) -> bool:
         return time.time() >= self.expires_at
 
+    def expires_within(self, seconds: float) -> bool:
+        return time.time() + seconds >= self.expires_at
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "access_token": self.access_token,
@@ -58,7 +64,7 @@ class DeviceCode:
     expires_in: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Episode:
     id: int
     number: int
@@ -66,23 +72,31 @@ class Episode:
     season_number: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Season:
     number: int
     episodes: list[Episode]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Content:
     id: int
     title: str
     content_type: str
     year: int
     seasons: list[Season]
+    _episodes: tuple[Episode, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
-    def all_episodes(self) -> list[Episode]:
-        return [ep for season in self.seasons for ep in season.episodes]
+    def all_episodes(self) -> tuple[Episode, ...]:
+        """Episodes of every season in order, flattened once on first access."""
+        if self._episodes is None:
+            episodes = tuple(ep for season in self.seasons for ep in season.episodes)
+            object.__setattr__(self, "_episodes", episodes)
+            return episodes
+        return self._episodes
 
     def build_watch_url(self, episode: Episode | None = None) -> str:
         from movie_buddy.config import config
@@ -94,7 +108,7 @@ class Content:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WatchingItem:
     id: int
     title: str
@@ -103,13 +117,13 @@ class WatchingItem:
     watched: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BookmarkFolder:
     id: int
     title: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CatalogEntry:
     id: int
     title: str
@@ -123,7 +137,7 @@ class CatalogEntry:
     created_at: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Rating:
     content_id: int
     title: str
@@ -132,7 +146,7 @@ class Rating:
     rated_at: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Recommendation:
     content_id: int
     title: str
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from movie_buddy.models import CatalogEntry, Rating
+
+DEFAULT_TOKEN_BUDGET = 3000
+
+# Rough English/Cyrillic average; avoids a tokenizer dependency
+_CHARS_PER_TOKEN = 4
+_CANDIDATE_SHARE = 0.65
+_MIN_PLOT_CHARS = 40
+_MAX_PLOT_CHARS = 280
+
+_EXTREMITY_WEIGHT = 0.6
+_RECENCY_WEIGHT = 0.4
+_DIVERSITY_WEIGHT = 0.3
+
+_SENTENCE_END_RE = re.compile(r"[.!?…](?=\s)")
+
+_CANDIDATE_HEADER = "id|title|year|type|genres|imdb|plot"
+_PROFILE_INTRO = "Ratings the user gave (title: score out of 10):"
+_CATALOG_INTRO = "Catalog (pipe-separated, answer with ids):"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def truncate_plot(plot: str, max_chars: int) -> str:
+    """Shorten a plot to whole sentences, or whole words, within max_chars."""
+    plot = " ".join(plot.split())
+    if len(plot) <= max_chars:
+        return plot
+    if max_chars <= 1:
+        return ""
+    head = plot[: max_chars - 1]
+    sentence_ends = [m.end() for m in _SENTENCE_END_RE.finditer(head)]
+    if sentence_ends and sentence_ends[-1] >= max_chars // 2:
+        return head[: sentence_ends[-1]]
+    cut = head.rfind(" ")
+    return (head[:cut] if cut > 0 else head).rstrip(",;:") + "…"
+
+
+def _field(value: object) -> str:
+    return str(value).replace("|", "/").replace("\n", " ")
+
+
+def format_rating(rating: Rating) -> str:
+    return f"{_field(rating.title)}: {rating.score}"
+
+
+def format_candidate(entry: CatalogEntry, plot_chars: int) -> str:
+    imdb = "" if entry.imdb_rating is None else f"{entry.imdb_rating:g}"
+    return "|".join(
+        [
+            str(entry.id),
+            _field(entry.title),
+            str(entry.year),
+            entry.content_type,
+            ",".join(_field(g) for g in entry.genres),
+            imdb,
+            _field(truncate_plot(entry.plot, plot_chars)),
+        ]
+    )
+
+
+def select_ratings(
+    ratings: Sequence[Rating],
+    entries: dict[int, CatalogEntry],
+    budget: int,
+) -> list[Rating]:
+    """Pick the most informative ratings that fit in ``budget`` tokens.
+
+    Extreme and recent scores rank highest; a bonus for genres not yet
+    covered keeps the sample diverse. Lazy greedy selection: the bonus
+    only shrinks as coverage grows, so stale heap scores are upper bounds.
+    """
+    if not ratings:
+        return []
+    recency = {
+        id(r): rank / max(len(ratings) - 1, 1)
+        for rank, r in enumerate(sorted(ratings, key=lambda r: r.rated_at))
+    }
+
+    def base(r: Rating) -> float:
+        extremity = abs(r.score - 5.5) / 4.5
+        return _EXTREMITY_WEIGHT * extremity + _RECENCY_WEIGHT * recency[id(r)]
+
+    covered: set[str] = set()
+
+    def gain(r: Rating) -> float:
+        entry = entries.get(r.content_id)
+        genres = set(entry.genres) if entry else set()
+        novelty = len(genres - covered) / len(genres) if genres else 0.0
+        return base(r) + _DIVERSITY_WEIGHT * novelty
+
+    heap = [(-gain(r), i) for i, r in enumerate(ratings)]
+    heapq.heapify(heap)
+    selected: list[Rating] = []
+    used = 0
+    while heap:
+        _, i = heapq.heappop(heap)
+        current = -gain(ratings[i])
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, i))
+            continue
+        cost = estimate_tokens(format_rating(ratings[i])) + 1
+        if used + cost > budget:
+            continue
+        used += cost
+        selected.append(ratings[i])
+        entry = entries.get(ratings[i].content_id)
+        if entry:
+            covered.update(entry.genres)
+    return selected
+
+
+def pack_candidates(candidates: Sequence[CatalogEntry], budget: int) -> list[str]:
+    """Format candidates in rank order, shrinking plots to fit ``budget`` tokens.
+
+    If even bare rows do not fit, the lowest-ranked candidates are dropped.
+    """
+    bare = [format_candidate(e, 0) for e in candidates]
+    bare_tokens = [estimate_tokens(row) + 1 for row in bare]
+    spare = budget - estimate_tokens(_CANDIDATE_HEADER) - sum(bare_tokens)
+    if spare < 0:
+        lines: list[str] = []
+        used = estimate_tokens(_CANDIDATE_HEADER)
+        for row, cost in zip(bare, bare_tokens, strict=True):
+            if used + cost > budget:
+                break
+            lines.append(row)
+            used += cost
+        return lines
+
+    # One token per row is held back for rounding in estimate_tokens
+    per_row = spare // max(len(candidates), 1) - 1
+    plot_chars = min(per_row * _CHARS_PER_TOKEN, _MAX_PLOT_CHARS)
+    if plot_chars < _MIN_PLOT_CHARS:
+        plot_chars = 0
+    return [format_candidate(e, plot_chars) for e in candidates]
+
+
+def build_user_prompt(
+    ratings: Sequence[Rating],
+    candidates: Sequence[CatalogEntry],
+    description: str,
+    *,
+    rated_entries: dict[int, CatalogEntry] | None = None,
+    budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """Build the user message so that it stays within ``budget`` tokens."""
+    request = f"User request: {description}"
+    remaining = budget - estimate_tokens(
+        "\n\n".join([_PROFILE_INTRO, _CATALOG_INTRO, request])
+    )
+    candidate_lines = pack_candidates(
+        candidates, max(int(remaining * _CANDIDATE_SHARE), 0)
+    )
+    catalog = "\n".join([_CANDIDATE_HEADER, *candidate_lines])
+    remaining -= estimate_tokens(catalog)
+
+    chosen = select_ratings(ratings, rated_entries or {}, max(remaining, 0))
+    chosen.sort(key=lambda r: r.score, reverse=True)
+    profile = "\n".join(format_rating(r) for r in chosen)
+
+    return f"{_PROFILE_INTRO}\n{profile}\n\n{_CATALOG_INTRO}\n{catalog}\n\n{request}"
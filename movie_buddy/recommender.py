@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import openai
+
+from movie_buddy.config import config as default_config
+from movie_buddy.models import LLMError, Recommendation
+from movie_buddy.prompt import build_user_prompt
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+    from pathlib import Path
+
+    from openai.types.chat import ChatCompletionMessageParam
+    from openai.types.shared_params import ResponseFormatJSONSchema
+
+    from movie_buddy.config import Config
+    from movie_buddy.models import CatalogEntry, Rating
+
+RECOMMENDATION_COUNT = 3
+
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_CACHE_MAX_ENTRIES = 256
+
+_SCHEMA_RECOMMENDATION_CACHE = """
+CREATE TABLE IF NOT EXISTS recommendations (
+    cache_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+_SYSTEM_PROMPT = (
+    "You are a movie recommender. Select exactly 3 items from the provided "
+    "catalog that best match the user's request and their taste profile. "
+    "Only use IDs that appear in the catalog. Explain each pick in one or two "
+    "sentences, referring to titles the user rated where it helps."
+)
+
+_RESPONSE_FORMAT: ResponseFormatJSONSchema = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "recommendations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "recommendations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "content_id": {"type": "integer"},
+                            "explanation": {"type": "string"},
+                        },
+                        "required": ["content_id", "explanation"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["recommendations"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _to_recommendation(
+    item: object, by_id: dict[int, CatalogEntry]
+) -> Recommendation | None:
+    if not isinstance(item, dict):
+        return None
+    content_id = item.get("content_id")
+    entry = by_id.get(content_id) if isinstance(content_id, int) else None
+    if entry is None:
+        return None
+    return Recommendation(
+        content_id=entry.id,
+        title=entry.title,
+        year=entry.year,
+        content_type=entry.content_type,
+        explanation=item.get("explanation", ""),
+    )
+
+
+def parse_recommendations(
+    content: str, candidates: Sequence[CatalogEntry]
+) -> list[Recommendation]:
+    try:
+        items = json.loads(content)["recommendations"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        msg = "Could not parse recommendations from the model response."
+        raise LLMError(msg) from e
+
+    by_id = {e.id: e for e in candidates}
+    recommendations: list[Recommendation] = []
+    for item in items:
+        rec = _to_recommendation(item, by_id)
+        if rec is None or any(r.content_id == rec.content_id for r in recommendations):
+            continue
+        recommendations.append(rec)
+    return recommendations[:RECOMMENDATION_COUNT]
+
+
+class RecommendationStreamParser:
+    """Emit recommendations from a streamed JSON response as each item closes.
+
+    Tracks brace depth outside string literals; an object that closes at
+    the depth of the ``recommendations`` array is a complete item.
+    """
+
+    _ITEM_DEPTH = 3
+
+    def __init__(self, candidates: Sequence[CatalogEntry]) -> None:
+        self._by_id = {e.id: e for e in candidates}
+        self._seen: set[int] = set()
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = 0
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, delta: str) -> list[Recommendation]:
+        self._text += delta
+        found: list[Recommendation] = []
+        for i in range(self._pos, len(self._text)):
+            char = self._text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == self._ITEM_DEPTH:
+                    self._item_start = i
+            elif char in "}]":
+                if self._depth == self._ITEM_DEPTH and char == "}":
+                    rec = self._parse_item(self._text[self._item_start : i + 1])
+                    if rec is not None:
+                        found.append(rec)
+                self._depth -= 1
+        self._pos = len(self._text)
+        return found
+
+    def _parse_item(self, raw: str) -> Recommendation | None:
+        if len(self._seen) >= RECOMMENDATION_COUNT:
+            return None
+        try:
+            rec = _to_recommendation(json.loads(raw), self._by_id)
+        except json.JSONDecodeError:
+            return None
+        if rec is None or rec.content_id in self._seen:
+            return None
+        self._seen.add(rec.content_id)
+        return rec
+
+
+def normalize_query(description: str) -> str:
+    return " ".join(description.casefold().split())
+
+
+def ratings_version(ratings: Sequence[Rating]) -> str:
+    pairs = sorted((r.content_id, r.score) for r in ratings)
+    return hashlib.sha256(json.dumps(pairs).encode()).hexdigest()
+
+
+def candidates_version(candidates: Sequence[CatalogEntry]) -> str:
+    ids = sorted(e.id for e in candidates)
+    return hashlib.sha256(json.dumps(ids).encode()).hexdigest()
+
+
+def cache_key(
+    description: str,
+    model: str,
+    ratings: Sequence[Rating],
+    candidates: Sequence[CatalogEntry],
+) -> str:
+    parts = [
+        normalize_query(description),
+        model,
+        ratings_version(ratings),
+        candidates_version(candidates),
+    ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class RecommendationCache:
+    """Local LLM result cache with a TTL and least-recently-used eviction.
+
+    Keys cover the query, model, ratings and shortlist, so any change to
+    ratings or the catalog naturally misses and stale rows age out. Safe to
+    share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        ttl: float = _CACHE_TTL_SECONDS,
+        max_entries: int = _CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path or default_config.recommendation_cache_file
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.execute(_SCHEMA_RECOMMENDATION_CACHE)
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get(self, key: str) -> list[Recommendation] | None:
+        with self._lock:
+            now = self._clock()
+            row = self._conn.execute(
+                "SELECT payload FROM recommendations "
+                "WHERE cache_key = ? AND created_at > ?",
+                (key, now - self._ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE recommendations SET accessed_at = ? WHERE cache_key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+        return [Recommendation(**item) for item in json.loads(row[0])]
+
+    def put(self, key: str, recommendations: Sequence[Recommendation]) -> None:
+        payload = json.dumps(
+            [dataclasses.asdict(r) for r in recommendations], ensure_ascii=False
+        )
+        with self._lock:
+            now = self._clock()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recommendations "
+                "(cache_key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM recommendations WHERE created_at <= ?",
+                (now - self._ttl,),
+            )
+            self._conn.execute(
+                "DELETE FROM recommendations WHERE cache_key NOT IN ("
+                "SELECT cache_key FROM recommendations "
+                "ORDER BY accessed_at DESC LIMIT ?)",
+                (self._max_entries,),
+            )
+            self._conn.commit()
+
+
+class MovieRecommender:
+    def __init__(
+        self,
+        cfg: Config | None = None,
+        *,
+        client: openai.OpenAI | None = None,
+        cache: RecommendationCache | None = None,
+    ) -> None:
+        c = cfg or default_config
+        if client is None:
+            if not c.openai_api_key:
+                msg = "OPENAI_API_KEY not set. See quickstart guide for setup."
+                raise LLMError(msg)
+            client = openai.OpenAI(api_key=c.openai_api_key, base_url=c.openai_base_url)
+        self._client = client
+        self._cache = cache
+        self.model = c.openai_model
+        self.token_budget = c.prompt_token_budget
+
+    def build_prompt(
+        self,
+        ratings: Sequence[Rating],
+        candidates: Sequence[CatalogEntry],
+        description: str,
+        rated_entries: dict[int, CatalogEntry] | None = None,
+    ) -> list[ChatCompletionMessageParam]:
+        user_prompt = build_user_prompt(
+            ratings,
+            candidates,
+            description,
+            rated_entries=rated_entries,
+            budget=self.token_budget,
+        )
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def stream_recommendations(
+        self,
+        ratings: Sequence[Rating],
+        candidates: Sequence[CatalogEntry],
+        description: str,
+        rated_entries: dict[int, CatalogEntry] | None = None,
+    ) -> Iterator[Recommendation]:
+        key = cache_key(description, self.model, ratings, candidates)
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                yield from cached
+                return
+
+        parser = RecommendationStreamParser(candidates)
+        recommendations: list[Recommendation] = []
+        try:
+            stream = self._client.chat.completions.create(
+                model=self.model,
+                messages=self.build_prompt(
+                    ratings, candidates, description, rated_entries
+                ),
+                response_format=_RESPONSE_FORMAT,
+                temperature=0.7,
+                stream=True,
+            )
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for rec in parser.feed(chunk.choices[0].delta.content):
+                    recommendations.append(rec)
+                    yield rec
+        except openai.OpenAIError as e:
+            msg = f"Recommendation request failed: {e}"
+            raise LLMError(msg) from e
+
+        if not recommendations:
+            # Surfaces malformed output; a well-formed empty list is fine
+            parse_recommendations(parser.text, candidates)
+        elif self._cache is not None:
+            self._cache.put(key, recommendations)
+
+    def get_recommendations(
+        self,
+        ratings: Sequence[Rating],
+        candidates: Sequence[CatalogEntry],
+        description: str,
+        rated_entries: dict[int, CatalogEntry] | None = None,
+    ) -> list[Recommendation]:
+        return list(
+            self.stream_recommendations(ratings, candidates, description, rated_entries)
+        )
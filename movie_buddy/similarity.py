@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Sequence
+
+    from numpy.typing import NDArray
+
+    from movie_buddy.ann import IVFIndex
+    from movie_buddy.embeddings import EmbeddingMatrix
+    from movie_buddy.models import CatalogEntry
+
+NEIGHBOR_COUNT = 20
+
+# With an ANN index each item is only scored against this many nearest rows
+_ANN_CANDIDATES = 5 * NEIGHBOR_COUNT
+
+_BLOCK_ROWS = 256
+
+# Blend of plot embedding cosine and facet overlap (Jaccard)
+_EMBEDDING_WEIGHT = 0.7
+_GENRE_WEIGHT = 0.2
+_COUNTRY_WEIGHT = 0.1
+
+Neighbors = dict[int, list[tuple[int, float]]]
+
+
+def _one_hot(entries: Sequence[CatalogEntry], facet: str) -> NDArray[np.float32]:
+    vocab: dict[str, int] = {}
+    pairs = [
+        (row, vocab.setdefault(value, len(vocab)))
+        for row, entry in enumerate(entries)
+        for value in set(getattr(entry, facet))
+    ]
+    out = np.zeros((len(entries), len(vocab)), dtype=np.float32)
+    if pairs:
+        rows, cols = np.asarray(pairs).T
+        out[rows, cols] = 1.0
+    return out
+
+
+def _jaccard(
+    one_hot: NDArray[np.float32], rows: NDArray[np.intp]
+) -> NDArray[np.float32]:
+    sizes = one_hot.sum(axis=1)
+    inter = one_hot[rows] @ one_hot.T
+    union = sizes[rows, None] + sizes[None, :] - inter
+    out = np.zeros_like(inter)
+    np.divide(inter, union, out=out, where=union > 0)
+    return out
+
+
+class ItemSimilarity:
+    """Dense item-item scores over the catalog, computed a block at a time.
+
+    With an ``ann`` index, embedded items are scored only against the
+    nearest rows it returns, so neighbour updates no longer scan the whole
+    catalog per item. Items without an embedding are still scanned in full.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[CatalogEntry],
+        matrix: EmbeddingMatrix | None = None,
+        ann: IVFIndex | None = None,
+    ) -> None:
+        self.ids = np.fromiter((e.id for e in entries), dtype=np.int64)
+        self._row = {item_id: i for i, item_id in enumerate(self.ids.tolist())}
+        self._genres = _one_hot(entries, "genres")
+        self._countries = _one_hot(entries, "countries")
+        self._vectors: NDArray[np.float32] | None = None
+        self._embedded = np.zeros(len(self.ids), dtype=bool)
+        if matrix is not None and len(matrix):
+            rows, found = matrix.rows_for(self.ids)
+            vectors = np.zeros((len(self.ids), matrix.dim), dtype=np.float32)
+            vectors[found] = matrix.vectors[rows]
+            self._vectors = vectors
+            self._embedded = found
+        self._ann = ann if self._vectors is not None else None
+
+    def rows_for(self, ids: Collection[int]) -> NDArray[np.intp]:
+        return np.fromiter((self._row[i] for i in ids if i in self._row), dtype=np.intp)
+
+    def scores(self, rows: NDArray[np.intp]) -> NDArray[np.float32]:
+        """Similarity of ``rows`` to every item; self-similarity is -inf."""
+        out = _GENRE_WEIGHT * _jaccard(self._genres, rows)
+        out += _COUNTRY_WEIGHT * _jaccard(self._countries, rows)
+        if self._vectors is not None:
+            out += _EMBEDDING_WEIGHT * (self._vectors[rows] @ self._vectors.T)
+        out[np.arange(len(rows)), rows] = -np.inf
+        return out
+
+    def _split_ann(
+        self, rows: NDArray[np.intp]
+    ) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+        """``rows`` the ANN index can serve, and the ones left to scan."""
+        if self._ann is None:
+            return rows[:0], rows
+        served = self._embedded[rows]
+        return rows[served], rows[~served]
+
+    def _ann_scores(self, row: int) -> tuple[NDArray[np.intp], NDArray[np.float32]]:
+        """Rows nearest to ``row`` by embedding, and their blended scores."""
+        if self._ann is None or self._vectors is None:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        hits = self._ann.search(self._vectors[row], k=_ANN_CANDIDATES + 1)
+        cols = self.rows_for([item_id for item_id, _ in hits])
+        cols = cols[cols != row]
+        # Row 0 of each subset is ``row`` itself
+        subset, first = np.r_[row, cols], np.zeros(1, dtype=np.intp)
+        scores = _GENRE_WEIGHT * _jaccard(self._genres[subset], first)[0, 1:]
+        scores += _COUNTRY_WEIGHT * _jaccard(self._countries[subset], first)[0, 1:]
+        scores += _EMBEDDING_WEIGHT * (self._vectors[cols] @ self._vectors[row])
+        return cols, scores
+
+    def neighbors(self, ids: Collection[int], k: int = NEIGHBOR_COUNT) -> Neighbors:
+        rows = self.rows_for(ids)
+        k = min(k, len(self.ids) - 1)
+        result: Neighbors = {}
+        if k <= 0:
+            return {int(self.ids[r]): [] for r in rows}
+        served, rows = self._split_ann(rows)
+        for row in served.tolist():
+            cols, scores = self._ann_scores(row)
+            top = np.argsort(-scores, kind="stable")[:k]
+            result[int(self.ids[row])] = list(
+                zip(self.ids[cols[top]].tolist(), scores[top].tolist(), strict=True)
+            )
+        for start in range(0, len(rows), _BLOCK_ROWS):
+            block = rows[start : start + _BLOCK_ROWS]
+            scores = self.scores(block)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for row, cols, vals in zip(block, top, top_scores, strict=True):
+                result[int(self.ids[row])] = list(
+                    zip(self.ids[cols].tolist(), vals.tolist(), strict=True)
+                )
+        return result
+
+    def incoming(
+        self,
+        changed_ids: Collection[int],
+        floors: dict[int, float],
+        exclude: Collection[int] = (),
+    ) -> Neighbors:
+        """Changed items that now outscore another item's weakest neighbour.
+
+        ``floors`` maps an item to its current k-th neighbour score; items
+        missing from it have room and accept any candidate.
+        """
+        floor = np.full(len(self.ids), -np.inf, dtype=np.float32)
+        for item_id, value in floors.items():
+            row = self._row.get(item_id)
+            if row is not None:
+                floor[row] = value
+        floor[self.rows_for(exclude)] = np.inf
+
+        found: Neighbors = {}
+        served, rows = self._split_ann(self.rows_for(changed_ids))
+        for row in served.tolist():
+            cols, scores = self._ann_scores(row)
+            beats = scores > floor[cols]
+            for d, score in zip(
+                cols[beats].tolist(), scores[beats].tolist(), strict=True
+            ):
+                found.setdefault(int(self.ids[d]), []).append(
+                    (int(self.ids[row]), float(score))
+                )
+        for start in range(0, len(rows), _BLOCK_ROWS):
+            block = rows[start : start + _BLOCK_ROWS]
+            scores = self.scores(block)
+            src, dst = np.nonzero(scores > floor[None, :])
+            for s, d in zip(src.tolist(), dst.tolist(), strict=True):
+                found.setdefault(int(self.ids[d]), []).append(
+                    (int(self.ids[block[s]]), float(scores[s, d]))
+                )
+        return found
+
+
+def merge_neighbors(
+    current: list[tuple[int, float]],
+    incoming: list[tuple[int, float]],
+    k: int = NEIGHBOR_COUNT,
+) -> list[tuple[int, float]]:
+    best = dict(current)
+    for item_id, score in incoming:
+        best[item_id] = max(score, best.get(item_id, -np.inf))
+    return sorted(best.items(), key=lambda pair: pair[1], reverse=True)[:k]
+
+
+def update_neighbors(
+    similarity: ItemSimilarity,
+    changed_ids: Collection[int],
+    *,
+    floors: dict[int, tuple[float, int]],
+    stale_ids: Collection[int],
+    load_stored: Callable[[Collection[int]], Neighbors],
+    k: int = NEIGHBOR_COUNT,
+) -> Neighbors:
+    """Neighbour lists to write after ``changed_ids`` were added or re-embedded.
+
+    Changed items, and items whose stored lists point at a changed item
+    (``stale_ids``), are recomputed in full. Every other item only merges
+    in the changed items that beat its current weakest neighbour, so only
+    those lists are loaded back from storage.
+    """
+    recompute = set(changed_ids) | set(stale_ids)
+    updates = similarity.neighbors(recompute, k)
+    full = {item_id: score for item_id, (score, count) in floors.items() if count >= k}
+    incoming = similarity.incoming(changed_ids, full, exclude=recompute)
+    stored = load_stored(list(incoming)) if incoming else {}
+    for item_id, candidates in incoming.items():
+        updates[item_id] = merge_neighbors(stored.get(item_id, []), candidates, k)
+    return updates
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from movie_buddy.facets import FacetIndex
+from movie_buddy.models import KinoPubError
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional extra: pip install 'movie-buddy[arrow]'
+    pa = pc = pq = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from movie_buddy.storage import TursoStorage
+
+FORMATS = ("parquet", "arrow")
+PAGE_ROWS = 5000
+
+_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _require_arrow() -> None:
+    if pa is None:
+        msg = "pyarrow is not installed. Run: pip install 'movie-buddy[arrow]'"
+        raise KinoPubError(msg)
+
+
+def _catalog_schema() -> pa.Schema:
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("title", pa.string()),
+            ("year", pa.int32()),
+            ("content_type", pa.string()),
+            ("genres", pa.list_(pa.string())),
+            ("countries", pa.list_(pa.string())),
+            ("imdb_rating", pa.float64()),
+            ("kinopoisk_rating", pa.float64()),
+            ("plot", pa.string()),
+            ("created_at", pa.string()),
+        ]
+    )
+
+
+def _ratings_schema() -> pa.Schema:
+    return pa.schema(
+        [
+            ("content_id", pa.int64()),
+            ("title", pa.string()),
+            ("content_type", pa.string()),
+            ("score", pa.int8()),
+            ("rated_at", pa.string()),
+        ]
+    )
+
+
+def _catalog_batch(rows: Sequence[Sequence[Any]]) -> pa.RecordBatch:
+    columns = [list(col) for col in zip(*rows, strict=True)]
+    columns[4] = [json.loads(v) for v in columns[4]]
+    columns[5] = [json.loads(v) for v in columns[5]]
+    return pa.RecordBatch.from_arrays(columns, schema=_catalog_schema())
+
+
+def _ratings_batch(rows: Sequence[Sequence[Any]]) -> pa.RecordBatch:
+    columns = [list(col) for col in zip(*rows, strict=True)]
+    return pa.RecordBatch.from_arrays(columns, schema=_ratings_schema())
+
+
+def _write(
+    path: Path, schema: pa.Schema, batches: Iterable[pa.RecordBatch], fmt: str
+) -> int:
+    """Stream batches to ``path``; each page becomes its own row group."""
+    rows = 0
+    tmp = path.with_name(path.name + ".tmp")
+    if fmt == "parquet":
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            for batch in batches:
+                writer.write_batch(batch, row_group_size=PAGE_ROWS)
+                rows += batch.num_rows
+    else:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    tmp.replace(path)
+    return rows
+
+
+def export_snapshot(
+    storage: TursoStorage, directory: Path, fmt: str = "parquet"
+) -> dict[str, tuple[Path, int]]:
+    """Write the catalog and ratings tables as columnar files in ``directory``.
+
+    Returns the path and row count written for each table.
+    """
+    _require_arrow()
+    if fmt not in FORMATS:
+        msg = f"Unknown snapshot format {fmt!r}; use one of {', '.join(FORMATS)}."
+        raise KinoPubError(msg)
+    directory.mkdir(parents=True, exist_ok=True)
+    ext = _EXTENSIONS[fmt]
+    catalog_path = directory / f"catalog{ext}"
+    ratings_path = directory / f"ratings{ext}"
+    catalog_rows = _write(
+        catalog_path,
+        _catalog_schema(),
+        (_catalog_batch(page) for page in storage.iter_catalog_pages(PAGE_ROWS)),
+        fmt,
+    )
+    ratings_rows = _write(
+        ratings_path,
+        _ratings_schema(),
+        (_ratings_batch(page) for page in storage.iter_rating_pages(PAGE_ROWS)),
+        fmt,
+    )
+    return {
+        "catalog": (catalog_path, catalog_rows),
+        "ratings": (ratings_path, ratings_rows),
+    }
+
+
+def _read(directory: Path, name: str, schema: pa.Schema) -> pa.Table:
+    for fmt in FORMATS:
+        path = directory / f"{name}{_EXTENSIONS[fmt]}"
+        if not path.exists():
+            continue
+        if fmt == "parquet":
+            return pq.read_table(path, schema=schema)
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all()
+    msg = f"No {name} snapshot in {directory}. Run `movie-buddy catalog export`."
+    raise KinoPubError(msg)
+
+
+def _list_codes(
+    column: pa.ChunkedArray,
+) -> tuple[list[str], NDArray[np.intp], NDArray[np.intp]]:
+    """Vocabulary, value codes and owning rows of a list<string> column."""
+    column = column.combine_chunks()
+    encoded = pc.list_flatten(column).dictionary_encode()
+    rows = pc.list_parent_indices(column).to_numpy()
+    return encoded.dictionary.to_pylist(), encoded.indices.to_numpy(), rows
+
+
+@dataclass
+class CatalogSnapshot:
+    """Columnar catalog and ratings tables, read without building entries."""
+
+    catalog: pa.Table
+    ratings: pa.Table
+
+    def __len__(self) -> int:
+        count: int = self.catalog.num_rows
+        return count
+
+    @property
+    def ids(self) -> NDArray[np.int64]:
+        ids: NDArray[np.int64] = self.catalog["id"].to_numpy()
+        return ids
+
+    @property
+    def imdb(self) -> NDArray[np.float64]:
+        column = self.catalog["imdb_rating"].fill_null(np.nan)
+        imdb: NDArray[np.float64] = column.to_numpy()
+        return imdb
+
+    def facet_index(self) -> FacetIndex:
+        rows = np.arange(len(self), dtype=np.intp)
+        types = self.catalog["content_type"].combine_chunks().dictionary_encode()
+        years = self.catalog["year"].to_numpy()
+        dated = np.flatnonzero(years)
+        decades, decade_codes = np.unique(
+            years[dated] - years[dated] % 10, return_inverse=True
+        )
+        return FacetIndex.from_codes(
+            self.ids,
+            self.imdb,
+            {
+                "types": (types.dictionary.to_pylist(), types.indices.to_numpy(), rows),
+                "genres": _list_codes(self.catalog["genres"]),
+                "countries": _list_codes(self.catalog["countries"]),
+                "decades": ([str(d) for d in decades.tolist()], decade_codes, dated),
+            },
+        )
+
+
+def load_snapshot(directory: Path) -> CatalogSnapshot:
+    _require_arrow()
+    return CatalogSnapshot(
+        catalog=_read(directory, "catalog", _catalog_schema()),
+        ratings=_read(directory, "ratings", _ratings_schema()),
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import libsql_client  # type: ignore[import-untyped]
 
@@ -9,6 +9,8 @@ from movie_buddy.config import config as default_config
 from movie_buddy.models import CatalogEntry, KinoPubError, Rating
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
     from movie_buddy.config import Config
 
 _SCHEMA_CATALOG = """
@@ -36,6 +38,67 @@ CREATE TABLE IF NOT EXISTS ratings (
 )
 """
 
+_SCHEMA_CATALOG_NEIGHBORS = """
+CREATE TABLE IF NOT EXISTS catalog_neighbors (
+    content_id INTEGER NOT NULL,
+    neighbor_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (content_id, neighbor_id)
+)
+"""
+
+_INDEX_CATALOG_NEIGHBORS = """
+CREATE INDEX IF NOT EXISTS idx_catalog_neighbors_neighbor
+ON catalog_neighbors (neighbor_id)
+"""
+
+_SCHEMA_CATALOG_DUPLICATES = """
+CREATE TABLE IF NOT EXISTS catalog_duplicates (
+    content_id INTEGER PRIMARY KEY,
+    canonical_id INTEGER NOT NULL
+)
+"""
+
+_INDEX_CATALOG_DUPLICATES = """
+CREATE INDEX IF NOT EXISTS idx_catalog_duplicates_canonical
+ON catalog_duplicates (canonical_id)
+"""
+
+_UPSERT_DUPLICATE = (
+    "INSERT OR REPLACE INTO catalog_duplicates (content_id, canonical_id) VALUES (?, ?)"
+)
+
+_NOT_DUPLICATE = (
+    "id NOT IN (SELECT content_id FROM catalog_duplicates "
+    "WHERE content_id != canonical_id)"
+)
+
+_INSERT_NEIGHBOR = (
+    "INSERT INTO catalog_neighbors (content_id, neighbor_id, score) VALUES (?, ?, ?)"
+)
+
+_CATALOG_COLUMNS = (
+    "id, title, year, content_type, genres, countries, "
+    "imdb_rating, kinopoisk_rating, plot, created_at"
+)
+
+_ID_CHUNK = 500
+
+
+def _row_to_entry(row: Sequence[Any]) -> CatalogEntry:
+    return CatalogEntry(
+        id=row[0],
+        title=row[1],
+        year=row[2],
+        content_type=row[3],
+        genres=json.loads(row[4]),
+        countries=json.loads(row[5]),
+        imdb_rating=row[6],
+        kinopoisk_rating=row[7],
+        plot=row[8],
+        created_at=row[9],
+    )
+
 
 class TursoStorage:
     def __init__(self, cfg: Config | None = None) -> None:
@@ -54,6 +117,10 @@ class TursoStorage:
     def init_schema(self) -> None:
         self._client.execute(_SCHEMA_CATALOG)
         self._client.execute(_SCHEMA_RATINGS)
+        self._client.execute(_SCHEMA_CATALOG_NEIGHBORS)
+        self._client.execute(_INDEX_CATALOG_NEIGHBORS)
+        self._client.execute(_SCHEMA_CATALOG_DUPLICATES)
+        self._client.execute(_INDEX_CATALOG_DUPLICATES)
 
     # ── Ratings ──────────────────────────────────────────────
 
@@ -85,6 +152,20 @@ class TursoStorage:
         result = self._client.execute("SELECT content_id FROM ratings")
         return {row[0] for row in result.rows}
 
+    def iter_rating_pages(self, page_size: int = 1000) -> Iterator[list[Any]]:
+        """Raw rating rows in content_id order, one page per query."""
+        last = -1
+        while True:
+            result = self._client.execute(
+                "SELECT content_id, title, content_type, score, rated_at "
+                "FROM ratings WHERE content_id > ? ORDER BY content_id LIMIT ?",
+                [last, page_size],
+            )
+            if not result.rows:
+                return
+            yield list(result.rows)
+            last = result.rows[-1][0]
+
     def delete_all_ratings(self) -> None:
         self._client.execute("DELETE FROM ratings")
 
@@ -112,25 +193,57 @@ class TursoStorage:
             )
 
     def get_catalog_entries(self) -> list[CatalogEntry]:
-        result = self._client.execute(
-            "SELECT id, title, year, content_type, genres, countries, "
-            "imdb_rating, kinopoisk_rating, plot, created_at FROM catalog"
-        )
-        return [
-            CatalogEntry(
-                id=row[0],
-                title=row[1],
-                year=row[2],
-                content_type=row[3],
-                genres=json.loads(row[4]),
-                countries=json.loads(row[5]),
-                imdb_rating=row[6],
-                kinopoisk_rating=row[7],
-                plot=row[8],
-                created_at=row[9],
+        result = self._client.execute(f"SELECT {_CATALOG_COLUMNS} FROM catalog")  # noqa: S608
+        return [_row_to_entry(row) for row in result.rows]
+
+    def iter_catalog_pages(self, page_size: int = 1000) -> Iterator[list[Any]]:
+        """Raw catalog rows in ID order, one page per query."""
+        last = -1
+        while True:
+            result = self._client.execute(
+                f"SELECT {_CATALOG_COLUMNS} FROM catalog "  # noqa: S608
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                [last, page_size],
             )
-            for row in result.rows
-        ]
+            if not result.rows:
+                return
+            yield list(result.rows)
+            last = result.rows[-1][0]
+
+    def get_catalog_entries_by_ids(self, ids: Iterable[int]) -> list[CatalogEntry]:
+        wanted = list(ids)
+        entries: list[CatalogEntry] = []
+        for start in range(0, len(wanted), _ID_CHUNK):
+            chunk = wanted[start : start + _ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            result = self._client.execute(
+                f"SELECT {_CATALOG_COLUMNS} FROM catalog "  # noqa: S608
+                f"WHERE id IN ({placeholders})",
+                chunk,
+            )
+            entries.extend(_row_to_entry(row) for row in result.rows)
+        return entries
+
+    def get_candidate_ids(
+        self,
+        *,
+        content_type: str | None = None,
+        min_imdb: float | None = None,
+        include_rated: bool = False,
+    ) -> list[int]:
+        conditions = [_NOT_DUPLICATE]
+        params: list[Any] = []
+        if not include_rated:
+            conditions.append("id NOT IN (SELECT content_id FROM ratings)")
+        if content_type is not None:
+            conditions.append("content_type = ?")
+            params.append(content_type)
+        if min_imdb is not None:
+            conditions.append("imdb_rating >= ?")
+            params.append(min_imdb)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        result = self._client.execute(f"SELECT id FROM catalog{where}", params)  # noqa: S608
+        return [row[0] for row in result.rows]
 
     def get_catalog_count(self) -> int:
         result = self._client.execute("SELECT COUNT(*) FROM catalog")
@@ -140,3 +253,116 @@ class TursoStorage:
     def get_existing_catalog_ids(self) -> set[int]:
         result = self._client.execute("SELECT id FROM catalog")
         return {row[0] for row in result.rows}
+
+    def find_catalog_entries(self, title: str, limit: int = 10) -> list[CatalogEntry]:
+        result = self._client.execute(
+            f"SELECT {_CATALOG_COLUMNS} FROM catalog "  # noqa: S608
+            "WHERE title LIKE ? "
+            "ORDER BY title = ? DESC, imdb_rating IS NULL, imdb_rating DESC "
+            "LIMIT ?",
+            [f"%{title}%", title, limit],
+        )
+        return [_row_to_entry(row) for row in result.rows]
+
+    # ── Similar titles ───────────────────────────────────────
+
+    def replace_neighbors(self, neighbors: dict[int, list[tuple[int, float]]]) -> None:
+        items = list(neighbors.items())
+        for start in range(0, len(items), _ID_CHUNK):
+            chunk = items[start : start + _ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            delete_sql = (
+                "DELETE FROM catalog_neighbors "  # noqa: S608
+                f"WHERE content_id IN ({placeholders})"
+            )
+            statements: list[tuple[str, list[Any]]] = [
+                (delete_sql, [content_id for content_id, _ in chunk])
+            ]
+            statements.extend(
+                (_INSERT_NEIGHBOR, [content_id, neighbor_id, score])
+                for content_id, pairs in chunk
+                for neighbor_id, score in pairs
+            )
+            self._client.batch(statements)
+
+    def get_neighbor_floors(self) -> dict[int, tuple[float, int]]:
+        result = self._client.execute(
+            "SELECT content_id, MIN(score), COUNT(*) FROM catalog_neighbors "
+            "GROUP BY content_id"
+        )
+        return {row[0]: (row[1], row[2]) for row in result.rows}
+
+    def get_neighbor_lists(
+        self, ids: Iterable[int]
+    ) -> dict[int, list[tuple[int, float]]]:
+        wanted = list(ids)
+        lists: dict[int, list[tuple[int, float]]] = {}
+        for start in range(0, len(wanted), _ID_CHUNK):
+            chunk = wanted[start : start + _ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            result = self._client.execute(
+                "SELECT content_id, neighbor_id, score FROM catalog_neighbors "  # noqa: S608
+                f"WHERE content_id IN ({placeholders})",
+                chunk,
+            )
+            for content_id, neighbor_id, score in result.rows:
+                lists.setdefault(content_id, []).append((neighbor_id, score))
+        return lists
+
+    def get_neighbor_sources(self, ids: Iterable[int]) -> set[int]:
+        """IDs whose stored neighbour lists mention any of ``ids``."""
+        wanted = list(ids)
+        sources: set[int] = set()
+        for start in range(0, len(wanted), _ID_CHUNK):
+            chunk = wanted[start : start + _ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            result = self._client.execute(
+                "SELECT DISTINCT content_id FROM catalog_neighbors "  # noqa: S608
+                f"WHERE neighbor_id IN ({placeholders})",
+                chunk,
+            )
+            sources.update(row[0] for row in result.rows)
+        return sources
+
+    def get_similar_entries(
+        self, content_id: int, limit: int = 10
+    ) -> list[tuple[CatalogEntry, float]]:
+        columns = ", ".join(f"c.{col.strip()}" for col in _CATALOG_COLUMNS.split(","))
+        result = self._client.execute(
+            f"SELECT {columns}, n.score FROM catalog_neighbors n "  # noqa: S608
+            "JOIN catalog c ON c.id = n.neighbor_id "
+            "WHERE n.content_id = ? ORDER BY n.score DESC LIMIT ?",
+            [content_id, limit],
+        )
+        return [(_row_to_entry(row), row[10]) for row in result.rows]
+
+    # ── Near-duplicates ──────────────────────────────────────
+
+    def get_duplicate_clusters(self, ids: Iterable[int]) -> dict[int, int]:
+        """Member → canonical mapping for every cluster touching ``ids``."""
+        wanted = list(ids)
+        clusters: dict[int, int] = {}
+        for start in range(0, len(wanted), _ID_CHUNK):
+            chunk = wanted[start : start + _ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            result = self._client.execute(
+                "SELECT content_id, canonical_id FROM catalog_duplicates "  # noqa: S608
+                "WHERE canonical_id IN (SELECT canonical_id FROM catalog_duplicates "
+                f"WHERE content_id IN ({placeholders}))",
+                chunk,
+            )
+            clusters.update((row[0], row[1]) for row in result.rows)
+        return clusters
+
+    def get_duplicate_ids(self) -> set[int]:
+        """Cluster members that are not their cluster's canonical entry."""
+        result = self._client.execute(
+            "SELECT content_id FROM catalog_duplicates WHERE content_id != canonical_id"
+        )
+        return {row[0] for row in result.rows}
+
+    def set_canonical_ids(self, canonical: dict[int, int]) -> None:
+        items = list(canonical.items())
+        for start in range(0, len(items), _ID_CHUNK):
+            chunk = items[start : start + _ID_CHUNK]
+            self._client.batch([(_UPSERT_DUPLICATE, list(pair)) for pair in chunk])
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from movie_buddy.embeddings import normalize_rows
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from movie_buddy.embeddings import EmbeddingMatrix
+    from movie_buddy.models import CatalogEntry, Rating
+    from movie_buddy.storage import TursoStorage
+
+_FACETS = ("genres", "countries", "decades")
+
+
+def rating_weight(score: ArrayLike) -> NDArray[np.float64]:
+    """Map 1-10 scores onto [-1, 1] so that low ratings push away from a title."""
+    return (np.asarray(score, dtype=np.float64) - 5.5) / 4.5
+
+
+def decade_of(year: int) -> str:
+    return str(year - year % 10)
+
+
+def facet_values(entry: CatalogEntry, facet: str) -> list[str]:
+    if facet == "decades":
+        return [decade_of(entry.year)] if entry.year else []
+    values: list[str] = getattr(entry, facet)
+    return values
+
+
+class FacetAffinity:
+    """Mean rating weight per facet value (genre, country or decade)."""
+
+    def __init__(
+        self,
+        vocab: Sequence[str] = (),
+        sums: NDArray[np.float64] | None = None,
+        counts: NDArray[np.int64] | None = None,
+    ) -> None:
+        self.index = {v: i for i, v in enumerate(vocab)}
+        self.sums = np.zeros(len(vocab)) if sums is None else sums
+        self.counts = np.zeros(len(vocab), dtype=np.int64) if counts is None else counts
+
+    @property
+    def vocab(self) -> list[str]:
+        return list(self.index)
+
+    def _positions(self, values: Sequence[str]) -> NDArray[np.intp]:
+        for v in values:
+            self.index.setdefault(v, len(self.index))
+        grow = len(self.index) - len(self.sums)
+        if grow:
+            self.sums = np.concatenate([self.sums, np.zeros(grow)])
+            self.counts = np.concatenate([self.counts, np.zeros(grow, dtype=np.int64)])
+        return np.fromiter((self.index[v] for v in values), dtype=np.intp)
+
+    def add_many(
+        self, value_lists: Sequence[Sequence[str]], weights: NDArray[np.float64]
+    ) -> None:
+        flat = [v for values in value_lists for v in values]
+        if not flat:
+            return
+        lengths = np.fromiter((len(v) for v in value_lists), dtype=np.intp)
+        pos = self._positions(flat)
+        np.add.at(self.sums, pos, np.repeat(weights, lengths))
+        np.add.at(self.counts, pos, 1)
+
+    def scores(self) -> NDArray[np.float64]:
+        out = np.zeros_like(self.sums)
+        np.divide(self.sums, self.counts, out=out, where=self.counts > 0)
+        return out
+
+    def as_dict(self) -> dict[str, float]:
+        return dict(zip(self.index, self.scores().tolist(), strict=True))
+
+
+class TasteProfile:
+    """Weighted embedding centroid plus facet affinities built from ratings."""
+
+    def __init__(self) -> None:
+        self.centroid_sum: NDArray[np.float64] = np.zeros(0)
+        self.weight_total = 0.0
+        self.facets = {name: FacetAffinity() for name in _FACETS}
+        self.rated_ids: set[int] = set()
+
+    @classmethod
+    def from_ratings(
+        cls,
+        ratings: Sequence[Rating],
+        entries: dict[int, CatalogEntry],
+        matrix: EmbeddingMatrix | None = None,
+    ) -> TasteProfile:
+        profile = cls()
+        if not ratings:
+            return profile
+        ids = np.fromiter((r.content_id for r in ratings), dtype=np.int64)
+        weights = rating_weight([r.score for r in ratings])
+        profile.rated_ids = set(ids.tolist())
+
+        if matrix is not None and len(matrix):
+            rows, found = matrix.rows_for(ids)
+            profile.centroid_sum = weights[found] @ np.asarray(
+                matrix.vectors[rows], dtype=np.float64
+            )
+            profile.weight_total = float(np.abs(weights[found]).sum())
+
+        known = [i for i, r in enumerate(ratings) if r.content_id in entries]
+        known_entries = [entries[ratings[i].content_id] for i in known]
+        for name, facet in profile.facets.items():
+            facet.add_many(
+                [facet_values(e, name) for e in known_entries], weights[known]
+            )
+        return profile
+
+    def add(
+        self,
+        rating: Rating,
+        entry: CatalogEntry | None = None,
+        vector: ArrayLike | None = None,
+    ) -> bool:
+        """Fold one new rating into the profile; already-rated IDs are ignored."""
+        if rating.content_id in self.rated_ids:
+            return False
+        self.rated_ids.add(rating.content_id)
+        weight = rating_weight(rating.score)
+        if vector is not None:
+            vec = normalize_rows(vector).astype(np.float64)
+            if self.centroid_sum.shape != vec.shape:
+                self.centroid_sum = np.zeros_like(vec)
+                self.weight_total = 0.0
+            self.centroid_sum += weight * vec
+            self.weight_total += float(abs(weight))
+        if entry is not None:
+            for name, facet in self.facets.items():
+                facet.add_many([facet_values(entry, name)], np.atleast_1d(weight))
+        return True
+
+    @property
+    def centroid(self) -> NDArray[np.float32] | None:
+        if self.weight_total == 0 or not self.centroid_sum.any():
+            return None
+        return normalize_rows(self.centroid_sum / self.weight_total)
+
+    def save(self, path: Path) -> None:
+        arrays: dict[str, NDArray[np.generic]] = {
+            "centroid_sum": self.centroid_sum,
+            "weight_total": np.asarray(self.weight_total),
+            "rated_ids": np.fromiter(sorted(self.rated_ids), dtype=np.int64),
+        }
+        for name, facet in self.facets.items():
+            arrays[f"{name}_vocab"] = np.asarray(facet.vocab, dtype=str)
+            arrays[f"{name}_sums"] = facet.sums
+            arrays[f"{name}_counts"] = facet.counts
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, allow_pickle=False, **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> TasteProfile | None:
+        if not path.exists():
+            return None
+        profile = cls()
+        with np.load(path) as data:
+            profile.centroid_sum = data["centroid_sum"]
+            profile.weight_total = float(data["weight_total"])
+            profile.rated_ids = set(data["rated_ids"].tolist())
+            for name in _FACETS:
+                profile.facets[name] = FacetAffinity(
+                    data[f"{name}_vocab"].tolist(),
+                    data[f"{name}_sums"],
+                    data[f"{name}_counts"],
+                )
+        return profile
+
+
+def load_taste_profile(
+    storage: TursoStorage,
+    path: Path,
+    matrix: EmbeddingMatrix | None = None,
+    rated_ids: set[int] | None = None,
+) -> TasteProfile:
+    """Load the saved profile, rebuilding it if ratings changed elsewhere."""
+    if rated_ids is None:
+        rated_ids = storage.get_rated_content_ids()
+    profile = TasteProfile.load(path)
+    if profile is not None and profile.rated_ids == rated_ids:
+        return profile
+    ratings = storage.get_all_ratings()
+    entries = storage.get_catalog_entries_by_ids([r.content_id for r in ratings])
+    profile = TasteProfile.from_ratings(ratings, {e.id: e for e in entries}, matrix)
+    profile.save(path)
+    return profile
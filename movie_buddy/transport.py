@@ -0,0 +1,71 @@
+"""One pooled HTTP transport for auth, API and catalog requests.
+
+Every ``httpx.Client`` built here sends through the same transport, so
+token calls, API reads and catalog crawls reuse kept-alive connections
+(and with HTTP/2, one multiplexed connection) instead of each paying for a
+new TLS handshake. Clients differ only in base URL, headers and timeouts.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from movie_buddy.config import config as default_config
+from movie_buddy.models import KinoPubError
+
+if TYPE_CHECKING:
+    from movie_buddy.config import Config
+
+_transports: dict[tuple[bool, int, int, float], httpx.HTTPTransport] = {}
+
+
+def shared_transport(cfg: Config | None = None) -> httpx.HTTPTransport:
+    """The process-wide transport for these pool settings."""
+    c = cfg or default_config
+    key = (
+        c.http2,
+        c.http_max_connections,
+        c.http_max_keepalive,
+        c.http_keepalive_expiry,
+    )
+    transport = _transports.get(key)
+    if transport is None:
+        if c.http2 and importlib.util.find_spec("h2") is None:
+            msg = "HTTP/2 needs the h2 package. Run: pip install 'movie-buddy[http2]'"
+            raise KinoPubError(msg)
+        transport = httpx.HTTPTransport(
+            http2=c.http2,
+            limits=httpx.Limits(
+                max_connections=c.http_max_connections,
+                max_keepalive_connections=c.http_max_keepalive,
+                keepalive_expiry=c.http_keepalive_expiry,
+            ),
+        )
+        _transports[key] = transport
+    return transport
+
+
+def timeout(endpoint: str, cfg: Config | None = None) -> httpx.Timeout:
+    c = cfg or default_config
+    read = {
+        "auth": c.auth_timeout,
+        "api": c.api_timeout,
+        "catalog": c.catalog_timeout,
+    }[endpoint]
+    return httpx.Timeout(read, connect=c.connect_timeout)
+
+
+def http_client(
+    endpoint: str, cfg: Config | None = None, **kwargs: Any
+) -> httpx.Client:
+    """A client on the shared transport with ``endpoint``'s default timeout.
+
+    Never close these: closing a client closes the shared transport.
+    """
+    c = cfg or default_config
+    return httpx.Client(
+        transport=shared_transport(c), timeout=timeout(endpoint, c), **kwargs
+    )
@@ -0,0 +1,35 @@
+import dataclasses
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from movie_buddy.config import config
+from movie_buddy.models import CatalogEntry
+
+
+def make_entry(entry_id: int, **overrides: Any) -> CatalogEntry:
+    """A catalog entry with neutral defaults; keyword arguments override fields."""
+    fields: dict[str, Any] = {
+        "title": f"Title {entry_id}",
+        "year": 2010,
+        "content_type": "movie",
+        "genres": [],
+        "countries": [],
+        "imdb_rating": 7.0,
+        "kinopoisk_rating": None,
+        "plot": "",
+        "created_at": "2026-01-01",
+    }
+    return CatalogEntry(id=entry_id, **{**fields, **overrides})
+
+
+@pytest.fixture(autouse=True)
+def _isolated_config_dir(tmp_path: Path):
+    """Keep CLI side files (embeddings, profiles, caches) out of the real home."""
+    cfg = dataclasses.replace(
+        config, config_dir=tmp_path / "config", openai_api_key=None
+    )
+    with patch("movie_buddy.cli.config", cfg):
+        yield
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from movie_buddy.ann import IVFIndex
+from movie_buddy.embeddings import EmbeddingMatrix
+
+
+def _clustered_matrix(n: int = 5000, dim: int = 32, seed: int = 0) -> EmbeddingMatrix:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((60, dim))
+    labels = rng.integers(0, len(centers), n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dim))
+    return EmbeddingMatrix.from_vectors(range(n), vectors)
+
+
+def _recall(index: IVFIndex, matrix: EmbeddingMatrix, queries: np.ndarray) -> float:
+    hits = 0
+    for q in queries:
+        exact = {i for i, _ in matrix.top_k(q, k=10)}
+        approx = {i for i, _ in index.search(q, k=10)}
+        hits += len(exact & approx)
+    return hits / (10 * len(queries))
+
+
+@pytest.fixture(scope="module")
+def matrix() -> EmbeddingMatrix:
+    return _clustered_matrix()
+
+
+@pytest.fixture(scope="module")
+def index(matrix: EmbeddingMatrix) -> IVFIndex:
+    return IVFIndex.build(matrix)
+
+
+class TestIVFIndex:
+    def test_build_assigns_every_row(
+        self, index: IVFIndex, matrix: EmbeddingMatrix
+    ) -> None:
+        assert len(index) == len(matrix)
+        assert index.nlist == round(len(matrix) ** 0.5)
+        assert index.offsets[-1] == len(matrix)
+        assert np.all(np.diff(index.lists) >= 0)
+
+    def test_recall_against_brute_force(
+        self, index: IVFIndex, matrix: EmbeddingMatrix
+    ) -> None:
+        queries = np.random.default_rng(1).standard_normal((50, 32))
+        queries = matrix.vectors[:50] + 0.3 * queries
+        assert _recall(index, matrix, queries) >= 0.9
+
+    def test_probing_all_lists_is_exact(
+        self, index: IVFIndex, matrix: EmbeddingMatrix
+    ) -> None:
+        query = np.random.default_rng(2).standard_normal(32)
+        exact = matrix.top_k(query, k=10)
+        approx = index.search(query, k=10, nprobe=index.nlist)
+        assert [i for i, _ in approx] == [i for i, _ in exact]
+
+    def test_search_batch(self, index: IVFIndex, matrix: EmbeddingMatrix) -> None:
+        results = index.search_batch(matrix.vectors[:3], k=1, nprobe=index.nlist)
+        assert [r[0][0] for r in results] == matrix.ids[:3].tolist()
+
+    def test_incremental_insert_is_searchable(self, index: IVFIndex) -> None:
+        vector = np.random.default_rng(3).standard_normal(32)
+        updated = index.add([999_999], [vector])
+        assert len(updated) == len(index) + 1
+        assert updated.search(vector, k=1)[0][0] == 999_999
+        np.testing.assert_array_equal(updated.centroids, index.centroids)
+
+    def test_insert_replaces_existing_id(self, index: IVFIndex) -> None:
+        vector = np.random.default_rng(4).standard_normal(32)
+        updated = index.add([0], [vector])
+        assert len(updated) == len(index)
+        assert updated.search(vector, k=1)[0] == (0, pytest.approx(1.0))
+
+    def test_save_and_load_memory_maps(self, index: IVFIndex, tmp_path: Path) -> None:
+        index.save(tmp_path / "ann")
+        loaded = IVFIndex.load(tmp_path / "ann")
+        assert loaded is not None
+        assert isinstance(loaded.vectors, np.memmap)
+        query = np.ones(32)
+        assert loaded.search(query) == index.search(query)
+
+    def test_load_missing_returns_none(self, tmp_path: Path) -> None:
+        assert IVFIndex.load(tmp_path / "ann") is None
@@ -1,4 +1,5 @@
 import json
+import time
 from pathlib import Path
 from unittest.mock import patch
 
@@ -7,10 +8,16 @@ import pytest
 from pytest_httpx import HTTPXMock
 
 from movie_buddy.api import KinoPubClient
+from movie_buddy.auth import KinoPubAuth
 from movie_buddy.config import config
-from movie_buddy.models import NetworkError, RateLimitError, Token
+from movie_buddy.models import AuthError, NetworkError, RateLimitError, Token
 
 FIXTURES = Path(__file__).parent / "fixtures"
+_REFRESHED = {
+    "access_token": "fresh_token",
+    "refresh_token": "fresh_rt",
+    "expires_in": 86400,
+}
 
 
 @pytest.fixture
@@ -170,13 +177,69 @@ class TestNetworkErrorHandling:
     def test_401_raises_auth_error(
         self, client: KinoPubClient, httpx_mock: HTTPXMock
     ) -> None:
-        from movie_buddy.models import AuthError
-
         httpx_mock.add_response(status_code=401)
         with pytest.raises(AuthError, match="expired|auth"):
             client.search("test")
 
 
+class TestReauthentication:
+    def _auth(self, tmp_path: Path, token: Token) -> KinoPubAuth:
+        auth = KinoPubAuth(token_path=tmp_path / "token.bin")
+        auth.save_token(token)
+        return auth
+
+    def test_401_refreshes_and_retries_once(
+        self, tmp_path: Path, token: Token, httpx_mock: HTTPXMock
+    ) -> None:
+        auth = self._auth(tmp_path, token)
+        client = KinoPubClient(token, auth=auth)
+        httpx_mock.add_response(url=config.token_refresh_url, json=_REFRESHED)
+        httpx_mock.add_response(status_code=401)
+        httpx_mock.add_response(json={"items": []})
+        assert client.search("test") == []
+        retried = httpx_mock.get_requests()[-1]
+        assert retried.headers["Authorization"] == "Bearer fresh_token"
+        saved = auth.load_token()
+        assert saved is not None
+        assert saved.access_token == "fresh_token"
+
+    def test_401_uses_token_saved_by_another_process(
+        self, tmp_path: Path, token: Token, httpx_mock: HTTPXMock
+    ) -> None:
+        newer = Token("newer_token", "rt2", expires_at=9999999999.0)
+        auth = self._auth(tmp_path, newer)
+        client = KinoPubClient(token, auth=auth)
+        httpx_mock.add_response(status_code=401)
+        httpx_mock.add_response(json={"items": []})
+        assert client.search("test") == []
+        assert httpx_mock.get_requests()[-1].headers["Authorization"] == (
+            "Bearer newer_token"
+        )
+
+    def test_second_401_raises_auth_error(
+        self, tmp_path: Path, token: Token, httpx_mock: HTTPXMock
+    ) -> None:
+        client = KinoPubClient(token, auth=self._auth(tmp_path, token))
+        httpx_mock.add_response(url=config.token_refresh_url, json=_REFRESHED)
+        httpx_mock.add_response(status_code=401)
+        httpx_mock.add_response(status_code=401)
+        with pytest.raises(AuthError):
+            client.search("test")
+
+    def test_refresh_if_due_renews_near_expiry(
+        self, tmp_path: Path, httpx_mock: HTTPXMock
+    ) -> None:
+        soon = Token("old", "rt", expires_at=time.time() + 60)
+        client = KinoPubClient(soon, auth=self._auth(tmp_path, soon))
+        httpx_mock.add_response(url=config.token_refresh_url, json=_REFRESHED)
+        client.refresh_if_due()
+        httpx_mock.add_response(json={"items": []})
+        client.search("test")
+        assert httpx_mock.get_requests()[-1].headers["Authorization"] == (
+            "Bearer fresh_token"
+        )
+
+
 class TestCategoryItems:
     def test_get_category_items_returns_catalog_entries(
         self, client: KinoPubClient, httpx_mock: HTTPXMock
@@ -1,10 +1,13 @@
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from pytest_httpx import HTTPXMock
 
-from movie_buddy.auth import KinoPubAuth
+from movie_buddy.auth import KinoPubAuth, TokenProvider, token_provider
 from movie_buddy.config import config
 from movie_buddy.models import AuthError, AuthTimeoutError, DeviceCode, Token
 
@@ -150,3 +153,118 @@ class TestTokenRefresh:
     def test_ensure_valid_token_raises_when_no_token(self, auth: KinoPubAuth) -> None:
         with pytest.raises(AuthError):
             auth.ensure_valid_token()
+
+
+class TestBackgroundRenewal:
+    def test_token_near_expiry_is_returned_and_renewed(
+        self, auth: KinoPubAuth, httpx_mock: HTTPXMock
+    ) -> None:
+        soon = Token("soon", "rt", expires_at=time.time() + 60)
+        auth.save_token(soon)
+        httpx_mock.add_response(
+            url=config.token_refresh_url,
+            method="POST",
+            json={"access_token": "next", "refresh_token": "rt2", "expires_in": 86400},
+        )
+        assert auth.ensure_valid_token().access_token == "soon"
+        assert auth._renewing is not None
+        auth._renewing.join()
+        saved = auth.load_token()
+        assert saved is not None
+        assert saved.access_token == "next"
+
+    def test_failed_background_renewal_keeps_token(
+        self, auth: KinoPubAuth, httpx_mock: HTTPXMock
+    ) -> None:
+        soon = Token("soon", "rt", expires_at=time.time() + 60)
+        auth.save_token(soon)
+        httpx_mock.add_response(url=config.token_refresh_url, status_code=400)
+        assert auth.ensure_valid_token().access_token == "soon"
+        assert auth._renewing is not None
+        auth._renewing.join()
+        saved = auth.load_token()
+        assert saved is not None
+        assert saved.access_token == "soon"
+
+    def test_fresh_token_is_not_renewed(self, auth: KinoPubAuth) -> None:
+        auth.save_token(Token("fresh", "rt", expires_at=time.time() + 86400))
+        assert auth.ensure_valid_token().access_token == "fresh"
+        assert auth._renewing is None
+
+
+class TestSingleFlightRefresh:
+    def test_concurrent_renewals_refresh_once(self, tmp_token_path: Path) -> None:
+        expired = Token("old", "rt", expires_at=time.time() - 10)
+        KinoPubAuth(token_path=tmp_token_path).save_token(expired)
+        calls: list[str] = []
+
+        def slow_refresh(self: KinoPubAuth, token: Token) -> Token:
+            calls.append(token.refresh_token)
+            time.sleep(0.2)
+            return Token("new", "rt2", expires_at=time.time() + 86400)
+
+        # Separate instances open the lock file separately, like processes do
+        renewers = [KinoPubAuth(token_path=tmp_token_path) for _ in range(4)]
+        with (
+            patch.object(KinoPubAuth, "refresh_token", slow_refresh),
+            ThreadPoolExecutor(max_workers=4) as pool,
+        ):
+            tokens = list(pool.map(lambda a: a.ensure_valid_token(), renewers))
+        assert calls == ["rt"]
+        assert {t.access_token for t in tokens} == {"new"}
+
+    def test_save_replaces_file_atomically(
+        self, auth: KinoPubAuth, tmp_token_path: Path
+    ) -> None:
+        auth.save_token(Token("first", "rt", expires_at=time.time() + 3600))
+        with (
+            patch.object(Path, "replace", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            auth.save_token(Token("second", "rt", expires_at=time.time() + 3600))
+        loaded = auth.load_token()
+        assert loaded is not None
+        assert loaded.access_token == "first"
+        assert tmp_token_path.with_name("token.bin.lock").exists()
+
+
+class TestTokenProvider:
+    def test_instances_share_one_memoized_read(self, tmp_token_path: Path) -> None:
+        KinoPubAuth(token_path=tmp_token_path).save_token(
+            Token("at", "rt", expires_at=time.time() + 3600)
+        )
+        with patch.object(TokenProvider, "_read", autospec=True) as read:
+            read.return_value = Token("at", "rt", expires_at=time.time() + 3600)
+            for _ in range(5):
+                assert KinoPubAuth(token_path=tmp_token_path).load_token() is not None
+        assert read.call_count == 1
+        assert token_provider(tmp_token_path) is token_provider(tmp_token_path)
+
+    def test_rereads_after_file_changes(
+        self, auth: KinoPubAuth, tmp_token_path: Path
+    ) -> None:
+        auth.save_token(Token("first", "rt", expires_at=time.time() + 3600))
+        assert auth.load_token() is not None
+        other = KinoPubAuth(token_path=tmp_token_path)
+        other.save_token(Token("second", "rt", expires_at=time.time() + 3600))
+        loaded = auth.load_token()
+        assert loaded is not None
+        assert loaded.access_token == "second"
+
+    def test_removed_file_means_no_token(
+        self, auth: KinoPubAuth, tmp_token_path: Path
+    ) -> None:
+        auth.save_token(Token("at", "rt", expires_at=time.time() + 3600))
+        assert auth.load_token() is not None
+        tmp_token_path.unlink()
+        assert auth.load_token() is None
+
+    def test_async_access(self, auth: KinoPubAuth, tmp_token_path: Path) -> None:
+        auth.save_token(Token("at", "rt", expires_at=time.time() + 86400))
+        provider = token_provider(tmp_token_path)
+        loaded = asyncio.run(provider.aget())
+        assert loaded is not None
+        assert loaded.access_token == "at"
+        with patch.object(Path, "stat", side_effect=AssertionError("no disk")):
+            token = asyncio.run(auth.aensure_valid_token())
+        assert token.access_token == "at"
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from movie_buddy.candidates import (
+    SHORTLIST_SIZE,
+    BM25Index,
+    CandidateGenerator,
+    tokenize,
+)
+from movie_buddy.embeddings import EmbeddingMatrix
+from movie_buddy.models import CatalogEntry, Rating
+from movie_buddy.taste import TasteProfile
+from tests.conftest import make_entry
+
+
+def _rating(content_id: int, score: int) -> Rating:
+    return Rating(
+        content_id=content_id,
+        title=str(content_id),
+        content_type="movie",
+        score=score,
+        rated_at="2026-01-01",
+    )
+
+
+@pytest.fixture
+def entries() -> list[CatalogEntry]:
+    return [
+        make_entry(
+            1,
+            title="Space Odyssey",
+            plot="astronauts drift through space",
+            genres=["Sci-Fi"],
+        ),
+        make_entry(
+            2,
+            title="Kitchen Nightmares",
+            plot="a chef fixes restaurants",
+            genres=["Reality"],
+        ),
+        make_entry(
+            3, title="Laugh Factory", plot="stand-up comedy night", genres=["Comedy"]
+        ),
+        make_entry(
+            4,
+            title="Moon Base",
+            plot="a lonely space station on the moon",
+            genres=["Sci-Fi"],
+        ),
+    ]
+
+
+class TestTokenize:
+    def test_casefolds_and_splits_unicode_words(self) -> None:
+        assert tokenize("Матрица / The MATRIX!") == ["матрица", "the", "matrix"]
+
+
+class TestBM25Index:
+    def test_matching_document_scores_highest(self) -> None:
+        index = BM25Index(["a dog barks", "space ship in space", "a cat sleeps"])
+        scores = index.scores("space")
+        assert scores.argmax() == 1
+        assert scores[0] == scores[2] == 0
+
+    def test_rare_terms_weigh_more(self) -> None:
+        index = BM25Index(["common rare", "common", "common", "common"])
+        scores = index.scores("common rare")
+        assert scores[0] > scores[1] > 0
+
+    def test_unknown_query_scores_zero(self) -> None:
+        index = BM25Index(["hello world"])
+        assert not index.scores("nothing matches").any()
+
+
+class TestCandidateGenerator:
+    def test_text_relevance_ranks_first(self, entries: list[CatalogEntry]) -> None:
+        generator = CandidateGenerator(entries)
+        result = generator.generate("space", limit=2)
+        assert {e.id for e in result} == {1, 4}
+
+    def test_allowed_ids_filter(self, entries: list[CatalogEntry]) -> None:
+        generator = CandidateGenerator(entries)
+        result = generator.generate("space", allowed_ids={2, 3, 4})
+        assert result[0].id == 4
+        assert 1 not in {e.id for e in result}
+
+    def test_empty_allowed_ids_returns_nothing(
+        self, entries: list[CatalogEntry]
+    ) -> None:
+        assert CandidateGenerator(entries).generate("space", allowed_ids=[]) == []
+
+    def test_query_vector_adds_semantic_match(
+        self, entries: list[CatalogEntry]
+    ) -> None:
+        matrix = EmbeddingMatrix.from_vectors([1, 2, 3, 4], np.eye(4))
+        generator = CandidateGenerator(entries, matrix)
+        result = generator.generate("something", query_vector=[0, 0, 1, 0], limit=1)
+        assert result[0].id == 3
+
+    def test_taste_profile_breaks_ties(self, entries: list[CatalogEntry]) -> None:
+        by_id = {e.id: e for e in entries}
+        profile = TasteProfile.from_ratings([_rating(3, 10), _rating(1, 1)], by_id)
+        generator = CandidateGenerator(entries, profile=profile)
+        result = generator.generate("", allowed_ids={1, 2, 3, 4})
+        assert [e.id for e in result[:2]] == [3, 2]
+        assert {e.id for e in result[2:]} == {1, 4}
+
+    def test_shortlist_size_is_constant_as_catalog_grows(self) -> None:
+        big = [make_entry(i, plot=f"plot about space number {i}") for i in range(2000)]
+        result = CandidateGenerator(big).generate("space plot")
+        assert len(result) == SHORTLIST_SIZE
+
+    def test_ann_index_serves_semantic_candidates(
+        self, entries: list[CatalogEntry]
+    ) -> None:
+        from unittest.mock import MagicMock
+
+        from movie_buddy.ann import IVFIndex
+
+        matrix = EmbeddingMatrix.from_vectors([1, 2, 3, 4], np.eye(4))
+        index = MagicMock(wraps=IVFIndex.build(matrix, nlist=2))
+        generator = CandidateGenerator(entries, matrix, ann=index)
+        result = generator.generate("something", query_vector=[0, 0, 1, 0], limit=1)
+        index.search.assert_called_once()
+        assert result[0].id == 3
@@ -1,6 +1,10 @@
+import os
 import random
+import subprocess
+import sys
 from unittest.mock import MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
 from movie_buddy.cli import app
@@ -226,6 +230,68 @@ class TestCLIErrorDisplay:
         url = mock_open.call_args[0][0]
         assert "s1e1" in url
 
+    def test_repeat_watch_reuses_cached_episodes(self) -> None:
+        content = self._serial()
+        mock_client = MagicMock()
+        mock_client.get_item.return_value = content
+        with patch("movie_buddy.cli.open_in_chrome") as mock_open:
+            from movie_buddy.cli import _open_content
+
+            _open_content(mock_client, content)
+            _open_content(mock_client, content)
+
+        mock_client.get_item.assert_called_once_with(300)
+        assert mock_open.call_count == 2
+
+    def test_favored_season_biases_pick(self) -> None:
+        content = self._serial()
+        mock_client = MagicMock()
+        mock_client.get_item.return_value = content
+        with (
+            patch("movie_buddy.cli.open_in_chrome") as mock_open,
+            patch("movie_buddy.cli._FAVORED_SEASON_WEIGHT", 1e9),
+        ):
+            from movie_buddy.cli import _open_content
+
+            for _ in range(4):
+                _open_content(mock_client, content, favor_seasons=[2])
+
+        urls = [c[0][0] for c in mock_open.call_args_list]
+        assert sorted(url[-4:] for url in urls[:2]) == ["s2e1", "s2e2"]
+        assert sorted(url[-4:] for url in urls[2:]) == ["s1e1", "s1e2"]
+
+    def test_episodes_do_not_repeat_until_exhausted(self) -> None:
+        content = self._serial()
+        mock_client = MagicMock()
+        mock_client.get_item.return_value = content
+        with patch("movie_buddy.cli.open_in_chrome") as mock_open:
+            from movie_buddy.cli import _open_content
+
+            for _ in range(6):
+                _open_content(mock_client, content)
+
+        urls = [c[0][0] for c in mock_open.call_args_list]
+        assert len(set(urls[:4])) == 4
+        assert len(set(urls[4:])) == 2
+
+    def _serial(self) -> Content:
+        return Content(
+            id=300,
+            title="Two Seasons",
+            content_type="serial",
+            year=2020,
+            seasons=[
+                Season(
+                    number=s,
+                    episodes=[
+                        Episode(id=s * 10 + e, number=e, title="", season_number=s)
+                        for e in (1, 2)
+                    ],
+                )
+                for s in (1, 2)
+            ],
+        )
+
 
 def _watching_items() -> list[WatchingItem]:
     return [
@@ -384,6 +450,31 @@ class TestRateCommand:
         assert result.exit_code == 0
         assert "rated" in result.output.lower()
 
+    def test_rating_updates_taste_profile(self) -> None:
+        import numpy as np
+
+        from movie_buddy.cli import config as cli_config
+        from movie_buddy.embeddings import EmbeddingMatrix
+        from movie_buddy.taste import TasteProfile
+
+        # Loaded back memory-mapped, as after `movie-buddy catalog`
+        EmbeddingMatrix.from_vectors([1, 2], np.eye(2, 4)).save(cli_config)
+        runner = CliRunner()
+        items = [
+            WatchingItem(
+                id=1, title="Friends", content_type="serial", total=10, watched=5
+            )
+        ]
+        with _patch_rate_deps(watching=items) as (_client, store):
+            store.get_catalog_entries_by_ids.return_value = []
+            result = runner.invoke(app, ["rate"], input="9\n")
+        assert result.exit_code == 0
+        profile = TasteProfile.load(cli_config.taste_profile_file)
+        assert profile is not None
+        assert profile.rated_ids == {1}
+        assert profile.centroid is not None
+        np.testing.assert_allclose(profile.centroid, [1.0, 0.0, 0.0, 0.0])
+
 
 class TestRateErrorHandling:
     def test_missing_turso_config_shows_message(self) -> None:
@@ -533,3 +624,628 @@ class TestCatalogCommand:
             result = runner.invoke(app, ["catalog"])
         assert result.exit_code == 1
         assert "network" in result.output.lower() or "unable" in result.output.lower()
+
+
+class TestCatalogEmbeddings:
+    def test_new_entries_are_embedded_when_openai_configured(self, tmp_path) -> None:
+        import dataclasses
+
+        import numpy as np
+
+        from movie_buddy.embeddings import EmbeddingMatrix
+
+        cfg = dataclasses.replace(config, config_dir=tmp_path, openai_api_key="k")
+        entries = _mock_catalog_entries()
+        storage = _mock_storage()
+        storage.get_existing_catalog_ids.return_value = set()
+        runner = CliRunner()
+        with (
+            _patch_catalog_deps(category_items=entries, storage=storage),
+            patch("movie_buddy.cli.config", cfg),
+            patch("movie_buddy.cli.OpenAIEmbedder") as mock_embedder_cls,
+        ):
+            embedder = mock_embedder_cls.return_value
+            embedder.model = "test-model"
+            embedder.embed.side_effect = lambda texts: np.ones(
+                (len(texts), 4), dtype=np.float32
+            )
+            result = runner.invoke(app, ["catalog"])
+
+        assert result.exit_code == 0
+        assert "Embedded 2 new plots" in result.output
+        matrix = EmbeddingMatrix.load(cfg)
+        assert matrix is not None
+        assert sorted(matrix.ids.tolist()) == [501, 502]
+
+    def test_existing_ann_index_receives_new_rows(self, tmp_path) -> None:
+        import dataclasses
+
+        import numpy as np
+
+        from movie_buddy.ann import IVFIndex
+        from movie_buddy.embeddings import EmbeddingMatrix
+
+        cfg = dataclasses.replace(config, config_dir=tmp_path, openai_api_key="k")
+        seed = EmbeddingMatrix.from_vectors([1, 2], np.eye(2, 4))
+        seed.save(cfg)
+        IVFIndex.build(seed, nlist=2).save(cfg.ann_index_dir)
+        storage = _mock_storage()
+        storage.get_existing_catalog_ids.return_value = {1, 2}
+        runner = CliRunner()
+        with (
+            _patch_catalog_deps(
+                category_items=_mock_catalog_entries(), storage=storage
+            ),
+            patch("movie_buddy.cli.config", cfg),
+            patch("movie_buddy.cli.OpenAIEmbedder") as mock_embedder_cls,
+        ):
+            embedder = mock_embedder_cls.return_value
+            embedder.model = "test-model"
+            embedder.embed.side_effect = lambda texts: np.ones(
+                (len(texts), 4), dtype=np.float32
+            )
+            result = runner.invoke(app, ["catalog"])
+
+        assert result.exit_code == 0
+        index = IVFIndex.load(cfg.ann_index_dir)
+        assert index is not None
+        assert sorted(index.ids.tolist()) == [1, 2, 501, 502]
+
+    def test_ann_index_is_used_only_past_min_rows(self, tmp_path) -> None:
+        import dataclasses
+
+        import numpy as np
+
+        from movie_buddy.ann import IVFIndex
+        from movie_buddy.cli import _load_ann_index
+        from movie_buddy.embeddings import EmbeddingMatrix
+
+        cfg = dataclasses.replace(config, config_dir=tmp_path)
+        matrix = EmbeddingMatrix.from_vectors([1, 2, 3], np.eye(3, 4))
+        IVFIndex.build(matrix, nlist=2).save(cfg.ann_index_dir)
+        with patch("movie_buddy.cli.config", cfg):
+            with patch("movie_buddy.ann.ANN_MIN_ROWS", 4):
+                assert _load_ann_index(matrix) is None
+            with patch("movie_buddy.ann.ANN_MIN_ROWS", 3):
+                index = _load_ann_index(matrix)
+        assert index is not None
+        assert sorted(index.ids.tolist()) == [1, 2, 3]
+        assert _load_ann_index(None) is None
+
+    def test_skips_embeddings_without_openai_key(self, tmp_path) -> None:
+        import dataclasses
+
+        cfg = dataclasses.replace(config, config_dir=tmp_path, openai_api_key=None)
+        runner = CliRunner()
+        with (
+            _patch_catalog_deps(category_items=_mock_catalog_entries()),
+            patch("movie_buddy.cli.config", cfg),
+            patch("movie_buddy.cli.OpenAIEmbedder") as mock_embedder_cls,
+        ):
+            result = runner.invoke(app, ["catalog"])
+
+        assert result.exit_code == 0
+        mock_embedder_cls.assert_not_called()
+
+
+def _mock_ratings(count: int) -> list[Rating]:
+    return [
+        Rating(
+            content_id=900 + i,
+            title=f"Rated {i}",
+            content_type="movie",
+            score=8,
+            rated_at="2026-01-01",
+        )
+        for i in range(count)
+    ]
+
+
+def _mock_recommendations():
+    from movie_buddy.models import Recommendation
+
+    return [
+        Recommendation(
+            content_id=501,
+            title="Movie A",
+            year=2026,
+            content_type="movie",
+            explanation="A slow-burning drama.",
+        ),
+        Recommendation(
+            content_id=502,
+            title="Movie B",
+            year=2025,
+            content_type="movie",
+            explanation="A light comedy.",
+        ),
+    ]
+
+
+def _patch_recommend_deps(
+    ratings: list[Rating] | None = None,
+    entries: list | None = None,
+    recommendations: list | None = None,
+):
+    import contextlib
+
+    @contextlib.contextmanager
+    def _ctx():
+        with (
+            patch("movie_buddy.cli.KinoPubAuth") as mock_auth_cls,
+            patch("movie_buddy.cli.KinoPubClient"),
+            patch("movie_buddy.cli.TursoStorage") as mock_storage_cls,
+            patch("movie_buddy.cli.MovieRecommender") as mock_recommender_cls,
+        ):
+            mock_auth_cls.return_value.ensure_valid_token.return_value = MagicMock()
+            store = _mock_storage()
+            store.get_all_ratings.return_value = (
+                ratings if ratings is not None else _mock_ratings(5)
+            )
+            catalog = entries if entries is not None else _mock_catalog_entries()
+            store.get_catalog_entries.return_value = catalog
+            store.get_catalog_count.return_value = len(catalog)
+            store.get_catalog_entries_by_ids.side_effect = lambda ids: [
+                e for e in catalog if e.id in set(ids)
+            ]
+            store.get_candidate_ids.return_value = [e.id for e in catalog]
+            mock_storage_cls.return_value = store
+            recommender = mock_recommender_cls.return_value
+            recommender.stream_recommendations.return_value = (
+                recommendations
+                if recommendations is not None
+                else _mock_recommendations()
+            )
+            yield store, recommender
+
+    return _ctx()
+
+
+class TestRecommendCommand:
+    def test_requires_minimum_ratings(self) -> None:
+        runner = CliRunner()
+        with _patch_recommend_deps(ratings=_mock_ratings(4)) as (_store, rec):
+            result = runner.invoke(app, ["recommend", "something fun"])
+        assert result.exit_code == 1
+        assert "at least 5 ratings" in result.output
+        rec.stream_recommendations.assert_not_called()
+
+    def test_empty_catalog_shows_message(self) -> None:
+        runner = CliRunner()
+        with _patch_recommend_deps(entries=[]) as (_store, _rec):
+            result = runner.invoke(app, ["recommend", "something fun"])
+        assert result.exit_code == 1
+        assert "Catalog is empty" in result.output
+
+    def test_shows_recommendation_panels(self) -> None:
+        runner = CliRunner()
+        with _patch_recommend_deps() as (_store, rec):
+            result = runner.invoke(app, ["recommend", "something fun"], input="\n")
+        assert result.exit_code == 0
+        assert "Movie A" in result.output
+        assert "A light comedy." in result.output
+        ratings, candidates, description, _ = rec.stream_recommendations.call_args[0]
+        assert len(ratings) == 5
+        assert {c.id for c in candidates} == {501, 502}
+        assert description == "something fun"
+
+    def test_filters_are_passed_to_storage(self) -> None:
+        runner = CliRunner()
+        with _patch_recommend_deps() as (store, _rec):
+            runner.invoke(
+                app,
+                ["recommend", "x", "--type", "movie", "--min-imdb", "7"],
+                input="\n",
+            )
+        store.get_candidate_ids.assert_called_once_with(
+            content_type="movie", min_imdb=7.0
+        )
+
+    def test_picking_number_opens_in_chrome(self) -> None:
+        runner = CliRunner()
+        with (
+            _patch_recommend_deps() as (_store, _rec),
+            patch("movie_buddy.cli.open_in_chrome") as mock_open,
+        ):
+            result = runner.invoke(app, ["recommend", "something fun"], input="2\n")
+        assert result.exit_code == 0
+        mock_open.assert_called_once()
+        assert "/item/view/502" in mock_open.call_args[0][0]
+
+    def test_llm_error_shows_message(self) -> None:
+        from movie_buddy.models import LLMError
+
+        runner = CliRunner()
+        with _patch_recommend_deps() as (_store, rec):
+            rec.stream_recommendations.side_effect = LLMError("OPENAI_API_KEY not set.")
+            result = runner.invoke(app, ["recommend", "something fun"])
+        assert result.exit_code == 1
+        assert "OPENAI_API_KEY" in result.output
+
+
+class TestRecommendBatch:
+    def test_writes_jsonl_and_dedupes_queries(self, tmp_path) -> None:
+        import json
+
+        queries = tmp_path / "queries.txt"
+        queries.write_text(
+            "# weekly digest\nsomething fun\n\nSomething  FUN\na dark drama\n"
+        )
+        out = tmp_path / "results.jsonl"
+        runner = CliRunner()
+        with _patch_recommend_deps() as (_store, rec):
+            rec.get_recommendations.return_value = _mock_recommendations()
+            result = runner.invoke(
+                app, ["recommend", "--batch", str(queries), "--out", str(out)]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert rec.get_recommendations.call_count == 2
+        records = [json.loads(line) for line in out.read_text().splitlines()]
+        assert sorted(r["query"] for r in records) == [
+            "Something  FUN",
+            "a dark drama",
+            "something fun",
+        ]
+        assert records[0]["recommendations"][0]["title"] == "Movie A"
+
+    def test_failed_query_is_recorded(self, tmp_path) -> None:
+        import json
+
+        from movie_buddy.models import LLMError
+
+        queries = tmp_path / "queries.txt"
+        queries.write_text("one\ntwo\n")
+        out = tmp_path / "results.jsonl"
+
+        def _recommend(ratings, candidates, description, rated_entries):
+            if description == "two":
+                msg = "rate limited"
+                raise LLMError(msg)
+            return _mock_recommendations()
+
+        runner = CliRunner()
+        with _patch_recommend_deps() as (_store, rec):
+            rec.get_recommendations.side_effect = _recommend
+            result = runner.invoke(
+                app, ["recommend", "--batch", str(queries), "--out", str(out)]
+            )
+
+        assert result.exit_code == 0
+        assert "1 queries failed" in result.output
+        records = {r["query"]: r for r in map(json.loads, out.read_text().splitlines())}
+        assert records["two"] == {"query": "two", "error": "rate limited"}
+        assert len(records["one"]["recommendations"]) == 2
+
+    def test_batch_requires_out(self, tmp_path) -> None:
+        queries = tmp_path / "queries.txt"
+        queries.write_text("one\n")
+        runner = CliRunner()
+        result = runner.invoke(app, ["recommend", "--batch", str(queries)])
+        assert result.exit_code == 1
+        assert "--out" in result.output
+
+    def test_requires_description_or_batch(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(app, ["recommend"])
+        assert result.exit_code == 1
+        assert "--batch" in result.output
+
+
+def _patch_similar_storage(matches, similar):
+    store = _mock_storage()
+    store.find_catalog_entries.return_value = matches
+    store.get_similar_entries.return_value = similar
+    return patch("movie_buddy.cli.TursoStorage", return_value=store)
+
+
+class TestSimilarCommand:
+    def test_shows_neighbours_for_exact_match(self) -> None:
+        entries = _mock_catalog_entries()
+        runner = CliRunner()
+        with _patch_similar_storage(entries, [(entries[1], 0.83)]) as storage_cls:
+            result = runner.invoke(app, ["similar", "movie a"])
+        assert result.exit_code == 0
+        assert "More like Movie A" in result.output
+        assert "Movie B" in result.output
+        assert "83%" in result.output
+        storage_cls.return_value.get_similar_entries.assert_called_once_with(501, 10)
+
+    def test_no_match_shows_message(self) -> None:
+        runner = CliRunner()
+        with _patch_similar_storage([], []):
+            result = runner.invoke(app, ["similar", "Nothing"])
+        assert result.exit_code == 1
+        assert "No catalog titles match" in result.output
+
+    def test_ambiguous_title_prompts_picker(self) -> None:
+        entries = _mock_catalog_entries()
+        runner = CliRunner()
+        with _patch_similar_storage(entries, [(entries[0], 0.5)]) as storage_cls:
+            result = runner.invoke(app, ["similar", "Movie"], input="2\n")
+        assert result.exit_code == 0
+        storage_cls.return_value.get_similar_entries.assert_called_once_with(502, 10)
+
+
+class TestCatalogSimilarTitles:
+    def test_first_run_builds_full_neighbour_table(self) -> None:
+        storage = _mock_storage()
+        storage.get_existing_catalog_ids.return_value = set()
+        storage.get_neighbor_floors.return_value = {}
+        storage.get_catalog_entries.return_value = _mock_catalog_entries()
+        runner = CliRunner()
+        with _patch_catalog_deps(category_items=[], storage=storage):
+            result = runner.invoke(app, ["catalog"])
+        assert result.exit_code == 0
+        neighbors = storage.replace_neighbors.call_args[0][0]
+        assert set(neighbors) == {501, 502}
+
+    def test_no_changes_skips_rebuild(self) -> None:
+        storage = _mock_storage()
+        storage.get_existing_catalog_ids.return_value = {501, 502}
+        storage.get_neighbor_floors.return_value = {501: (0.1, 1), 502: (0.1, 1)}
+        runner = CliRunner()
+        with _patch_catalog_deps(
+            category_items=_mock_catalog_entries(), storage=storage
+        ):
+            result = runner.invoke(app, ["catalog"])
+        assert result.exit_code == 0
+        storage.replace_neighbors.assert_not_called()
+
+    def test_reupload_is_folded_into_original(self) -> None:
+        import dataclasses
+
+        entries = _mock_catalog_entries()
+        reupload = dataclasses.replace(entries[0], id=503, title="Movie A (4K)")
+        storage = _mock_storage()
+        storage.get_existing_catalog_ids.return_value = set()
+        storage.get_neighbor_floors.return_value = {}
+        storage.get_catalog_count.return_value = 3
+        storage.get_catalog_entries.return_value = [*entries, reupload]
+        storage.get_duplicate_clusters.return_value = {}
+        runner = CliRunner()
+        with _patch_catalog_deps(category_items=[*entries, reupload], storage=storage):
+            result = runner.invoke(app, ["catalog"])
+        assert result.exit_code == 0
+        storage.set_canonical_ids.assert_called_once_with({501: 501, 503: 501})
+        assert "1 titles folded" in result.output
+
+
+class TestCatalogExport:
+    def test_export_writes_snapshot(self, tmp_path) -> None:
+        store = _mock_storage()
+        written = {
+            "catalog": (tmp_path / "catalog.parquet", 12),
+            "ratings": (tmp_path / "ratings.parquet", 3),
+        }
+        runner = CliRunner()
+        with (
+            patch("movie_buddy.cli.TursoStorage", return_value=store),
+            patch("movie_buddy.cli.export_snapshot", return_value=written) as export,
+        ):
+            result = runner.invoke(
+                app, ["catalog", "export", "--format", "arrow", "--out", str(tmp_path)]
+            )
+        assert result.exit_code == 0
+        export.assert_called_once_with(store, tmp_path, "arrow")
+        assert "Wrote 12 catalog rows" in result.output
+
+    def test_missing_pyarrow_shows_error(self, tmp_path) -> None:
+        runner = CliRunner()
+        with (
+            patch("movie_buddy.cli.TursoStorage"),
+            patch("movie_buddy.snapshot.pa", None),
+        ):
+            result = runner.invoke(app, ["catalog", "export", "--out", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "pyarrow is not installed" in result.output
+
+
+class TestCatalogStats:
+    def test_stats_from_snapshot(self, tmp_path) -> None:
+        from movie_buddy.facets import FacetIndex
+
+        tables = MagicMock()
+        tables.facet_index.return_value = FacetIndex.build(_mock_catalog_entries())
+        tables.ratings.num_rows = 3
+        runner = CliRunner()
+        with (
+            patch("movie_buddy.cli.TursoStorage") as mock_storage_cls,
+            patch("movie_buddy.cli.load_snapshot", return_value=tables) as load,
+        ):
+            result = runner.invoke(
+                app, ["catalog", "stats", "--snapshot", str(tmp_path)]
+            )
+        assert result.exit_code == 0
+        load.assert_called_once_with(tmp_path)
+        mock_storage_cls.assert_not_called()
+        assert "2 catalog titles, 3 rated" in result.output
+        assert "Drama (1)" in result.output
+
+    def test_stats_from_database(self) -> None:
+        entries = _mock_catalog_entries()
+        store = _mock_storage(rated_ids={501})
+        store.get_catalog_count.return_value = len(entries)
+        store.get_catalog_entries.return_value = entries
+        runner = CliRunner()
+        with patch("movie_buddy.cli.TursoStorage", return_value=store):
+            result = runner.invoke(app, ["catalog", "stats"])
+        assert result.exit_code == 0
+        assert "2 catalog titles, 1 rated" in result.output
+
+    def test_missing_snapshot_shows_error(self, tmp_path) -> None:
+        pytest.importorskip("pyarrow")
+        runner = CliRunner()
+        result = runner.invoke(app, ["catalog", "stats", "--snapshot", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "No catalog snapshot" in result.output
+
+
+class TestFacetFilters:
+    def test_recommend_genre_filter_narrows_candidates(self) -> None:
+        runner = CliRunner()
+        with _patch_recommend_deps() as (store, rec):
+            result = runner.invoke(
+                app, ["recommend", "x", "--genre", "comedy"], input="\n"
+            )
+        assert result.exit_code == 0
+        _, candidates, _, _ = rec.stream_recommendations.call_args[0]
+        assert [c.id for c in candidates] == [502]
+        store.get_catalog_entries_by_ids.assert_any_call([502, 900, 901, 902, 903, 904])
+
+    def test_browse_shows_counts_and_top_titles(self) -> None:
+        entries = _mock_catalog_entries()
+        store = _mock_storage()
+        store.get_catalog_count.return_value = len(entries)
+        store.get_catalog_entries.return_value = entries
+        store.get_catalog_entries_by_ids.side_effect = lambda ids: [
+            e for e in entries if e.id in set(ids)
+        ]
+        runner = CliRunner()
+        with patch("movie_buddy.cli.TursoStorage", return_value=store):
+            result = runner.invoke(app, ["browse", "--decade", "2020s"])
+        assert result.exit_code == 0
+        assert "2 of 2 catalog titles match" in result.output
+        assert "Drama (1)" in result.output
+        assert result.output.index("Movie A") < result.output.index("Movie B")
+
+    def test_browse_without_matches(self) -> None:
+        store = _mock_storage()
+        store.get_catalog_count.return_value = 2
+        store.get_catalog_entries.return_value = _mock_catalog_entries()
+        runner = CliRunner()
+        with patch("movie_buddy.cli.TursoStorage", return_value=store):
+            result = runner.invoke(app, ["browse", "--genre", "Western"])
+        assert result.exit_code == 0
+        assert "No catalog titles match" in result.output
+
+
+class TestWatchRandom:
+    def _storage(
+        self, rated: set[int], duplicates: set[int] | None = None
+    ) -> MagicMock:
+        entries = _mock_catalog_entries()
+        store = _mock_storage()
+        store.get_catalog_count.return_value = len(entries)
+        store.get_catalog_entries.return_value = entries
+        store.get_rated_content_ids.return_value = rated
+        store.get_duplicate_ids.return_value = duplicates or set()
+        store.get_catalog_entries_by_ids.side_effect = lambda ids: [
+            e for e in entries if e.id in set(ids)
+        ]
+        return store
+
+    def test_picks_unrated_match_and_opens_it(self) -> None:
+        store = self._storage(rated={501})
+        runner = CliRunner()
+        with (
+            patch("movie_buddy.cli.TursoStorage", return_value=store),
+            patch("movie_buddy.cli.KinoPubAuth"),
+            patch("movie_buddy.cli.KinoPubClient"),
+            patch("movie_buddy.cli.open_in_chrome") as mock_open,
+        ):
+            result = runner.invoke(
+                app, ["watch", "--random", "--type", "movie", "--decade", "2020s"]
+            )
+        assert result.exit_code == 0
+        assert "Picked 1 of 1" in result.output
+        assert mock_open.call_args[0][0].endswith("/502")
+
+    def test_skips_non_canonical_duplicates(self) -> None:
+        store = self._storage(rated=set(), duplicates={501})
+        runner = CliRunner()
+        with (
+            patch("movie_buddy.cli.TursoStorage", return_value=store),
+            patch("movie_buddy.cli.KinoPubAuth"),
+            patch("movie_buddy.cli.KinoPubClient"),
+            patch("movie_buddy.cli.open_in_chrome") as mock_open,
+        ):
+            result = runner.invoke(app, ["watch", "--random", "--decade", "2020s"])
+        assert result.exit_code == 0
+        assert "Picked 1 of 1" in result.output
+        assert mock_open.call_args[0][0].endswith("/502")
+
+    def test_no_match_shows_message(self) -> None:
+        store = self._storage(rated=set())
+        runner = CliRunner()
+        with (
+            patch("movie_buddy.cli.TursoStorage", return_value=store),
+            patch("movie_buddy.cli.open_in_chrome") as mock_open,
+        ):
+            result = runner.invoke(
+                app, ["watch", "--random", "--genre", "Drama", "--min-imdb", "8"]
+            )
+        assert result.exit_code == 1
+        assert "No unrated catalog titles match" in result.output
+        mock_open.assert_not_called()
+
+    def test_requires_title_or_random(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(app, ["watch"])
+        assert result.exit_code == 1
+        assert "--random" in result.output
+
+
+# Import time itself is budgeted in benchmarks/startup_bench.py
+_HEAVY_MODULES = ("numpy", "httpx", "cryptography", "libsql_client", "openai")
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    env = {"KINOPUB_CLIENT_ID": "test", "KINOPUB_CLIENT_SECRET": "test"}
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env={**env, **os.environ},
+        check=True,
+    )
+
+
+class TestStartup:
+    @pytest.mark.parametrize("module", ["movie_buddy.cli", "movie_buddy.episodes"])
+    def test_import_skips_heavy_dependencies(self, module: str) -> None:
+        code = (
+            f"import sys, {module}; "
+            f"print(' '.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert _run_python("-c", code).stdout.strip() == ""
+
+    def test_patched_lazy_names_are_restored(self) -> None:
+        import movie_buddy.cli as cli
+
+        original = cli.TursoStorage
+        with patch("movie_buddy.cli.TursoStorage") as mock_storage:
+            assert cli.TursoStorage is mock_storage
+        assert cli.TursoStorage is original
+
+
+class TestDaemonClients:
+    def test_watch_uses_running_daemon(self) -> None:
+        import threading
+
+        from movie_buddy import cli
+        from movie_buddy.daemon import DaemonServer
+
+        client = MagicMock()
+        client.search.return_value = [
+            Content(id=7, title="Heat", content_type="movie", year=1995, seasons=[])
+        ]
+        server = DaemonServer(cli.config.daemon_socket, {"kinopub": lambda: client})
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+        thread.start()
+        try:
+            with (
+                patch("movie_buddy.cli.KinoPubAuth") as mock_auth,
+                patch("movie_buddy.cli.open_in_chrome") as mock_open,
+            ):
+                result = CliRunner().invoke(app, ["watch", "Heat"])
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        assert result.exit_code == 0
+        mock_auth.assert_not_called()
+        client.search.assert_called_once_with("Heat")
+        assert mock_open.call_args[0][0].endswith("/7")
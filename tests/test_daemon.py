@@ -0,0 +1,204 @@
+import socket
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from movie_buddy.daemon import DaemonServer, RemoteTarget, find_daemon
+from movie_buddy.models import AuthError, Content, KinoPubError
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def search(self, query: str) -> list[Content]:
+        self.calls.append(query)
+        return [Content(id=1, title=query, content_type="movie", year=2020, seasons=[])]
+
+    def wait(self) -> bool:
+        self.started.set()
+        return self.release.wait(5)
+
+    def fail(self) -> None:
+        raise AuthError("Token expired")
+
+    def explode(self) -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+
+class FakeConfig:
+    def __init__(self, socket_path: Path) -> None:
+        self.daemon_socket = socket_path
+
+
+@pytest.fixture
+def clock() -> list[float]:
+    return [0.0]
+
+
+@pytest.fixture
+def server(tmp_path: Path, clock: list[float]) -> Iterator[DaemonServer]:
+    built: list[FakeClient] = []
+
+    def factory() -> FakeClient:
+        built.append(FakeClient())
+        return built[-1]
+
+    srv = DaemonServer(
+        tmp_path / "d.sock",
+        {"kinopub": factory, "storage": FakeClient},
+        cached=frozenset({"kinopub"}),
+        ttl=60,
+        clock=lambda: clock[0],
+    )
+    srv.built = built  # type: ignore[attr-defined]
+    thread = threading.Thread(
+        target=srv.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    thread.join()
+
+
+def _remote(srv: DaemonServer, name: str = "kinopub") -> Any:
+    return RemoteTarget(srv.path, name)
+
+
+class TestDaemonServer:
+    def test_forwards_call_and_returns_models(self, server: DaemonServer) -> None:
+        results = _remote(server).search("Friends")
+        assert results[0].title == "Friends"
+        assert results[0].content_type == "movie"
+
+    def test_caches_kinopub_reads_until_ttl(
+        self, server: DaemonServer, clock: list[float]
+    ) -> None:
+        remote = _remote(server)
+        remote.search("Friends")
+        remote.search("Friends")
+        remote.search("Lost")
+        assert server.built[0].calls == ["Friends", "Lost"]  # type: ignore[attr-defined]
+        clock[0] = 61
+        remote.search("Friends")
+        assert server.built[0].calls == ["Friends", "Lost", "Friends"]  # type: ignore[attr-defined]
+
+    def test_expired_results_are_dropped(
+        self, server: DaemonServer, clock: list[float]
+    ) -> None:
+        remote = _remote(server)
+        remote.search("Friends")
+        clock[0] = 61
+        remote.search("Lost")
+        assert [key[2] for key in server._results] == [("Lost",)]
+        clock[0] = 200
+        server.service_actions()
+        assert not server._results
+
+    def test_cache_keeps_most_recently_used(self, tmp_path: Path) -> None:
+        client = FakeClient()
+        srv = DaemonServer(
+            tmp_path / "l.sock",
+            {"kinopub": lambda: client},
+            cached=frozenset({"kinopub"}),
+            max_entries=2,
+        )
+        for query in ("a", "b", "a", "c", "a", "b"):
+            srv.dispatch(("kinopub", "search", (query,), {}))
+        srv.server_close()
+        assert client.calls == ["a", "b", "c", "b"]
+        assert len(srv._results) == 2
+
+    def test_slow_call_does_not_block_other_clients(self, server: DaemonServer) -> None:
+        storage = server.target("storage")
+        slow = threading.Thread(target=_remote(server, "storage").wait)
+        slow.start()
+        try:
+            assert storage.started.wait(5)
+            assert _remote(server).search("Friends")[0].title == "Friends"
+            assert slow.is_alive()
+        finally:
+            storage.release.set()
+            slow.join()
+
+    def test_uncached_target_is_called_every_time(self, server: DaemonServer) -> None:
+        remote = _remote(server, "storage")
+        remote.search("a")
+        remote.search("a")
+        assert server.target("storage").calls == ["a", "a"]
+
+    def test_kinopub_errors_keep_their_type(self, server: DaemonServer) -> None:
+        with pytest.raises(AuthError, match="Token expired"):
+            _remote(server).fail()
+
+    def test_auth_error_rebuilds_target_once(self, server: DaemonServer) -> None:
+        with pytest.raises(AuthError):
+            _remote(server).fail()
+        assert len(server.built) == 2  # type: ignore[attr-defined]
+
+    def test_other_errors_become_kinopub_errors(self, server: DaemonServer) -> None:
+        with pytest.raises(KinoPubError, match="RuntimeError: boom"):
+            _remote(server).explode()
+
+    def test_private_methods_are_refused(self, server: DaemonServer) -> None:
+        with pytest.raises(AttributeError):
+            _remote(server)._secret()
+
+    def test_idle_time_renews_warm_targets(
+        self, tmp_path: Path, clock: list[float]
+    ) -> None:
+        client = MagicMock()
+        srv = DaemonServer(
+            tmp_path / "h.sock", {"kinopub": lambda: client}, clock=lambda: clock[0]
+        )
+        srv.target("kinopub")
+        srv.service_actions()
+        srv.service_actions()
+        clock[0] = 61
+        srv.service_actions()
+        srv.server_close()
+        assert client.refresh_if_due.call_count == 2
+
+    def test_socket_is_private_and_removed_on_close(self, tmp_path: Path) -> None:
+        srv = DaemonServer(tmp_path / "x.sock", {})
+        assert srv.path.stat().st_mode & 0o777 == 0o600
+        srv.server_close()
+        assert not srv.path.exists()
+
+
+class TestRemoteTarget:
+    def test_dropped_reply_is_a_lost_connection(self, tmp_path: Path) -> None:
+        path = tmp_path / "dead.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(path))
+            listener.listen()
+
+            def hang_up() -> None:
+                conn, _ = listener.accept()
+                conn.recv(4096)
+                conn.close()
+
+            thread = threading.Thread(target=hang_up)
+            thread.start()
+            with pytest.raises(KinoPubError, match="Lost connection"):
+                RemoteTarget(path, "kinopub").search("Friends")
+            thread.join()
+
+
+class TestFindDaemon:
+    def test_running_daemon_is_found(self, server: DaemonServer) -> None:
+        assert find_daemon(FakeConfig(server.path)) == server.path  # type: ignore[arg-type]
+
+    def test_missing_or_stale_socket_is_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "d.sock"
+        assert find_daemon(FakeConfig(path)) is None  # type: ignore[arg-type]
+        path.touch()
+        assert find_daemon(FakeConfig(path)) is None  # type: ignore[arg-type]
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from movie_buddy.decoding import MsgspecDecoder, StdlibDecoder
+from movie_buddy.models import KinoPubError
+
+_DECODERS = [StdlibDecoder]
+try:
+    import msgspec  # noqa: F401
+
+    _DECODERS.append(MsgspecDecoder)
+except ImportError:
+    pass
+
+
+@pytest.fixture(params=_DECODERS, ids=lambda cls: cls.__name__)
+def decoder(request):
+    return request.param()
+
+
+def _dump(payload: object) -> bytes:
+    return json.dumps(payload).encode()
+
+
+_CATEGORY_PAGE = _dump(
+    {
+        "pagination": {"total": 1, "current": 1},
+        "items": [
+            {
+                "id": 7,
+                "title": "Heat",
+                "type": "movie",
+                "year": 1995,
+                "genres": [{"id": 1, "title": "Crime"}, {"id": 2, "title": "Drama"}],
+                "countries": [{"id": 3, "title": "USA"}],
+                "imdb_rating": 8.3,
+                "kinopoisk_rating": None,
+                "plot": "Cops and robbers.",
+                "posters": {"small": "https://example.com/s.jpg"},
+                "voice": "Multi",
+            },
+            {"id": 8, "title": "Untitled", "type": "serial", "year": None},
+        ],
+    }
+)
+
+
+def test_catalog_items_keep_used_fields(decoder) -> None:
+    entries = decoder.catalog_items(_CATEGORY_PAGE, "2026-01-01")
+    assert entries[0].genres == ["Crime", "Drama"]
+    assert entries[0].countries == ["USA"]
+    assert entries[0].imdb_rating == 8.3
+    assert entries[0].kinopoisk_rating is None
+    assert entries[0].created_at == "2026-01-01"
+    assert (entries[1].year, entries[1].genres, entries[1].plot) == (0, [], "")
+
+
+def test_item_flattens_seasons(decoder) -> None:
+    data = _dump(
+        {
+            "item": {
+                "id": 1,
+                "title": "Show",
+                "type": "serial",
+                "year": 2020,
+                "seasons": [
+                    {"number": 1, "episodes": [{"id": 10, "number": 1}]},
+                    {
+                        "number": 2,
+                        "episodes": [
+                            {"id": 11, "number": 1, "title": "Back", "files": []}
+                        ],
+                    },
+                ],
+            }
+        }
+    )
+    content = decoder.item(data)
+    assert [(e.season_number, e.number, e.title) for e in content.all_episodes] == [
+        (1, 1, ""),
+        (2, 1, "Back"),
+    ]
+
+
+def test_lists_and_bookmarks(decoder) -> None:
+    listed = _dump(
+        {"items": [{"id": 2, "title": "X", "type": "movie", "total": 1, "watched": 1}]}
+    )
+    assert decoder.search(listed)[0].content_type == "movie"
+    assert decoder.watching(listed)[0].watched == 1
+    assert decoder.bookmark_folders(listed)[0].title == "X"
+    assert decoder.bookmark_ids(listed) == [2]
+    assert decoder.search(_dump({})) == []
+
+
+def test_malformed_response_raises_kinopub_error(decoder) -> None:
+    with pytest.raises(KinoPubError, match="Unexpected response"):
+        decoder.catalog_items(_dump({"items": [{"title": "no id"}]}), "now")
+    with pytest.raises(KinoPubError, match="Unexpected response"):
+        decoder.item(b"not json")
@@ -0,0 +1,136 @@
+import dataclasses
+
+import numpy as np
+
+from movie_buddy.dedup import (
+    MinHashIndex,
+    cluster_duplicates,
+    normalize_title,
+    shingles,
+    signature,
+)
+from movie_buddy.models import CatalogEntry
+from tests.conftest import make_entry
+
+_WORDS = [
+    "detective",
+    "heist",
+    "space",
+    "family",
+    "war",
+    "love",
+    "ghost",
+    "robot",
+    "island",
+    "city",
+    "road",
+    "prison",
+    "school",
+    "chef",
+    "music",
+    "revenge",
+    "secret",
+    "storm",
+    "ocean",
+    "desert",
+    "winter",
+    "train",
+    "king",
+    "queen",
+]
+
+
+def _plot(rng: np.random.Generator, n: int = 60) -> str:
+    return " ".join(rng.choice(_WORDS, size=n))
+
+
+def _catalog(n: int, seed: int = 0) -> list[CatalogEntry]:
+    rng = np.random.default_rng(seed)
+    return [
+        make_entry(i, year=int(rng.integers(1960, 2025)), plot=_plot(rng))
+        for i in range(n)
+    ]
+
+
+class TestShingles:
+    def test_release_tags_are_stripped_from_titles(self) -> None:
+        assert normalize_title("The Matrix (1999) 4K Remastered") == "the matrix"
+        assert normalize_title("Friends: Season 2") == "friends"
+        assert normalize_title("Друзья 3 сезон") == "друзья"
+
+    def test_identical_entries_share_a_signature(self) -> None:
+        a = make_entry(
+            1, title="Heat", year=1995, plot="A detective hunts a crew of thieves."
+        )
+        b = make_entry(
+            2,
+            title="Heat [UHD]",
+            year=1995,
+            plot="A detective hunts a crew of thieves!",
+        )
+        assert shingles(a) == shingles(b)
+        np.testing.assert_array_equal(signature(shingles(a)), signature(shingles(b)))
+
+
+class TestMinHashIndex:
+    def test_estimate_tracks_jaccard(self) -> None:
+        base = {f"p:{i}" for i in range(200)}
+        other = {f"p:{i}" for i in range(50, 250)}
+        index = MinHashIndex(
+            np.array([1, 2]), np.stack([signature(base), signature(other)])
+        )
+        assert abs(index.similarity(1, 2) - 150 / 250) < 0.1
+
+    def test_finds_reupload_and_ignores_distinct_titles(self) -> None:
+        entries = _catalog(300)
+        original = entries[10]
+        entries.append(
+            dataclasses.replace(original, id=1000, title=f"{original.title} 4K")
+        )
+        pairs = MinHashIndex.build(entries).duplicate_pairs()
+        assert pairs == [(10, 1000)]
+
+    def test_query_only_returns_pairs_with_new_ids(self) -> None:
+        entries = _catalog(100)
+        entries += [
+            dataclasses.replace(entries[3], id=200),
+            dataclasses.replace(entries[7], id=201),
+        ]
+        index = MinHashIndex.build(entries)
+        assert index.duplicate_pairs([201]) == [(7, 201)]
+
+    def test_add_matches_full_build(self) -> None:
+        entries = _catalog(50)
+        grown = MinHashIndex.build(entries[:30]).add(entries[20:])
+        full = MinHashIndex.build(entries)
+        assert grown.ids.tolist() == full.ids.tolist()
+        np.testing.assert_array_equal(grown.signatures, full.signatures)
+
+    def test_save_load_roundtrip(self, tmp_path) -> None:
+        path = tmp_path / "minhash.npz"
+        index = MinHashIndex.build(_catalog(5))
+        index.save(path)
+        loaded = MinHashIndex.load(path)
+        assert loaded is not None
+        np.testing.assert_array_equal(loaded.signatures, index.signatures)
+        assert MinHashIndex.load(tmp_path / "missing.npz") is None
+
+
+class TestClusterDuplicates:
+    def test_lowest_id_is_canonical(self) -> None:
+        assert cluster_duplicates([(5, 9), (9, 12), (3, 4)]) == {
+            3: 3,
+            4: 3,
+            5: 5,
+            9: 5,
+            12: 5,
+        }
+
+    def test_new_pair_merges_existing_clusters(self) -> None:
+        existing = {5: 5, 9: 5, 2: 2, 7: 2}
+        assert cluster_duplicates([(9, 7)], existing) == {
+            2: 2,
+            5: 2,
+            7: 2,
+            9: 2,
+        }
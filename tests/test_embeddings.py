@@ -0,0 +1,229 @@
+import dataclasses
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import openai
+import pytest
+
+from movie_buddy.config import Config, config
+from movie_buddy.embeddings import (
+    EmbeddingCache,
+    EmbeddingMatrix,
+    OpenAIEmbedder,
+    normalize_rows,
+    sync_embeddings,
+    text_hash,
+)
+from movie_buddy.models import LLMError
+from tests.conftest import make_entry
+
+
+@pytest.fixture
+def cfg(tmp_path: Path) -> Config:
+    return dataclasses.replace(config, config_dir=tmp_path)
+
+
+def _random_matrix(n: int = 500, dim: int = 32, seed: int = 0) -> EmbeddingMatrix:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return EmbeddingMatrix.from_vectors(range(1000, 1000 + n), vectors)
+
+
+class TestNormalizeRows:
+    def test_rows_have_unit_length(self) -> None:
+        arr = normalize_rows([[3.0, 4.0], [0.0, 2.0]])
+        assert arr.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(arr, axis=1), [1.0, 1.0])
+
+    def test_zero_row_stays_zero(self) -> None:
+        arr = normalize_rows([[0.0, 0.0], [1.0, 1.0]])
+        assert not arr[0].any()
+
+    def test_input_is_left_unchanged(self) -> None:
+        vectors = np.array([[3.0, 4.0]], dtype=np.float32)
+        normalize_rows(vectors)
+        np.testing.assert_array_equal(vectors, [[3.0, 4.0]])
+
+    def test_row_of_loaded_matrix(self, cfg: Config) -> None:
+        EmbeddingMatrix.from_vectors([1, 2], [[3.0, 4.0], [0.0, 2.0]]).save(cfg)
+        matrix = EmbeddingMatrix.load(cfg)
+        assert matrix is not None
+        np.testing.assert_allclose(normalize_rows(matrix.vectors[0]), [0.6, 0.8])
+
+
+class TestEmbeddingMatrix:
+    def test_rejects_mismatched_ids(self) -> None:
+        with pytest.raises(ValueError, match="do not match"):
+            EmbeddingMatrix.from_vectors([1, 2], np.ones((3, 4)))
+
+    def test_top_k_matches_full_sort(self) -> None:
+        matrix = _random_matrix()
+        query = np.random.default_rng(1).standard_normal(32)
+        result = matrix.top_k(query, k=10)
+
+        expected = np.argsort(-(matrix.vectors @ normalize_rows(query)))[:10]
+        assert [i for i, _ in result] == matrix.ids[expected].tolist()
+        scores = [s for _, s in result]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_top_k_returns_cosine_similarity(self) -> None:
+        matrix = EmbeddingMatrix.from_vectors([1, 2], [[1.0, 0.0], [1.0, 1.0]])
+        result = matrix.top_k([2.0, 0.0], k=2)
+        assert result[0] == (1, pytest.approx(1.0))
+        assert result[1] == (2, pytest.approx(2**-0.5))
+
+    def test_k_larger_than_catalog(self) -> None:
+        matrix = _random_matrix(n=3)
+        assert len(matrix.top_k(np.ones(32), k=10)) == 3
+
+    def test_dimension_mismatch_raises(self) -> None:
+        matrix = _random_matrix()
+        with pytest.raises(ValueError, match="dimension"):
+            matrix.top_k(np.ones(8))
+
+    def test_save_and_load_memory_maps(self, cfg: Config) -> None:
+        matrix = _random_matrix()
+        matrix.save(cfg)
+        loaded = EmbeddingMatrix.load(cfg)
+        assert loaded is not None
+        assert isinstance(loaded.vectors, np.memmap)
+        np.testing.assert_array_equal(loaded.ids, matrix.ids)
+        query = np.ones(32)
+        assert loaded.top_k(query, k=5) == matrix.top_k(query, k=5)
+
+    def test_load_missing_returns_none(self, cfg: Config) -> None:
+        assert EmbeddingMatrix.load(cfg) is None
+
+    def test_upsert_replaces_and_appends(self) -> None:
+        matrix = EmbeddingMatrix.from_vectors([1, 2], [[1.0, 0.0], [0.0, 1.0]])
+        updated = matrix.upsert([2, 3], [[1.0, 1.0], [-1.0, 0.0]])
+        assert sorted(updated.ids.tolist()) == [1, 2, 3]
+        assert updated.top_k([-1.0, 0.0], k=1)[0][0] == 3
+        assert updated.top_k([1.0, 1.0], k=1)[0][0] == 2
+
+
+def _fake_openai_client(dim: int = 8) -> MagicMock:
+    client = MagicMock()
+    lock = threading.Lock()
+    client.embedded_texts = []
+
+    def create(*, model: str, **kwargs: list[str]) -> SimpleNamespace:
+        texts = kwargs["input"]
+        with lock:
+            client.embedded_texts.extend(texts)
+        data = [
+            SimpleNamespace(
+                index=i,
+                embedding=np.random.default_rng(len(text)).random(dim).tolist(),
+            )
+            for i, text in enumerate(texts)
+        ]
+        return SimpleNamespace(data=list(reversed(data)))
+
+    client.embeddings.create.side_effect = create
+    return client
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    store = EmbeddingCache(tmp_path / "cache.db")
+    yield store
+    store.close()
+
+
+class TestEmbeddingCache:
+    def test_put_and_get_roundtrip(self, cache: EmbeddingCache) -> None:
+        vec = np.arange(4, dtype=np.float32)
+        cache.put_many("m", {"abc": vec})
+        found = cache.get_many("m", ["abc", "missing"])
+        assert list(found) == ["abc"]
+        np.testing.assert_array_equal(found["abc"], vec)
+
+    def test_keys_are_scoped_by_model(self, cache: EmbeddingCache) -> None:
+        cache.put_many("model-a", {"abc": np.ones(2, dtype=np.float32)})
+        assert cache.get_many("model-b", ["abc"]) == {}
+
+    def test_persists_across_connections(self, tmp_path: Path) -> None:
+        first = EmbeddingCache(tmp_path / "cache.db")
+        first.put_many("m", {"abc": np.ones(2, dtype=np.float32)})
+        first.close()
+        second = EmbeddingCache(tmp_path / "cache.db")
+        assert "abc" in second.get_many("m", ["abc"])
+        second.close()
+
+
+class TestOpenAIEmbedder:
+    def test_missing_api_key_raises(self) -> None:
+        cfg = dataclasses.replace(config, openai_api_key=None)
+        with pytest.raises(LLMError, match="OPENAI_API_KEY"):
+            OpenAIEmbedder(cfg)
+
+    def test_embeds_in_batches_preserving_order(self) -> None:
+        client = _fake_openai_client()
+        embedder = OpenAIEmbedder(client=client, batch_size=3, max_concurrency=2)
+        texts = [f"plot {i}" for i in range(7)]
+        vectors = embedder.embed(texts)
+        assert vectors.shape == (7, 8)
+        assert client.embeddings.create.call_count == 3
+        expected = np.random.default_rng(len(texts[5])).random(8)
+        np.testing.assert_allclose(vectors[5], expected, rtol=1e-6)
+
+    def test_api_error_raises_llm_error(self) -> None:
+        client = MagicMock()
+        client.embeddings.create.side_effect = openai.OpenAIError("boom")
+        embedder = OpenAIEmbedder(client=client)
+        with pytest.raises(LLMError, match="boom"):
+            embedder.embed(["text"])
+
+
+class TestSyncEmbeddings:
+    def test_200_new_titles_embedded_once_in_two_calls(
+        self, cache: EmbeddingCache
+    ) -> None:
+        client = _fake_openai_client()
+        embedder = OpenAIEmbedder(client=client)
+        entries = [make_entry(i, plot=f"plot number {i}") for i in range(200)]
+
+        matrix, embedded = sync_embeddings(entries, embedder, cache)
+
+        assert embedded == 200
+        assert len(client.embedded_texts) == 200
+        assert client.embeddings.create.call_count == 2
+        assert len(matrix) == 200
+
+    def test_only_new_or_changed_plots_are_embedded(
+        self, cache: EmbeddingCache
+    ) -> None:
+        client = _fake_openai_client()
+        embedder = OpenAIEmbedder(client=client)
+        entries = [make_entry(i, plot=f"plot number {i}") for i in range(10)]
+        matrix, _ = sync_embeddings(entries, embedder, cache)
+        client.embedded_texts.clear()
+
+        changed = [
+            make_entry(3, plot="a brand new plot"),
+            make_entry(10, plot="plot number 10"),
+        ]
+        matrix, embedded = sync_embeddings(
+            [*entries[:3], *changed], embedder, cache, matrix
+        )
+
+        assert embedded == 2
+        assert client.embedded_texts == ["a brand new plot", "plot number 10"]
+        assert len(matrix) == 11
+
+    def test_identical_plots_share_one_embedding(self, cache: EmbeddingCache) -> None:
+        client = _fake_openai_client()
+        embedder = OpenAIEmbedder(client=client)
+        _, embedded = sync_embeddings(
+            [make_entry(1, plot="same"), make_entry(2, plot="same")], embedder, cache
+        )
+        assert embedded == 1
+
+    def test_cache_key_uses_text_hash(self, cache: EmbeddingCache) -> None:
+        embedder = OpenAIEmbedder(client=_fake_openai_client())
+        sync_embeddings([make_entry(1, plot="some plot")], embedder, cache)
+        assert cache.get_many(embedder.model, [text_hash("some plot")])
@@ -0,0 +1,130 @@
+import random
+from collections import Counter
+
+import pytest
+
+from movie_buddy.episodes import AliasTable, EpisodeCache, EpisodeStore, WatchHistory
+from movie_buddy.models import Content, Episode, Season
+
+
+def _series(seasons: int = 3, per_season: int = 4) -> Content:
+    return Content(
+        id=100,
+        title="Show",
+        content_type="serial",
+        year=2020,
+        seasons=[
+            Season(
+                number=s,
+                episodes=[
+                    Episode(
+                        id=s * 100 + e, number=e, title=f"S{s}E{e}", season_number=s
+                    )
+                    for e in range(1, per_season + 1)
+                ],
+            )
+            for s in range(1, seasons + 1)
+        ],
+    )
+
+
+class TestEpisodeStore:
+    def test_keeps_watch_order_and_titles(self) -> None:
+        content = _series()
+        store = EpisodeStore.from_content(content)
+        assert len(store) == 12
+        assert [store.episode(i) for i in range(len(store))] == list(
+            content.all_episodes
+        )
+
+    def test_bytes_roundtrip(self) -> None:
+        store = EpisodeStore.from_content(_series())
+        restored = EpisodeStore.from_bytes(store.to_bytes())
+        assert restored is not None
+        assert list(restored.ids) == list(store.ids)
+        assert list(restored.seasons) == list(store.seasons)
+        assert restored.episode(5) == store.episode(5)
+
+    def test_from_bytes_rejects_other_blobs(self) -> None:
+        assert EpisodeStore.from_bytes(b"") is None
+        assert EpisodeStore.from_bytes(b"not an episode store") is None
+        truncated = EpisodeStore.from_content(_series()).to_bytes()[:20]
+        assert EpisodeStore.from_bytes(truncated) is None
+
+    def test_uniform_sample_covers_all_episodes(self) -> None:
+        store = EpisodeStore.from_content(_series())
+        rng = random.Random(0)
+        seen = {store.sample(rand=rng.random) for _ in range(500)}
+        assert seen == set(range(len(store)))
+        assert store.sample(rand=lambda: 0.9999999999) == len(store) - 1
+
+    def test_favoured_season_is_drawn_more_often(self) -> None:
+        store = EpisodeStore.from_content(_series())
+        weights = store.weights(season_weights={3: 8.0})
+        rng = random.Random(1)
+        seasons = Counter(
+            store.seasons[store.sample(weights, rng.random)] for _ in range(5000)
+        )
+        # Season 3 holds 8 / (1 + 1 + 8) of the weight
+        assert seasons[3] / 5000 == pytest.approx(0.8, abs=0.03)
+
+    def test_empty_store_cannot_sample(self) -> None:
+        store = EpisodeStore.from_content(_series(seasons=0))
+        with pytest.raises(ValueError, match="empty"):
+            store.sample()
+
+
+class TestAliasTable:
+    def test_matches_weights(self) -> None:
+        weights = [1.0, 0.0, 3.0, 6.0]
+        table = AliasTable(weights)
+        rng = random.Random(2)
+        counts = Counter(table.draw(rng.random) for _ in range(20000))
+        assert counts[1] == 0
+        for index, weight in enumerate(weights):
+            assert counts[index] / 20000 == pytest.approx(weight / 10, abs=0.02)
+
+    def test_rejects_zero_total(self) -> None:
+        with pytest.raises(ValueError, match="positive weight"):
+            AliasTable([0.0, 0.0])
+
+
+class TestEpisodeCache:
+    def test_roundtrip_and_expiry(self, tmp_path) -> None:
+        clock = [1000.0]
+        cache = EpisodeCache(tmp_path / "episodes.db", ttl=60, clock=lambda: clock[0])
+        cache.put(100, "Show", EpisodeStore.from_content(_series()))
+        cached = cache.get(100)
+        assert cached is not None
+        title, store = cached
+        assert title == "Show"
+        assert len(store) == 12
+        clock[0] += 61
+        assert cache.get(100) is None
+        cache.close()
+
+
+class TestWatchHistory:
+    def test_opened_since_last_round(self, tmp_path) -> None:
+        history = WatchHistory(tmp_path / "history.log")
+        assert history.opened(100) == set()
+        episodes = _series().all_episodes
+        history.record(100, episodes[0])
+        history.record(200, episodes[1])
+        history.record(100, episodes[2])
+        assert history.opened(100) == {episodes[0].id, episodes[2].id}
+
+        history.new_round(100)
+        history.record(100, episodes[3])
+        assert history.opened(100) == {episodes[3].id}
+        assert history.opened(200) == {episodes[1].id}
+        assert (tmp_path / "history.log").stat().st_size == 5 * 12
+
+    def test_sample_skips_opened_episodes(self) -> None:
+        store = EpisodeStore.from_content(_series(seasons=1, per_season=5))
+        skip = set(store.ids[:4])
+        rng = random.Random(3)
+        assert {store.sample(rand=rng.random, skip=skip) for _ in range(50)} == {4}
+        weights = store.weights(season_weights={1: 2.0})
+        assert store.sample(weights, rng.random, skip=skip) == 4
+        assert store.sample(rand=lambda: 0.0, skip=set(store.ids)) == 0
@@ -0,0 +1,131 @@
+import numpy as np
+
+from movie_buddy.facets import FacetIndex
+from movie_buddy.models import CatalogEntry
+from tests.conftest import make_entry
+
+
+def _catalog() -> list[CatalogEntry]:
+    return [
+        make_entry(
+            5, genres=["Drama", "Crime"], countries=["USA"], year=1994, imdb_rating=8.9
+        ),
+        make_entry(
+            1, genres=["Comedy"], countries=["France"], year=1999, imdb_rating=6.5
+        ),
+        make_entry(
+            3,
+            genres=["Drama"],
+            countries=["France"],
+            year=2004,
+            imdb_rating=None,
+            content_type="serial",
+        ),
+        make_entry(9, genres=["Horror"], countries=["UK"], year=1991, imdb_rating=5.0),
+        make_entry(
+            7,
+            genres=["Comedy", "Drama"],
+            countries=["USA", "UK"],
+            year=2010,
+            imdb_rating=7.2,
+        ),
+    ]
+
+
+def _random_catalog(n: int, seed: int = 0) -> list[CatalogEntry]:
+    rng = np.random.default_rng(seed)
+    genres = ["Drama", "Comedy", "Horror", "Sci-Fi", "Crime"]
+    countries = ["USA", "UK", "France", "Japan"]
+    return [
+        make_entry(
+            int(i),
+            genres=list(rng.choice(genres, size=2, replace=False)),
+            countries=[str(rng.choice(countries))],
+            year=int(rng.integers(1950, 2025)),
+            imdb_rating=round(float(rng.uniform(3, 9)), 1),
+        )
+        for i in rng.permutation(n * 3)[:n]
+    ]
+
+
+class TestFacetIndex:
+    def test_or_within_facet_and_across_facets(self) -> None:
+        index = FacetIndex.build(_catalog())
+        either = index.select({"genres": ["Comedy", "Horror"]})
+        assert index.to_ids(either).tolist() == [1, 7, 9]
+        both = index.select({"genres": ["Drama"], "countries": ["France"]})
+        assert index.to_ids(both).tolist() == [3]
+
+    def test_values_are_case_insensitive_and_unknown_matches_nothing(self) -> None:
+        index = FacetIndex.build(_catalog())
+        assert index.count(index.select({"genres": ["drama"]})) == 3
+        assert index.count(index.select({"genres": ["Western"]})) == 0
+
+    def test_empty_filters_select_everything(self) -> None:
+        index = FacetIndex.build(_catalog())
+        assert index.count(index.select({})) == 5
+        assert index.count(index.select({"genres": []})) == 5
+
+    def test_decades_and_types(self) -> None:
+        index = FacetIndex.build(_catalog())
+        nineties = index.select({"decades": ["1990"], "types": ["movie"]})
+        assert index.to_ids(nineties).tolist() == [1, 5, 9]
+
+    def test_facet_counts_within_selection(self) -> None:
+        index = FacetIndex.build(_catalog())
+        drama = index.select({"genres": ["Drama"]})
+        assert index.facet_counts("countries", drama) == {
+            "USA": 2,
+            "France": 1,
+            "UK": 1,
+        }
+
+    def test_imdb_filter_skips_unrated(self) -> None:
+        index = FacetIndex.build(_catalog())
+        good = index.imdb_at_least(7.0)
+        assert index.to_ids(good).tolist() == [5, 7]
+
+    def test_top_by_imdb(self) -> None:
+        index = FacetIndex.build(_catalog())
+        assert index.top_by_imdb(index.all(), 3) == [5, 7, 1]
+        assert index.top_by_imdb(index.select({"types": ["serial"]}), 3) == [3]
+
+    def test_of_ids_ignores_unknown(self) -> None:
+        index = FacetIndex.build(_catalog())
+        assert index.to_ids(index.of_ids([7, 3, 42])).tolist() == [3, 7]
+
+    def test_add_matches_full_build(self) -> None:
+        entries = _random_catalog(300)
+        grown = FacetIndex.build(entries[:200]).add(entries[150:])
+        full = FacetIndex.build(entries)
+        assert grown.ids.tolist() == full.ids.tolist()
+        np.testing.assert_array_equal(grown.imdb, full.imdb)
+        for facet in ("genres", "countries", "decades"):
+            assert grown.facet_counts(facet, grown.all()) == full.facet_counts(
+                facet, full.all()
+            )
+            for value in full.vocab[facet]:
+                np.testing.assert_array_equal(
+                    grown.any_of(facet, [value]), full.any_of(facet, [value])
+                )
+
+    def test_save_load_roundtrip(self, tmp_path) -> None:
+        path = tmp_path / "facets.npz"
+        index = FacetIndex.build(_catalog())
+        index.save(path)
+        loaded = FacetIndex.load(path)
+        assert loaded is not None
+        assert loaded.ids.tolist() == index.ids.tolist()
+        assert loaded.vocab == index.vocab
+        selection = {"genres": ["Drama"], "decades": ["1990"]}
+        assert loaded.to_ids(loaded.select(selection)).tolist() == [5]
+
+    def test_load_missing_returns_none(self, tmp_path) -> None:
+        assert FacetIndex.load(tmp_path / "missing.npz") is None
+
+    def test_nth_walks_selected_rows_in_id_order(self) -> None:
+        entries = _random_catalog(100)
+        index = FacetIndex.build(entries)
+        bitmap = index.select({"genres": ["Drama"]})
+        expected = index.to_ids(bitmap).tolist()
+        assert [index.nth(bitmap, k) for k in range(len(expected))] == expected
@@ -0,0 +1,76 @@
+import dataclasses
+import time
+
+import numpy as np
+import pytest
+
+from movie_buddy.config import config
+from movie_buddy.embeddings import OpenAIEmbedder
+from movie_buddy.fake_openai import FakeOpenAIServer, fake_embedding
+from movie_buddy.models import Rating
+from movie_buddy.recommender import MovieRecommender
+from tests.conftest import make_entry
+
+RATINGS = [
+    Rating(
+        content_id=1,
+        title="Rated",
+        content_type="movie",
+        score=9,
+        rated_at="2026-01-01",
+    )
+]
+CANDIDATES = [
+    make_entry(i, genres=["Drama"], countries=["USA"], imdb_rating=8.0, plot="Plot.")
+    for i in range(100, 110)
+]
+
+
+@pytest.fixture
+def server():
+    with FakeOpenAIServer() as fake:
+        yield fake
+
+
+@pytest.fixture
+def cfg(server: FakeOpenAIServer):
+    return dataclasses.replace(
+        config, openai_api_key="fake-key", openai_base_url=server.url
+    )
+
+
+class TestFakeOpenAIServer:
+    def test_streamed_recommendations_are_deterministic(
+        self, server: FakeOpenAIServer, cfg
+    ) -> None:
+        recommender = MovieRecommender(cfg)
+        first = recommender.get_recommendations(RATINGS, CANDIDATES, "a heist")
+        second = recommender.get_recommendations(RATINGS, CANDIDATES, "a heist")
+        assert len(first) == 3
+        assert first == second
+        assert {r.content_id for r in first} <= {e.id for e in CANDIDATES}
+        assert "a heist" in first[0].explanation
+        assert server.stats["chat"] == 2
+
+    def test_embeddings_roundtrip_through_sdk(
+        self, server: FakeOpenAIServer, cfg
+    ) -> None:
+        vectors = OpenAIEmbedder(cfg).embed(["one", "two", "one"])
+        assert vectors.shape == (3, 64)
+        np.testing.assert_allclose(vectors[0], fake_embedding("one"), rtol=1e-6)
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+        assert server.stats["embedded_texts"] == 3
+
+    def test_latency_and_throughput_are_applied(self, cfg) -> None:
+        with FakeOpenAIServer(latency=0.2, tokens_per_second=2000) as slow:
+            slow_cfg = dataclasses.replace(cfg, openai_base_url=slow.url)
+            stream = MovieRecommender(slow_cfg).stream_recommendations(
+                RATINGS, CANDIDATES, "a heist"
+            )
+            start = time.perf_counter()
+            next(stream)
+            first = time.perf_counter() - start
+            list(stream)
+            total = time.perf_counter() - start
+        assert first >= 0.2
+        assert total > first
@@ -0,0 +1,23 @@
+import sys
+
+from movie_buddy.lazy import LazyImport
+
+
+class TestLazyImport:
+    def test_defers_import_until_first_use(self) -> None:
+        sys.modules.pop("colorsys", None)
+        lazy = LazyImport("colorsys")
+        assert "colorsys" not in sys.modules
+        assert lazy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert "colorsys" in sys.modules
+
+    def test_named_attribute_is_callable(self) -> None:
+        lazy = LazyImport("fractions", "Fraction")
+        assert lazy(1, 2) == lazy.from_float(0.5)
+
+    def test_resolve_returns_target(self) -> None:
+        import json
+
+        assert LazyImport("json").resolve() is json
+        assert LazyImport("json", "dumps").resolve() is json.dumps
+        assert repr(LazyImport("json", "dumps")) == "<lazy json.dumps>"
@@ -1,5 +1,8 @@
+import dataclasses
 import time
 
+import pytest
+
 from movie_buddy.config import config
 from movie_buddy.models import Content, Episode, Season, Token
 
@@ -130,3 +133,15 @@ class TestContent:
         assert len(all_eps) == 3
         assert all_eps[0].season_number == 1
         assert all_eps[2].season_number == 2
+
+    def test_all_episodes_is_flattened_once(self) -> None:
+        content = self._make_serial()
+        assert content.all_episodes is content.all_episodes
+        assert content == self._make_serial()
+
+    def test_hot_models_are_slotted_and_frozen(self) -> None:
+        content = self._make_serial()
+        assert not hasattr(content, "__dict__")
+        assert not hasattr(content.seasons[0].episodes[0], "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            content.title = "Other"  # type: ignore[misc]
@@ -0,0 +1,85 @@
+import pytest
+
+from movie_buddy.models import Rating
+from movie_buddy.prompt import (
+    build_user_prompt,
+    estimate_tokens,
+    pack_candidates,
+    select_ratings,
+    truncate_plot,
+)
+from tests.conftest import make_entry
+
+LONG_PLOT = "A detective returns home. " + "He uncovers old secrets. " * 40
+
+
+def _rating(content_id: int, score: int, day: int = 1) -> Rating:
+    return Rating(
+        content_id=content_id,
+        title=f"Title {content_id}",
+        content_type="movie",
+        score=score,
+        rated_at=f"2026-01-{day:02d}",
+    )
+
+
+class TestTruncatePlot:
+    def test_short_plot_is_unchanged(self) -> None:
+        assert truncate_plot("Short  plot.", 100) == "Short plot."
+
+    def test_cuts_at_sentence_boundary(self) -> None:
+        assert truncate_plot(LONG_PLOT, 60) == (
+            "A detective returns home. He uncovers old secrets."
+        )
+
+    def test_falls_back_to_word_boundary(self) -> None:
+        result = truncate_plot("one two three four five six", 12)
+        assert result == "one two…"
+        assert len(result) <= 12
+
+
+class TestSelectRatings:
+    def test_prefers_extreme_scores(self) -> None:
+        ratings = [_rating(1, 6), _rating(2, 10), _rating(3, 1), _rating(4, 5)]
+        chosen = select_ratings(ratings, {}, budget=10)
+        assert {r.content_id for r in chosen} == {2, 3}
+
+    def test_prefers_recent_when_equally_extreme(self) -> None:
+        ratings = [_rating(1, 9, day=1), _rating(2, 9, day=20)]
+        chosen = select_ratings(ratings, {}, budget=5)
+        assert [r.content_id for r in chosen] == [2]
+
+    def test_genre_diversity_bonus(self) -> None:
+        entries = {
+            1: make_entry(1, genres=["Horror"], plot=LONG_PLOT),
+            2: make_entry(2, genres=["Horror"], plot=LONG_PLOT),
+            3: make_entry(3, genres=["Comedy"], plot=LONG_PLOT),
+        }
+        ratings = [_rating(1, 10, day=3), _rating(2, 10, day=2), _rating(3, 10, day=1)]
+        chosen = select_ratings(ratings, entries, budget=10)
+        assert [r.content_id for r in chosen] == [1, 3]
+
+
+class TestPackCandidates:
+    def test_plots_shrink_to_fit(self) -> None:
+        candidates = [make_entry(i, plot=LONG_PLOT) for i in range(30)]
+        lines = pack_candidates(candidates, budget=800)
+        assert len(lines) == 30
+        assert sum(estimate_tokens(line) + 1 for line in lines) <= 800
+
+    def test_drops_lowest_ranked_when_rows_do_not_fit(self) -> None:
+        candidates = [make_entry(i, plot=LONG_PLOT) for i in range(30)]
+        lines = pack_candidates(candidates, budget=50)
+        assert 0 < len(lines) < 30
+        assert lines[0].startswith("0|")
+
+
+class TestBuildUserPrompt:
+    @pytest.mark.parametrize("history", [10, 5000])
+    def test_stays_within_budget(self, history: int) -> None:
+        ratings = [_rating(i, i % 10 + 1, day=i % 28 + 1) for i in range(history)]
+        candidates = [make_entry(10_000 + i, plot=LONG_PLOT) for i in range(30)]
+        prompt = build_user_prompt(ratings, candidates, "a cosy mystery", budget=1500)
+        assert estimate_tokens(prompt) <= 1500
+        assert "User request: a cosy mystery" in prompt
+        assert "10000|Title 10000|" in prompt
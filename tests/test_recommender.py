@@ -0,0 +1,288 @@
+import dataclasses
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import openai
+import pytest
+
+from movie_buddy.config import config
+from movie_buddy.models import CatalogEntry, LLMError, Rating, Recommendation
+from movie_buddy.recommender import (
+    MovieRecommender,
+    RecommendationCache,
+    RecommendationStreamParser,
+    cache_key,
+    parse_recommendations,
+)
+from tests.conftest import make_entry
+
+
+@pytest.fixture
+def candidates() -> list[CatalogEntry]:
+    return [
+        make_entry(
+            i,
+            title=title,
+            year=2001,
+            genres=["Drama"],
+            imdb_rating=8.0,
+            plot=f"Plot of {title}",
+        )
+        for i, title in enumerate(["Alpha", "Beta", "Gamma"], start=1)
+    ]
+
+
+@pytest.fixture
+def ratings() -> list[Rating]:
+    return [
+        Rating(
+            content_id=9,
+            title="Rated Movie",
+            content_type="movie",
+            score=9,
+            rated_at="2026-01-01",
+        )
+    ]
+
+
+def _chunk(content: str | None) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]
+    )
+
+
+def _llm_client(content: str, chunk_size: int = 7) -> MagicMock:
+    client = MagicMock()
+    client.chat.completions.create.side_effect = lambda **kwargs: iter(
+        [
+            _chunk(None),
+            *(
+                _chunk(content[i : i + chunk_size])
+                for i in range(0, len(content), chunk_size)
+            ),
+        ]
+    )
+    return client
+
+
+class TestParseRecommendations:
+    def test_maps_ids_to_catalog_entries(self, candidates: list[CatalogEntry]) -> None:
+        content = json.dumps(
+            {
+                "recommendations": [
+                    {"content_id": 2, "explanation": "Because."},
+                    {"content_id": 1, "explanation": "Also."},
+                ]
+            }
+        )
+        recs = parse_recommendations(content, candidates)
+        assert [r.content_id for r in recs] == [2, 1]
+        assert recs[0].title == "Beta"
+        assert recs[0].explanation == "Because."
+
+    def test_drops_unknown_and_duplicate_ids(
+        self, candidates: list[CatalogEntry]
+    ) -> None:
+        content = json.dumps(
+            {
+                "recommendations": [
+                    {"content_id": 99, "explanation": "Hallucinated"},
+                    {"content_id": 3, "explanation": "x"},
+                    {"content_id": 3, "explanation": "again"},
+                ]
+            }
+        )
+        assert [r.content_id for r in parse_recommendations(content, candidates)] == [3]
+
+    def test_invalid_json_raises(self, candidates: list[CatalogEntry]) -> None:
+        with pytest.raises(LLMError, match="parse"):
+            parse_recommendations("not json", candidates)
+
+
+class TestRecommendationStreamParser:
+    def test_items_are_emitted_as_they_close(
+        self, candidates: list[CatalogEntry]
+    ) -> None:
+        parser = RecommendationStreamParser(candidates)
+        assert parser.feed('{"recommendations": [{"content_id": 1, "expl') == []
+        emitted = parser.feed('anation": "has } and \\" inside"}, {"content_id"')
+        assert [r.title for r in emitted] == ["Alpha"]
+        assert emitted[0].explanation == 'has } and " inside'
+        assert [r.title for r in parser.feed(': 3, "explanation": "x"}]}')] == ["Gamma"]
+
+    def test_unknown_and_duplicate_ids_are_skipped(
+        self, candidates: list[CatalogEntry]
+    ) -> None:
+        parser = RecommendationStreamParser(candidates)
+        items = [
+            {"content_id": 99, "explanation": "x"},
+            {"content_id": 2, "explanation": "x"},
+            {"content_id": 2, "explanation": "x"},
+        ]
+        emitted = parser.feed(json.dumps({"recommendations": items}))
+        assert [r.content_id for r in emitted] == [2]
+
+
+class TestMovieRecommender:
+    def test_missing_api_key_raises(self) -> None:
+        cfg = dataclasses.replace(config, openai_api_key=None)
+        with pytest.raises(LLMError, match="OPENAI_API_KEY"):
+            MovieRecommender(cfg)
+
+    def test_prompt_includes_profile_candidates_and_description(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        recommender = MovieRecommender(client=MagicMock())
+        messages = recommender.build_prompt(ratings, candidates, "something sad")
+        user = messages[-1]["content"]
+        assert "Rated Movie: 9" in user
+        assert "\n2|Beta|2001|movie|Drama|8|Plot of Beta\n" in user
+        assert "something sad" in user
+
+    def test_get_recommendations(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        content = json.dumps(
+            {"recommendations": [{"content_id": 1, "explanation": "Great"}]}
+        )
+        client = _llm_client(content)
+        recs = MovieRecommender(client=client).get_recommendations(
+            ratings, candidates, "anything"
+        )
+        assert [r.title for r in recs] == ["Alpha"]
+        kwargs = client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"]["type"] == "json_schema"
+        assert kwargs["stream"] is True
+
+    def test_stream_yields_before_response_completes(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        first = '{"recommendations": [{"content_id": 2, "explanation": "B"}, '
+        rest = '{"content_id": 3, "explanation": "C"}]}'
+        consumed: list[str] = []
+
+        def _stream(**kwargs):
+            for part in (first, rest):
+                consumed.append(part)
+                yield _chunk(part)
+
+        client = MagicMock()
+        client.chat.completions.create.side_effect = _stream
+        stream = MovieRecommender(client=client).stream_recommendations(
+            ratings, candidates, "anything"
+        )
+        assert next(stream).title == "Beta"
+        assert consumed == [first]
+        assert [r.title for r in stream] == ["Gamma"]
+
+    def test_malformed_stream_raises(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        client = _llm_client("I cannot help with that.")
+        with pytest.raises(LLMError, match="parse"):
+            MovieRecommender(client=client).get_recommendations(
+                ratings, candidates, "anything"
+            )
+
+    def test_api_error_raises_llm_error(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        client = MagicMock()
+        client.chat.completions.create.side_effect = openai.OpenAIError("down")
+        with pytest.raises(LLMError, match="down"):
+            MovieRecommender(client=client).get_recommendations(
+                ratings, candidates, "anything"
+            )
+
+
+def _rec(content_id: int) -> Recommendation:
+    return Recommendation(
+        content_id=content_id,
+        title=f"Title {content_id}",
+        year=2001,
+        content_type="movie",
+        explanation="Because.",
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCacheKey:
+    def test_query_is_normalized(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        assert cache_key("  Something   SAD ", "m", ratings, candidates) == cache_key(
+            "something sad", "m", ratings, candidates
+        )
+
+    def test_changes_with_model_ratings_and_candidates(
+        self, candidates: list[CatalogEntry], ratings: list[Rating]
+    ) -> None:
+        base = cache_key("q", "m", ratings, candidates)
+        rerated = [dataclasses.replace(ratings[0], score=3)]
+        assert cache_key("q", "other", ratings, candidates) != base
+        assert cache_key("q", "m", rerated, candidates) != base
+        assert cache_key("q", "m", ratings, candidates[:2]) != base
+        assert cache_key("q", "m", ratings, candidates[::-1]) == base
+
+
+class TestRecommendationCache:
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        cache = RecommendationCache(tmp_path / "cache.db")
+        cache.put("k", [_rec(1), _rec(2)])
+        assert cache.get("k") == [_rec(1), _rec(2)]
+        assert cache.get("missing") is None
+
+    def test_entries_expire_after_ttl(self, tmp_path: Path) -> None:
+        clock = FakeClock()
+        cache = RecommendationCache(tmp_path / "cache.db", ttl=60, clock=clock)
+        cache.put("k", [_rec(1)])
+        clock.now += 59
+        assert cache.get("k") is not None
+        clock.now += 2
+        assert cache.get("k") is None
+
+    def test_least_recently_used_is_evicted(self, tmp_path: Path) -> None:
+        clock = FakeClock()
+        cache = RecommendationCache(tmp_path / "cache.db", max_entries=2, clock=clock)
+        cache.put("a", [_rec(1)])
+        clock.now += 1
+        cache.put("b", [_rec(2)])
+        clock.now += 1
+        cache.get("a")
+        clock.now += 1
+        cache.put("c", [_rec(3)])
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_recommender_skips_llm_on_cache_hit(
+        self,
+        tmp_path: Path,
+        candidates: list[CatalogEntry],
+        ratings: list[Rating],
+    ) -> None:
+        content = json.dumps(
+            {"recommendations": [{"content_id": 1, "explanation": "Great"}]}
+        )
+        client = _llm_client(content)
+        cache = RecommendationCache(tmp_path / "cache.db")
+        recommender = MovieRecommender(client=client, cache=cache)
+
+        first = recommender.get_recommendations(ratings, candidates, "Anything")
+        second = recommender.get_recommendations(ratings, candidates, "anything ")
+
+        assert first == second
+        client.chat.completions.create.assert_called_once()
+
+        rerated = [dataclasses.replace(ratings[0], score=2)]
+        recommender.get_recommendations(rerated, candidates, "anything")
+        assert client.chat.completions.create.call_count == 2
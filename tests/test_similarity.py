@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from movie_buddy.embeddings import EmbeddingMatrix
+from movie_buddy.similarity import ItemSimilarity, merge_neighbors, update_neighbors
+from tests.conftest import make_entry
+
+
+def _random_catalog(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    genres = ["Drama", "Comedy", "Horror", "Sci-Fi", "Crime"]
+    countries = ["USA", "UK", "France"]
+    entries = [
+        make_entry(
+            i,
+            genres=list(rng.choice(genres, size=2, replace=False)),
+            countries=[str(rng.choice(countries))],
+        )
+        for i in range(n)
+    ]
+    matrix = EmbeddingMatrix.from_vectors(range(n), rng.standard_normal((n, 16)))
+    return entries, matrix
+
+
+def _as_ids(neighbors):
+    return {k: [i for i, _ in v] for k, v in neighbors.items()}
+
+
+class TestItemSimilarity:
+    def test_facet_overlap_without_embeddings(self) -> None:
+        entries = [
+            make_entry(1, genres=["Drama", "Crime"], countries=["USA"]),
+            make_entry(2, genres=["Drama", "Crime"], countries=["USA"]),
+            make_entry(3, genres=["Drama"], countries=["UK"]),
+            make_entry(4, genres=["Comedy"], countries=["France"]),
+        ]
+        neighbors = ItemSimilarity(entries).neighbors([1], k=3)
+        assert [i for i, _ in neighbors[1]] == [2, 3, 4]
+        assert neighbors[1][0][1] == pytest.approx(0.3)
+
+    def test_excludes_self_and_sorts_by_score(self) -> None:
+        entries, matrix = _random_catalog(50)
+        neighbors = ItemSimilarity(entries, matrix).neighbors(range(50), k=5)
+        for item_id, pairs in neighbors.items():
+            scores = [s for _, s in pairs]
+            assert item_id not in {i for i, _ in pairs}
+            assert scores == sorted(scores, reverse=True)
+            assert len(pairs) == 5
+
+    def test_embedding_similarity_dominates(self) -> None:
+        entries = [make_entry(i, genres=["Drama"], countries=["USA"]) for i in range(3)]
+        matrix = EmbeddingMatrix.from_vectors(
+            range(3), [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]]
+        )
+        neighbors = ItemSimilarity(entries, matrix).neighbors([0], k=2)
+        assert [i for i, _ in neighbors[0]] == [1, 2]
+
+    def test_small_catalog_caps_k(self) -> None:
+        entries = [
+            make_entry(1, genres=["Drama"], countries=[]),
+            make_entry(2, genres=["Drama"], countries=[]),
+        ]
+        assert ItemSimilarity(entries).neighbors([1, 2], k=20) == {
+            1: [(2, pytest.approx(0.2))],
+            2: [(1, pytest.approx(0.2))],
+        }
+
+
+class TestMergeNeighbors:
+    def test_keeps_top_k_and_best_score(self) -> None:
+        merged = merge_neighbors([(1, 0.9), (2, 0.5)], [(3, 0.7), (2, 0.6)], k=2)
+        assert merged == [(1, 0.9), (3, 0.7)]
+
+
+class TestUpdateNeighbors:
+    def _store(self, neighbors, k):
+        floors = {i: (min(s for _, s in v), len(v)) for i, v in neighbors.items() if v}
+
+        def load(ids):
+            return {i: neighbors[i] for i in ids if i in neighbors}
+
+        def sources(changed):
+            return {i for i, v in neighbors.items() if {n for n, _ in v} & changed}
+
+        return floors, load, sources
+
+    def test_incremental_insert_matches_full_rebuild(self) -> None:
+        entries, matrix = _random_catalog(300)
+        old = entries[:260]
+        stored = ItemSimilarity(old, matrix).neighbors([e.id for e in old], k=10)
+        floors, load, sources = self._store(stored, 10)
+
+        changed = {e.id for e in entries[260:]}
+        similarity = ItemSimilarity(entries, matrix)
+        updates = update_neighbors(
+            similarity,
+            changed,
+            floors=floors,
+            stale_ids=sources(changed),
+            load_stored=load,
+            k=10,
+        )
+        merged = {**stored, **updates}
+        full = similarity.neighbors([e.id for e in entries], k=10)
+
+        assert _as_ids(merged) == _as_ids(full)
+        assert len(updates) < len(entries)
+
+    def test_reembedded_item_refreshes_lists_that_point_at_it(self) -> None:
+        entries, matrix = _random_catalog(120, seed=1)
+        ids = [e.id for e in entries]
+        stored = ItemSimilarity(entries, matrix).neighbors(ids, k=8)
+        floors, load, sources = self._store(stored, 8)
+
+        changed = {5}
+        vectors = np.array(matrix.vectors)
+        vectors[5] = np.random.default_rng(9).standard_normal(16)
+        new_matrix = EmbeddingMatrix.from_vectors(ids, vectors)
+        similarity = ItemSimilarity(entries, new_matrix)
+        updates = update_neighbors(
+            similarity,
+            changed,
+            floors=floors,
+            stale_ids=sources(changed),
+            load_stored=load,
+            k=8,
+        )
+
+        assert _as_ids({**stored, **updates}) == _as_ids(similarity.neighbors(ids, 8))
+
+
+class TestAnnNeighbors:
+    def test_index_is_searched_and_matches_brute_force(self) -> None:
+        from unittest.mock import MagicMock
+
+        from movie_buddy.ann import IVFIndex
+
+        entries, matrix = _random_catalog(40)
+        # Probing every list makes the index exact on a catalog this small
+        index = IVFIndex.build(matrix, nlist=2)
+        ann = MagicMock(wraps=index)
+        expected = ItemSimilarity(entries, matrix).neighbors(range(40), k=5)
+        actual = ItemSimilarity(entries, matrix, ann).neighbors(range(40), k=5)
+        assert ann.search.call_count == 40
+        assert _as_ids(actual) == _as_ids(expected)
+        for item_id, pairs in actual.items():
+            assert [s for _, s in pairs] == pytest.approx(
+                [s for _, s in expected[item_id]], abs=1e-5
+            )
+
+    def test_incoming_uses_index(self) -> None:
+        from unittest.mock import MagicMock
+
+        from movie_buddy.ann import IVFIndex
+
+        entries, matrix = _random_catalog(40)
+        ann = MagicMock(wraps=IVFIndex.build(matrix, nlist=2))
+        floors = dict.fromkeys(range(40), 0.3)
+        expected = ItemSimilarity(entries, matrix).incoming({3, 7}, floors)
+        actual = ItemSimilarity(entries, matrix, ann).incoming({3, 7}, floors)
+        assert ann.search.call_count == 2
+        assert _as_ids(actual) == _as_ids(expected)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import libsql_client
+import numpy as np
+import pytest
+
+from movie_buddy.facets import FacetIndex
+from movie_buddy.models import KinoPubError, Rating
+from tests.conftest import make_entry
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from movie_buddy import snapshot  # noqa: E402
+
+_ENTRIES = [
+    make_entry(
+        4,
+        genres=["Drama", "Crime"],
+        countries=["France"],
+        year=1994,
+        imdb_rating=8.9,
+        plot="Plot 4",
+    ),
+    make_entry(
+        1,
+        genres=["Comedy"],
+        countries=["USA", "UK"],
+        year=1999,
+        imdb_rating=None,
+        plot="Plot 1",
+    ),
+    make_entry(
+        9,
+        content_type="serial",
+        countries=["USA", "UK"],
+        year=0,
+        imdb_rating=5.5,
+        plot="Plot 9",
+    ),
+    make_entry(
+        6,
+        content_type="serial",
+        genres=["Horror", "Drama"],
+        countries=["France"],
+        year=2011,
+        imdb_rating=6.1,
+        plot="Plot 6",
+    ),
+    make_entry(
+        3,
+        content_type="serial",
+        genres=["Comedy", "Romance"],
+        countries=["USA", "UK"],
+        year=2003,
+        imdb_rating=7.0,
+        plot="Plot 3",
+    ),
+]
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    from movie_buddy.storage import TursoStorage
+
+    store = TursoStorage.__new__(TursoStorage)
+    store._client = libsql_client.create_client_sync(url=f"file://{tmp_path}/t.db")
+    store.init_schema()
+    store.insert_catalog_entries(_ENTRIES)
+    store.insert_ratings(
+        [
+            Rating(
+                content_id=4,
+                title="Title 4",
+                content_type="movie",
+                score=9,
+                rated_at="2026-01-02",
+            )
+        ]
+    )
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_and_load_roundtrip(storage, tmp_path: Path, fmt: str) -> None:
+    written = snapshot.export_snapshot(storage, tmp_path / "snap", fmt)
+    assert written["catalog"][1] == 5
+    assert written["ratings"][1] == 1
+
+    loaded = snapshot.load_snapshot(tmp_path / "snap")
+    assert loaded.ids.tolist() == [1, 3, 4, 6, 9]
+    assert loaded.catalog["genres"].to_pylist()[2] == ["Drama", "Crime"]
+    assert np.isnan(loaded.imdb[0])
+    assert loaded.ratings["score"].to_pylist() == [9]
+
+
+def test_parquet_is_written_in_row_groups(storage, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(snapshot, "PAGE_ROWS", 2)
+    snapshot.export_snapshot(storage, tmp_path, "parquet")
+    assert pq.ParquetFile(tmp_path / "catalog.parquet").num_row_groups == 3
+
+
+def test_facet_index_matches_entry_build(storage, tmp_path: Path) -> None:
+    snapshot.export_snapshot(storage, tmp_path)
+    columnar = snapshot.load_snapshot(tmp_path).facet_index()
+    built = FacetIndex.build(_ENTRIES)
+    assert columnar.ids.tolist() == built.ids.tolist()
+    for facet in ("types", "genres", "countries", "decades"):
+        assert columnar.facet_counts(facet, columnar.all()) == built.facet_counts(
+            facet, built.all()
+        )
+        for value in built.vocab[facet]:
+            np.testing.assert_array_equal(
+                columnar.any_of(facet, [value]), built.any_of(facet, [value])
+            )
+
+
+def test_missing_snapshot_and_unknown_format(storage, tmp_path: Path) -> None:
+    with pytest.raises(KinoPubError, match="No catalog snapshot"):
+        snapshot.load_snapshot(tmp_path)
+    with pytest.raises(KinoPubError, match="Unknown snapshot format"):
+        snapshot.export_snapshot(storage, tmp_path, "csv")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import dataclasses
 from typing import TYPE_CHECKING
 
 import libsql_client
@@ -168,3 +169,83 @@ class TestCatalogCRUD:
         )
         ids = storage.get_existing_catalog_ids()
         assert ids == {10, 20}
+
+    def test_get_catalog_entries_by_ids(self, storage) -> None:
+        storage.insert_catalog_entries(
+            [self._make_entry(entry_id=i, title=f"T{i}") for i in (1, 2, 3)]
+        )
+        entries = storage.get_catalog_entries_by_ids([3, 1, 99])
+        assert sorted(e.id for e in entries) == [1, 3]
+        assert {e.title for e in entries} == {"T1", "T3"}
+
+    def test_get_candidate_ids_filters(self, storage) -> None:
+        entries = [self._make_entry(entry_id=i) for i in (1, 2, 3)]
+        entries[1] = dataclasses.replace(entries[1], content_type="serial")
+        entries[2] = dataclasses.replace(entries[2], imdb_rating=5.0)
+        storage.insert_catalog_entries(entries)
+        storage.insert_ratings(
+            [
+                Rating(
+                    content_id=1,
+                    title="Test Movie",
+                    content_type="movie",
+                    score=8,
+                    rated_at="2026-02-13T12:00:00",
+                )
+            ]
+        )
+        assert sorted(storage.get_candidate_ids()) == [2, 3]
+        assert storage.get_candidate_ids(content_type="movie") == [3]
+        assert storage.get_candidate_ids(min_imdb=7.0) == [2]
+        assert sorted(storage.get_candidate_ids(include_rated=True)) == [1, 2, 3]
+
+    def test_find_catalog_entries_prefers_exact_title(self, storage) -> None:
+        storage.insert_catalog_entries(
+            [
+                self._make_entry(entry_id=1, title="Alien Nation"),
+                self._make_entry(entry_id=2, title="Alien"),
+                self._make_entry(entry_id=3, title="Heat"),
+            ]
+        )
+        matches = storage.find_catalog_entries("Alien")
+        assert [e.id for e in matches] == [2, 1]
+
+    def test_neighbor_table_roundtrip(self, storage) -> None:
+        storage.insert_catalog_entries(
+            [self._make_entry(entry_id=i, title=f"T{i}") for i in (1, 2, 3)]
+        )
+        storage.replace_neighbors({1: [(2, 0.9), (3, 0.4)], 2: [(1, 0.9)]})
+        storage.replace_neighbors({1: [(3, 0.8), (2, 0.7)]})
+
+        similar = storage.get_similar_entries(1)
+        assert [(e.title, score) for e, score in similar] == [
+            ("T3", pytest.approx(0.8)),
+            ("T2", pytest.approx(0.7)),
+        ]
+        assert storage.get_neighbor_floors() == {
+            1: (pytest.approx(0.7), 2),
+            2: (pytest.approx(0.9), 1),
+        }
+        assert storage.get_neighbor_sources([3]) == {1}
+        assert storage.get_neighbor_lists([2]) == {2: [(1, pytest.approx(0.9))]}
+
+    def test_duplicate_clusters_hide_non_canonical_candidates(self, storage) -> None:
+        storage.insert_catalog_entries(
+            [self._make_entry(entry_id=i, title=f"T{i}") for i in (1, 2, 3, 4)]
+        )
+        storage.set_canonical_ids({1: 1, 3: 1})
+        assert storage.get_duplicate_clusters([3]) == {1: 1, 3: 1}
+        assert storage.get_duplicate_clusters([2]) == {}
+        assert sorted(storage.get_candidate_ids()) == [1, 2, 4]
+        assert storage.get_duplicate_ids() == {3}
+
+        storage.set_canonical_ids({1: 1, 3: 1, 4: 1})
+        assert sorted(storage.get_candidate_ids()) == [1, 2]
+        assert storage.get_duplicate_ids() == {3, 4}
+
+    def test_iter_catalog_pages_in_id_order(self, storage) -> None:
+        storage.insert_catalog_entries(
+            [self._make_entry(entry_id=i, title=f"T{i}") for i in (5, 1, 3, 2, 4)]
+        )
+        pages = list(storage.iter_catalog_pages(page_size=2))
+        assert [[row[0] for row in page] for page in pages] == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,149 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from movie_buddy.embeddings import EmbeddingMatrix
+from movie_buddy.models import CatalogEntry, Rating
+from movie_buddy.taste import (
+    FacetAffinity,
+    TasteProfile,
+    load_taste_profile,
+    rating_weight,
+)
+from tests.conftest import make_entry
+
+
+def _rating(content_id: int, score: int) -> Rating:
+    return Rating(
+        content_id=content_id,
+        title=f"Title {content_id}",
+        content_type="movie",
+        score=score,
+        rated_at="2026-01-01",
+    )
+
+
+@pytest.fixture
+def matrix() -> EmbeddingMatrix:
+    return EmbeddingMatrix.from_vectors(
+        [1, 2, 3], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    )
+
+
+@pytest.fixture
+def entries() -> dict[int, CatalogEntry]:
+    return {
+        1: make_entry(1, genres=["Comedy"], year=1995),
+        2: make_entry(2, genres=["Comedy", "Drama"], year=2004),
+        3: make_entry(3, genres=["Horror"], year=2012),
+    }
+
+
+class TestRatingWeight:
+    def test_extremes_map_to_unit_range(self) -> None:
+        np.testing.assert_allclose(rating_weight([1, 10]), [-1.0, 1.0])
+
+
+class TestFacetAffinity:
+    def test_mean_weight_per_value(self) -> None:
+        facet = FacetAffinity()
+        facet.add_many([["a", "b"], ["a"]], np.array([1.0, -0.5]))
+        assert facet.as_dict() == {"a": 0.25, "b": 1.0}
+
+
+class TestTasteProfile:
+    def test_centroid_is_weighted_towards_liked_titles(
+        self, matrix: EmbeddingMatrix, entries: dict[int, CatalogEntry]
+    ) -> None:
+        ratings = [_rating(1, 10), _rating(2, 8), _rating(3, 1)]
+        profile = TasteProfile.from_ratings(ratings, entries, matrix)
+        centroid = profile.centroid
+        assert centroid is not None
+        assert centroid[0] > centroid[1] > 0 > centroid[2]
+
+    def test_facet_affinities(
+        self, matrix: EmbeddingMatrix, entries: dict[int, CatalogEntry]
+    ) -> None:
+        ratings = [_rating(1, 10), _rating(3, 1)]
+        profile = TasteProfile.from_ratings(ratings, entries, matrix)
+        genres = profile.facets["genres"].as_dict()
+        assert genres["Comedy"] == pytest.approx(1.0)
+        assert genres["Horror"] == pytest.approx(-1.0)
+        assert profile.facets["decades"].as_dict() == {
+            "1990": pytest.approx(1.0),
+            "2010": pytest.approx(-1.0),
+        }
+
+    def test_incremental_add_matches_full_rebuild(
+        self, matrix: EmbeddingMatrix, entries: dict[int, CatalogEntry]
+    ) -> None:
+        ratings = [_rating(1, 9), _rating(2, 4), _rating(3, 7)]
+        full = TasteProfile.from_ratings(ratings, entries, matrix)
+
+        incremental = TasteProfile.from_ratings(ratings[:2], entries, matrix)
+        assert incremental.add(ratings[2], entries[3], matrix.vectors[2])
+
+        np.testing.assert_allclose(incremental.centroid, full.centroid, rtol=1e-6)
+        assert incremental.facets["genres"].as_dict() == pytest.approx(
+            full.facets["genres"].as_dict()
+        )
+
+    def test_add_ignores_already_rated(self, entries: dict[int, CatalogEntry]) -> None:
+        profile = TasteProfile.from_ratings([_rating(1, 9)], entries)
+        assert not profile.add(_rating(1, 2), entries[1])
+        assert profile.facets["genres"].as_dict() == {"Comedy": pytest.approx(7 / 9)}
+
+    def test_ratings_outside_catalog_are_skipped(self) -> None:
+        profile = TasteProfile.from_ratings([_rating(42, 8)], {})
+        assert profile.centroid is None
+        assert profile.rated_ids == {42}
+
+    def test_save_and_load_roundtrip(
+        self,
+        tmp_path: Path,
+        matrix: EmbeddingMatrix,
+        entries: dict[int, CatalogEntry],
+    ) -> None:
+        profile = TasteProfile.from_ratings(
+            [_rating(1, 9), _rating(3, 2)], entries, matrix
+        )
+        profile.save(tmp_path / "taste.npz")
+        loaded = TasteProfile.load(tmp_path / "taste.npz")
+        assert loaded is not None
+        np.testing.assert_allclose(loaded.centroid, profile.centroid)
+        assert loaded.rated_ids == {1, 3}
+        assert (
+            loaded.facets["countries"].as_dict()
+            == profile.facets["countries"].as_dict()
+        )
+
+
+class TestLoadTasteProfile:
+    def test_rebuilds_when_ratings_changed(
+        self, tmp_path: Path, entries: dict[int, CatalogEntry]
+    ) -> None:
+        path = tmp_path / "taste.npz"
+        TasteProfile.from_ratings([_rating(1, 9)], entries).save(path)
+        storage = MagicMock()
+        storage.get_rated_content_ids.return_value = {1, 2}
+        storage.get_all_ratings.return_value = [_rating(1, 9), _rating(2, 3)]
+        storage.get_catalog_entries_by_ids.return_value = [entries[1], entries[2]]
+
+        profile = load_taste_profile(storage, path)
+
+        assert profile.rated_ids == {1, 2}
+        assert TasteProfile.load(path).rated_ids == {1, 2}
+
+    def test_reuses_saved_profile_when_current(
+        self, tmp_path: Path, entries: dict[int, CatalogEntry]
+    ) -> None:
+        path = tmp_path / "taste.npz"
+        TasteProfile.from_ratings([_rating(1, 9)], entries).save(path)
+        storage = MagicMock()
+
+        profile = load_taste_profile(storage, path, rated_ids={1})
+
+        assert profile.rated_ids == {1}
+        storage.get_all_ratings.assert_not_called()
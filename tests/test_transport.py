@@ -0,0 +1,57 @@
+import dataclasses
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from movie_buddy.api import KinoPubClient
+from movie_buddy.auth import KinoPubAuth
+from movie_buddy.config import config
+from movie_buddy.models import KinoPubError, Token
+from movie_buddy.transport import shared_transport, timeout
+
+_TOKEN = Token(access_token="t", refresh_token="r", expires_at=9999999999.0)
+
+
+class TestSharedTransport:
+    def test_auth_and_api_share_one_transport(self, tmp_path: Path) -> None:
+        auth = KinoPubAuth(token_path=tmp_path / "token.bin")
+        client = KinoPubClient(_TOKEN)
+        transport = shared_transport(config)
+        assert auth._http._transport is transport
+        assert client._client._transport is transport
+
+    def test_pool_settings_pick_their_own_transport(self) -> None:
+        small = dataclasses.replace(config, http_max_connections=2)
+        assert shared_transport(small) is shared_transport(small)
+        assert shared_transport(small) is not shared_transport(config)
+
+    def test_http2_without_h2_is_a_clear_error(self) -> None:
+        with (
+            patch("movie_buddy.transport.importlib.util.find_spec", return_value=None),
+            pytest.raises(KinoPubError, match="movie-buddy\\[http2\\]"),
+        ):
+            shared_transport(dataclasses.replace(config, http2=True))
+
+
+class TestTimeouts:
+    def test_endpoint_classes_have_their_own_read_timeout(self) -> None:
+        cfg = dataclasses.replace(
+            config, connect_timeout=1, auth_timeout=2, api_timeout=3, catalog_timeout=4
+        )
+        assert timeout("auth", cfg).read == 2
+        assert timeout("api", cfg).read == 3
+        assert timeout("catalog", cfg).read == 4
+        assert timeout("catalog", cfg).connect == 1
+
+    def test_catalog_pages_use_catalog_timeout(self, httpx_mock: HTTPXMock) -> None:
+        cfg = dataclasses.replace(config, api_timeout=3, catalog_timeout=40)
+        httpx_mock.add_response(json={"items": []})
+        httpx_mock.add_response(json={"items": []})
+        client = KinoPubClient(_TOKEN, cfg)
+        client.get_category_items("fresh", "movie")
+        client.search("Heat")
+        catalog, search = httpx_mock.get_requests()
+        assert catalog.extensions["timeout"]["read"] == 40
+        assert search.extensions["timeout"]["read"] == 3